@@ -0,0 +1,35 @@
+import sys
+import time
+import fnmatch
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+from drimesyncunofficial.exclusions import ExclusionMatcher
+
+# Benchmark : coût de filtrage d'un arbre synthétique selon le nombre de motifs,
+# ancienne boucle fnmatch vs matcher compilé.
+N_PATHS = 50000
+PATHS = [f"projets/{i % 40}/src/module_{i % 700}/fichier_{i}.{('py', 'txt', 'jpg', 'tmp', 'log')[i % 5]}" for i in range(N_PATHS)]
+
+
+def make_patterns(n):
+    base = ["Thumbs.db", "*.tmp", "*.log", "~$*", "._*", "*.trashed*", "node_modules/*", "build/*/cache"]
+    extra = [f"*.ext{i}" for i in range(n // 2)] + [f"dossier_{i}/*" for i in range(n // 4)] + [f"nom_{i}.dat" for i in range(n - n // 2 - n // 4)]
+    return (base + extra)[:max(n, len(base))]
+
+
+def bench(fn):
+    start = time.perf_counter()
+    excluded = sum(1 for p in PATHS if fn(p))
+    return time.perf_counter() - start, excluded
+
+
+if __name__ == "__main__":
+    print(f"{'motifs':>8} {'fnmatch (s)':>12} {'compilé (s)':>12} {'gain':>8}")
+    for n in (8, 50, 200, 1000):
+        patterns = make_patterns(n)
+        t_old, ex_old = bench(lambda rel: any(fnmatch.fnmatch(rel, p) for p in patterns))
+        matcher = ExclusionMatcher(patterns)
+        t_new, ex_new = bench(matcher.matches)
+        assert ex_old == ex_new
+        print(f"{len(patterns):>8} {t_old:>12.3f} {t_new:>12.3f} {t_old / t_new:>7.1f}x")
@@ -1,12 +1,38 @@
 import requests
+from requests.adapters import HTTPAdapter
 import os
 import math
 import mimetypes
 import time
 import json
+import threading
+import concurrent.futures
+import uuid
+import io
+import random
+from collections import OrderedDict
+from email.utils import parsedate_to_datetime
 from pathlib import Path
-from typing import Optional, List, Dict, Any, Union, Callable
-from drimesyncunofficial.constants import API_BASE_URL, HTTP_TIMEOUT, CHUNK_SIZE, BATCH_SIZE, PART_UPLOAD_RETRIES
+from typing import Optional, List, Dict, Any, Union, Callable, BinaryIO, Iterator, TYPE_CHECKING, cast
+from drimesyncunofficial.constants import API_BASE_URL, HTTP_TIMEOUT, CHUNK_SIZE, BATCH_SIZE, PART_UPLOAD_RETRIES, PART_WORKERS, PRESIGNED_URL_MAX_AGE, DOWNLOAD_SEGMENT_SIZE
+
+if TYPE_CHECKING:
+    from drimesyncunofficial.multipart_journal import MultipartJournal
+
+STREAM_PROGRESS_STEP = 1024 * 1024
+DOWNLOAD_READ_SIZE = 256 * 1024
+DEFAULT_POOL_SIZE = 10
+POOL_HOSTS = 4
+POOL_UI_MARGIN = 4
+API_RETRY_ATTEMPTS = 5
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 60.0
+THROTTLE_STATUSES = (429, 503)
+LIST_PER_PAGE = 100
+ENTRY_CACHE_SIZE = 10000
+ENTRY_CACHE_TTL = 10 * 60
+METADATA_WORKERS = 8
+BUFFER_POOL_MAX_IDLE_BYTES = 2 * CHUNK_SIZE
 
 class DrimeError(Exception):
     """Base exception for all DrimeSync errors."""
@@ -28,6 +54,730 @@ class DrimeClientError(DrimeError):
     """Client side logic errors (400, 404, 429...)."""
     pass
 
+class MultipartSessionError(DrimeClientError):
+    """Multipart session rejected by the server (unknown or expired uploadId)."""
+    pass
+
+def _rejects_upload_session(status_code: int) -> bool:
+    """4xx hors authentification et limitation de débit : le serveur ne reconnaît plus l'uploadId."""
+    return 400 <= status_code < 500 and status_code not in (401, 403) and status_code not in THROTTLE_STATUSES
+
+def _interruptible_sleep(delay: float, should_stop: Optional[Callable[[], bool]] = None) -> None:
+    """Dort `delay` secondes par tranches de 0.5s pour rester réactif à une annulation."""
+    remaining = delay
+    while remaining > 0:
+        if should_stop and should_stop(): return
+        step = min(0.5, remaining)
+        time.sleep(step)
+        remaining -= step
+
+class ThrottleCoordinator:
+    """
+    Pause partagée par tous les workers en cas de limitation de débit (429 / 503).
+    Quand un worker reçoit un 429, tous les autres attendent la même échéance avant
+    leur prochaine requête au lieu de marteler le serveur chacun de leur côté.
+    """
+    def __init__(self):
+        self._until = 0.0
+        self._lock = threading.Lock()
+        self.events = 0
+
+    def signal(self, delay: float) -> None:
+        with self._lock:
+            self._until = max(self._until, time.monotonic() + delay)
+            self.events += 1
+
+    def remaining(self) -> float:
+        with self._lock:
+            return max(0.0, self._until - time.monotonic())
+
+    def wait(self, should_stop: Optional[Callable[[], bool]] = None) -> None:
+        """Bloque jusqu'à la fin de la pause globale en cours (s'il y en a une)."""
+        delay = self.remaining()
+        if delay > 0: _interruptible_sleep(delay, should_stop)
+
+class RetryPolicy:
+    """
+    Politique de retry commune (API, parts multipart, téléchargements, workers d'upload).
+    - Backoff exponentiel avec "full jitter" : délai aléatoire dans [0, base × 2^tentative].
+    - Respect du header Retry-After (secondes ou date HTTP).
+    - Les 429 / 503 déclenchent une pause partagée via le ThrottleCoordinator.
+    """
+    def __init__(
+        self,
+        max_attempts: int = API_RETRY_ATTEMPTS,
+        base_delay: float = RETRY_BASE_DELAY,
+        max_delay: float = RETRY_MAX_DELAY,
+        coordinator: Optional[ThrottleCoordinator] = None
+    ):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.coordinator = coordinator or ThrottleCoordinator()
+
+    @staticmethod
+    def parse_retry_after(response: Any) -> Optional[float]:
+        """Retourne le délai demandé par le serveur (header Retry-After), ou None."""
+        if response is None: return None
+        try:
+            value = response.headers.get("Retry-After")
+        except Exception: return None
+        if not isinstance(value, str) or not value.strip(): return None
+        value = value.strip()
+        if value.isdigit(): return float(value)
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except Exception: return None
+
+    def backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def delay_for(self, attempt: int, response: Any = None) -> float:
+        retry_after = self.parse_retry_after(response)
+        if retry_after is not None: return min(self.max_delay, retry_after)
+        return self.backoff(attempt)
+
+    def sleep(self, attempt: int, response: Any = None, should_stop: Optional[Callable[[], bool]] = None) -> float:
+        """
+        Attend avant la tentative suivante. Si la réponse est un 429/503, la pause est
+        propagée à tous les workers via le coordinateur.
+        
+        Returns:
+            Délai appliqué (secondes).
+        """
+        delay = self.delay_for(attempt, response)
+        if getattr(response, "status_code", None) in THROTTLE_STATUSES:
+            self.coordinator.signal(delay)
+        _interruptible_sleep(delay, should_stop)
+        self.coordinator.wait(should_stop)
+        return delay
+
+RETRY_POLICY = RetryPolicy()
+
+def _buffer_body(chunk: Union[bytes, memoryview]) -> bytes:
+    """Corps de requête pour requests : une memoryview est envoyée telle quelle (Content-Length = len, sendall), seul le type est adapté."""
+    return cast(bytes, chunk)
+
+class BufferPool:
+    """
+    Réserve de buffers réutilisables pour la lecture des parts multipart (readinto).
+    Évite d'allouer un nouvel objet `bytes` de CHUNK_SIZE par part et par worker :
+    les buffers libérés sont recyclés d'un fichier à l'autre, dans la limite de `max_idle_bytes` octets
+    conservés au repos (le reste est rendu au ramasse-miettes).
+    """
+    def __init__(self, max_idle_bytes: int = BUFFER_POOL_MAX_IDLE_BYTES):
+        self.max_idle_bytes = max_idle_bytes
+        self.idle_bytes = 0
+        self._idle: Dict[int, List[bytearray]] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, size: int) -> bytearray:
+        with self._lock:
+            bufs = self._idle.get(size)
+            if bufs:
+                self.idle_bytes -= size
+                return bufs.pop()
+        return bytearray(size)
+
+    def release(self, buf: bytearray) -> None:
+        with self._lock:
+            if self.idle_bytes + len(buf) > self.max_idle_bytes: return
+            self._idle.setdefault(len(buf), []).append(buf)
+            self.idle_bytes += len(buf)
+
+SHARED_BUFFER_POOL = BufferPool()
+
+class MultipartFormStream:
+    """
+    Corps multipart/form-data produit à la demande, pour requests (data=stream).
+    Le fichier est lu par blocs au fur et à mesure que la socket consomme le corps :
+    la mémoire utilisée est constante quelle que soit la taille du fichier.
+    La longueur totale est connue d'avance (Content-Length, pas de chunked encoding).
+    """
+    def __init__(
+        self,
+        fields: Dict[str, Any],
+        file_field: str,
+        file_name: str,
+        file_obj: BinaryIO,
+        file_size: int,
+        mime_type: str = "application/octet-stream",
+        progress_callback: Optional[Callable[[int], None]] = None
+    ):
+        self.boundary = uuid.uuid4().hex
+        self.content_type = f"multipart/form-data; boundary={self.boundary}"
+        self.progress_callback = progress_callback
+        head = b"".join(
+            f'--{self.boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode("utf-8")
+            for name, value in fields.items() if value is not None
+        )
+        safe_name = file_name.replace('"', '%22')
+        head += (
+            f'--{self.boundary}\r\nContent-Disposition: form-data; name="{file_field}"; filename="{safe_name}"\r\n'
+            f'Content-Type: {mime_type}\r\n\r\n'
+        ).encode("utf-8")
+        tail = f"\r\n--{self.boundary}--\r\n".encode("utf-8")
+        self._head, self._tail = head, tail
+        self._segments: List[BinaryIO] = [io.BytesIO(head), file_obj, io.BytesIO(tail)]
+        self._file_obj = file_obj
+        try: self._file_start = file_obj.tell()
+        except (AttributeError, OSError): self._file_start = 0
+        self._file_read = 0
+        self._file_reported = 0
+        self._unreported = 0
+        self.len = len(head) + file_size + len(tail)
+
+    def rewind(self) -> None:
+        """
+        Repart du début du corps pour renvoyer la requête (retry après 429 / 503).
+        La progression n'est pas comptée deux fois : seuls les octets au-delà du précédent envoi sont notifiés.
+        """
+        self._file_obj.seek(self._file_start)
+        self._segments = [io.BytesIO(self._head), self._file_obj, io.BytesIO(self._tail)]
+        self._file_read = 0
+
+    def __len__(self) -> int:
+        return self.len
+
+    def _report(self, force: bool = False) -> None:
+        # http.client lit par blocs de 8 Ko : on regroupe les notifications de progression
+        if self.progress_callback and self._unreported and (force or self._unreported >= STREAM_PROGRESS_STEP):
+            self.progress_callback(self._unreported)
+            self._unreported = 0
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0: size = self.len
+        out = []
+        while size > 0 and self._segments:
+            seg = self._segments[0]
+            data = seg.read(size)
+            if not data:
+                if seg is self._file_obj: self._report(force=True)
+                self._segments.pop(0); continue
+            if seg is self._file_obj:
+                self._file_read += len(data)
+                if self._file_read > self._file_reported:
+                    self._unreported += self._file_read - self._file_reported
+                    self._file_reported = self._file_read
+                self._report()
+            out.append(data)
+            size -= len(data)
+        return b"".join(out)
+
+class MultipartUploader:
+    """
+    Envoie les parties d'un upload multipart S3 via un pool borné de threads.
+    Les chunks sont lus séquentiellement (lecture disque linéaire) puis envoyés en parallèle.
+    Les ETags sont collectés dans le désordre et triés avant la finalisation.
+    Au plus `part_workers` chunks sont en mémoire simultanément pour un même fichier.
+    Le lot d'URLs signées suivant est demandé en arrière-plan pendant l'envoi du lot courant,
+    et les URLs trop anciennes (pause, réseau lent) ou refusées (403) sont re-signées.
+    Les parts déjà envoyées lors d'une session précédente (`completed_parts`) sont sautées.
+    Les chunks sont lus par readinto dans des buffers recyclés (BufferPool) et envoyés sans copie
+    (memoryview) : la mémoire est bornée à part_workers × chunk_size par fichier.
+    """
+    def __init__(
+        self,
+        client: Any,
+        key: str,
+        upload_id: str,
+        chunk_size: int = CHUNK_SIZE,
+        part_workers: int = PART_WORKERS,
+        retries: int = PART_UPLOAD_RETRIES,
+        progress_callback: Optional[Callable[[int], None]] = None,
+        check_status_callback: Optional[Callable[[], bool]] = None,
+        url_max_age: float = PRESIGNED_URL_MAX_AGE,
+        completed_parts: Optional[List[Dict[str, Any]]] = None,
+        part_done_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+        buffer_pool: Optional[BufferPool] = None,
+        retry_policy: Optional[RetryPolicy] = None
+    ):
+        self.client = client
+        self.key = key
+        self.upload_id = upload_id
+        self.chunk_size = chunk_size
+        self.part_workers = max(1, int(part_workers or 1))
+        self.retries = max(1, int(retries))
+        self.progress_callback = progress_callback
+        self.check_status_callback = check_status_callback
+        self.url_max_age = url_max_age
+        self.parts: List[Dict[str, Any]] = list(completed_parts or [])
+        self.part_done_callback = part_done_callback
+        self.buffer_pool = buffer_pool or SHARED_BUFFER_POOL
+        self.retry_policy = retry_policy or RETRY_POLICY
+        self._parts_lock = threading.Lock()
+        self._urls: Dict[int, Any] = {}
+        self._urls_lock = threading.Lock()
+        self._slots = threading.Semaphore(self.part_workers)
+        self._failed = threading.Event()
+
+    def _check_status(self) -> None:
+        if self.check_status_callback and not self.check_status_callback():
+            raise DrimeClientError("Annulation utilisateur.")
+
+    def _sign_batch(self, part_numbers: List[int]) -> Dict[int, str]:
+        """
+        Obtient les URLs signées d'un lot de parties et les mémorise avec leur date de signature.
+        Les 429 / 503, 5xx et erreurs réseau sont réessayés comme les parts ; un uploadId refusé
+        lève MultipartSessionError.
+        """
+        label = f"{part_numbers[0]}-{part_numbers[-1]}"
+        error: Exception = DrimeServerError(f"Échec signature parts {label}")
+        for attempt in range(self.retries):
+            self.retry_policy.coordinator.wait(self._failed.is_set)
+            sign_resp = None
+            try:
+                sign_resp = self.client.upload_multipart_sign_batch(self.key, self.upload_id, part_numbers)
+                if sign_resp.status_code in [200, 201]: break
+                if _rejects_upload_session(sign_resp.status_code):
+                    raise MultipartSessionError(f"Session multipart refusée (signature parts {label}): {sign_resp.status_code}")
+                error = DrimeServerError(f"Échec signature parts {label}: {sign_resp.status_code}")
+            except DrimeNetworkError as e:
+                error = e
+            if attempt < self.retries - 1:
+                self.retry_policy.sleep(attempt, sign_resp, should_stop=self._failed.is_set)
+        else:
+            raise error
+        sign_data = sign_resp.json()
+        if 'urls' not in sign_data:
+            raise DrimeServerError(f"Réponse de signature invalide: {sign_data}")
+        urls_map = {u['partNumber']: u['url'] for u in sign_data['urls']}
+        signed_at = time.monotonic()
+        with self._urls_lock:
+            for pn, url in urls_map.items():
+                self._urls[pn] = (url, signed_at)
+        return urls_map
+
+    def _get_url(self, part_number: int, batch_nums: List[int]) -> Optional[str]:
+        """
+        Retourne l'URL signée d'une partie.
+        Si elle a expiré (ex: longue pause), le reste du lot est re-signé en une seule requête.
+        """
+        with self._urls_lock:
+            entry = self._urls.get(part_number)
+        if entry and time.monotonic() - entry[1] < self.url_max_age:
+            return entry[0]
+        if entry is None: return None
+        remaining = [pn for pn in batch_nums if pn >= part_number]
+        return self._sign_batch(remaining).get(part_number)
+
+    def _read_part(self, f: BinaryIO, buf: bytearray) -> Union[bytes, memoryview]:
+        """Lit la part suivante dans `buf` sans allocation. Retourne une vue vide en fin de fichier."""
+        readinto = getattr(f, "readinto", None)
+        n = readinto(buf) if readinto else None
+        if not isinstance(n, int):
+            # Flux sans readinto (wrapper tiers) : lecture classique
+            return f.read(self.chunk_size)
+        return memoryview(buf)[:n]
+
+    def _put_part(self, part_number: int, url: str, chunk: Union[bytes, memoryview], buf: Optional[bytearray] = None) -> None:
+        """Envoie une partie avec retries. Exécuté dans un thread du pool."""
+        try:
+            error: Exception = DrimeNetworkError(f"Échec upload chunk {part_number}")
+            for attempt in range(self.retries):
+                if self._failed.is_set(): return
+                self.retry_policy.coordinator.wait(self._failed.is_set)
+                r = None
+                try:
+                    r = self.client.upload_multipart_put_chunk(url, chunk)
+                    if r.status_code in [200, 201]:
+                        part = {"PartNumber": part_number, "ETag": r.headers.get("ETag", "").strip('"')}
+                        with self._parts_lock:
+                            self.parts.append(part)
+                        if self.part_done_callback: self.part_done_callback(part)
+                        if self.progress_callback: self.progress_callback(len(chunk))
+                        return
+                    error = DrimeNetworkError(f"Échec upload chunk {part_number}: {r.status_code}")
+                    if r.status_code == 403:
+                        # Signature expirée : on redemande une URL pour cette partie
+                        url = self._sign_batch([part_number]).get(part_number, url)
+                        continue
+                except Exception as e:
+                    error = e
+                if attempt < self.retries - 1:
+                    self.retry_policy.sleep(attempt, r, should_stop=self._failed.is_set)
+            self._failed.set()
+            raise error
+        finally:
+            if buf is not None: self.buffer_pool.release(buf)
+            self._slots.release()
+
+    def upload(self, f: BinaryIO, file_size: int) -> List[Dict[str, Any]]:
+        """
+        Envoie toutes les parties du fichier ouvert `f`.
+        
+        Returns:
+            Liste des parts {"PartNumber", "ETag"} triée, prête pour upload_multipart_complete.
+            
+        Raises:
+            DrimeClientError: Si l'utilisateur annule.
+            DrimeError / Exception: Si une partie échoue après toutes les tentatives.
+        """
+        num_parts = math.ceil(file_size / self.chunk_size)
+        done = {p["PartNumber"] for p in self.parts}
+        pending = [pn for pn in range(1, num_parts + 1) if pn not in done]
+        batches = [pending[i:i + BATCH_SIZE] for i in range(0, len(pending), BATCH_SIZE)]
+        if done and self.progress_callback:
+            self.progress_callback(sum(min(self.chunk_size, file_size - (pn - 1) * self.chunk_size) for pn in done if pn <= num_parts))
+        futures: List[concurrent.futures.Future] = []
+        signer = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="Sign")
+        try:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=self.part_workers, thread_name_prefix="Part") as pool:
+                try:
+                    eof = False
+                    next_sign = signer.submit(self._sign_batch, batches[0]) if batches else None
+                    for idx, batch_nums in enumerate(batches):
+                        if eof or self._failed.is_set(): break
+                        self._check_status()
+                        if next_sign is not None: next_sign.result()
+                        # Pipeline : le lot suivant est signé pendant l'envoi de celui-ci
+                        next_sign = signer.submit(self._sign_batch, batches[idx + 1]) if idx + 1 < len(batches) else None
+                        
+                        for pn in batch_nums:
+                            self._check_status()
+                            self._slots.acquire()
+                            buf = None
+                            submitted = False
+                            try:
+                                if self._failed.is_set(): break
+                                if done: f.seek((pn - 1) * self.chunk_size)
+                                buf = self.buffer_pool.acquire(self.chunk_size)
+                                chunk = self._read_part(f, buf)
+                                if not chunk:
+                                    eof = True; break
+                                url = self._get_url(pn, batch_nums)
+                                if not url: raise DrimeServerError(f"URL manquante pour part {pn}")
+                                futures.append(pool.submit(self._put_part, pn, url, chunk, buf))
+                                submitted = True
+                            finally:
+                                if not submitted:
+                                    if buf is not None: self.buffer_pool.release(buf)
+                                    self._slots.release()
+                except BaseException:
+                    self._failed.set()
+                    raise
+        finally:
+            signer.shutdown(wait=False)
+        for fut in futures: fut.result()
+        return sorted(self.parts, key=lambda p: p["PartNumber"])
+
+def _pwrite(fd: int, data: Any, offset: int, lock: threading.Lock) -> None:
+    """Écriture positionnelle (os.pwrite, ou lseek+write sous verrou là où pwrite n'existe pas, ex: Windows)."""
+    view = memoryview(data)
+    if hasattr(os, "pwrite"):
+        while view:
+            n = os.pwrite(fd, view, offset)
+            view, offset = view[n:], offset + n
+        return
+    with lock:
+        os.lseek(fd, offset, os.SEEK_SET)
+        while view:
+            n = os.write(fd, view)
+            view = view[n:]
+
+def content_range_matches(response: Any, start: int, total_size: int) -> bool:
+    """Vérifie qu'une réponse 206 couvre bien le segment demandé d'un fichier de `total_size` octets."""
+    value = response.headers.get("Content-Range", "") if response.headers else ""
+    try:
+        unit, rng = value.split(" ", 1)
+        span, total = rng.split("/", 1)
+        first = int(span.split("-", 1)[0])
+        return unit == "bytes" and first == start and (total == "*" or not total_size or int(total) == total_size)
+    except (ValueError, AttributeError): return False
+
+class SegmentedDownloader:
+    """
+    Télécharge un gros fichier en segments (HTTP Range) récupérés en parallèle.
+    L'URL de stockage est résolue une fois (redirection de get_download_stream), le fichier de
+    sortie est préalloué puis chaque segment y est écrit à son offset (écritures positionnelles).
+    Le premier segment sert de sonde : si l'hôte ignore Range (réponse 200), la réponse est
+    écrite telle quelle en un seul flux. Une 403 (URL signée expirée) provoque une nouvelle résolution.
+    Un segment interrompu reprend à son dernier octet écrit.
+    Les segments déjà écrits lors d'une session précédente (`completed_segments`, offsets de début)
+    sont sautés et le fichier existant est conservé (reprise d'un `.part`, voir PartialDownload).
+    """
+    def __init__(
+        self,
+        client: Any,
+        url: str,
+        total_size: int,
+        segment_size: int = DOWNLOAD_SEGMENT_SIZE,
+        workers: int = PART_WORKERS,
+        retries: int = PART_UPLOAD_RETRIES,
+        progress_callback: Optional[Callable[[int], None]] = None,
+        check_status_callback: Optional[Callable[[], bool]] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        completed_segments: Optional[List[int]] = None,
+        segment_done_callback: Optional[Callable[[int], None]] = None
+    ):
+        self.client = client
+        self.url = url
+        self.total_size = int(total_size)
+        self.segment_size = max(1, int(segment_size))
+        self.workers = max(1, int(workers or 1))
+        self.retries = max(1, int(retries))
+        self.progress_callback = progress_callback
+        self.check_status_callback = check_status_callback
+        self.retry_policy = retry_policy or RETRY_POLICY
+        self.completed_segments = set(completed_segments or [])
+        self.segment_done_callback = segment_done_callback
+        self.segmented: Optional[bool] = None
+        self._storage_url: Optional[str] = None
+        self._url_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._failed = threading.Event()
+
+    def _check_status(self) -> None:
+        if self._failed.is_set(): raise DrimeClientError("Segment en échec.")
+        if self.check_status_callback and not self.check_status_callback():
+            raise DrimeClientError("Annulation utilisateur.")
+
+    def segments(self) -> List[tuple]:
+        """Bornes (début, fin incluse) de chaque segment."""
+        return [(start, min(start + self.segment_size, self.total_size) - 1) for start in range(0, self.total_size, self.segment_size)]
+
+    def _resolve(self, stale: Optional[str] = None) -> Optional[str]:
+        """Résout l'URL de stockage (une seule résolution concurrente ; `stale` force le renouvellement)."""
+        with self._url_lock:
+            if self._storage_url is None or self._storage_url == stale:
+                self._storage_url = self.client.resolve_download_url(self.url)
+            return self._storage_url
+
+    def _write_stream(self, response: Any, fd: int, offset: int) -> int:
+        """Écrit le corps de `response` à partir de `offset`. Retourne l'offset atteint."""
+        for chunk in response.iter_content(chunk_size=DOWNLOAD_READ_SIZE):
+            self._check_status()
+            if not chunk: continue
+            _pwrite(fd, chunk, offset, self._write_lock)
+            offset += len(chunk)
+            if self.progress_callback: self.progress_callback(len(chunk))
+        return offset
+
+    def _fetch_segment(self, fd: int, start: int, end: int, response: Any = None) -> None:
+        offset = start
+        for attempt in range(self.retries):
+            self._check_status()
+            storage_url = self._storage_url
+            try:
+                if response is None:
+                    response = self.client.get_download_range(storage_url, offset, end)
+                with response:
+                    if response.status_code == 403:
+                        self._resolve(stale=storage_url)
+                        raise DrimeServerError("URL de stockage expirée (403)")
+                    if response.status_code != 206 or not content_range_matches(response, offset, self.total_size):
+                        raise DrimeServerError(f"Segment {start}-{end}: HTTP {response.status_code}")
+                    offset = self._write_stream(response, fd, offset)
+                if offset > end:
+                    if self.segment_done_callback: self.segment_done_callback(start)
+                    return
+                raise DrimeNetworkError(f"Segment {start}-{end} incomplet ({offset - start} octets)")
+            except DrimeClientError: raise
+            except Exception:
+                response = None
+                if attempt >= self.retries - 1: raise
+                self.retry_policy.sleep(attempt, should_stop=lambda: self._failed.is_set())
+
+    def download(self, save_path: str) -> int:
+        """
+        Télécharge le fichier vers `save_path`.
+
+        Returns:
+            Nombre d'octets écrits.
+
+        Raises:
+            DrimeError: Échec définitif (ou annulation : DrimeClientError).
+        """
+        segments = [seg for seg in self.segments() if seg[0] not in self.completed_segments]
+        if not segments and self.completed_segments: return self.total_size
+        storage_url = self._resolve() if segments else None
+        if not storage_url:
+            # Pas de redirection vers le stockage : un seul flux via l'API
+            self.segmented = False
+            with self.client.get_download_stream(self.url) as r:
+                if r.status_code != 200: raise DrimeServerError(f"HTTP {r.status_code}")
+                return self._single_stream(r, save_path)
+
+        first = self.client.get_download_range(storage_url, *segments[0])
+        if first.status_code == 200:
+            # L'hôte ignore Range : la réponse contient le fichier complet
+            self.segmented = False
+            with first: return self._single_stream(first, save_path)
+
+        self.segmented = True
+        resume = bool(self.completed_segments) and os.path.exists(save_path) and os.path.getsize(save_path) == self.total_size
+        if not resume:
+            with open(save_path, 'wb') as f: f.truncate(self.total_size)
+        fd = os.open(save_path, os.O_WRONLY | getattr(os, "O_BINARY", 0))
+        try:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=min(self.workers, len(segments)), thread_name_prefix="DlSegment") as executor:
+                futures = [executor.submit(self._fetch_segment, fd, start, end, first if i == 0 else None) for i, (start, end) in enumerate(segments)]
+                try:
+                    for fut in concurrent.futures.as_completed(futures): fut.result()
+                except Exception:
+                    self._failed.set()
+                    for fut in futures: fut.cancel()
+                    raise
+        finally:
+            os.close(fd)
+        return self.total_size
+
+    def _single_stream(self, response: Any, save_path: str) -> int:
+        fd = os.open(save_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0))
+        try: return self._write_stream(response, fd, 0)
+        finally: os.close(fd)
+
+def _next_page(data: Any, page: int, per_page: Optional[int], count: int) -> Optional[int]:
+    """Déduit le numéro de la page suivante depuis la réponse paginée (None = dernière page)."""
+    if not isinstance(data, dict) or count == 0: return None
+    if "next_page" in data:
+        return int(data["next_page"]) if data["next_page"] else None
+    if "last_page" in data:
+        current = int(data.get("current_page") or page)
+        return current + 1 if current < int(data["last_page"] or 0) else None
+    if per_page and count >= per_page: return page + 1
+    return None
+
+def iter_files(client: Any, params: Dict[str, Any], per_page: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Parcourt toutes les pages de `client.list_files(params)` et produit les entrées une à une.
+    La page N+1 est demandée en arrière-plan pendant que l'appelant consomme la page N.
+    
+    Args:
+        client: DrimeAPIClient (ou tout objet exposant list_files).
+        params: Filtres de listing (workspaceId, folderId, deletedOnly, query...).
+        per_page: Taille de page (perPage). Par défaut client.list_per_page.
+    
+    Raises:
+        DrimeError: Si une page ne peut être récupérée.
+    """
+    if per_page is None:
+        per_page = getattr(client, "list_per_page", None)
+        if not isinstance(per_page, int): per_page = None
+    base = dict(params)
+    if per_page: base["perPage"] = per_page
+    first_page = int(base.pop("page", 1) or 1)
+    
+    def fetch(page: int) -> Any:
+        return client.list_files({**base, "page": page} if page > 1 else base)
+    
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="ListPrefetch")
+    try:
+        page = first_page
+        future: Optional[concurrent.futures.Future] = executor.submit(fetch, first_page)
+        while future is not None:
+            data = future.result()
+            items = data.get("data") if isinstance(data, dict) else None
+            items = items or []
+            next_page = _next_page(data, page, per_page, len(items))
+            # Prefetch : la page suivante est déjà en vol pendant le traitement de celle-ci
+            future = executor.submit(fetch, next_page) if next_page else None
+            if next_page: page = next_page
+            for item in items: yield item
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+class EntryMetadataCache:
+    """
+    Cache LRU avec TTL des métadonnées d'entrées (id -> hash / size / updated_at).
+    Partagé par l'explorateur, les téléchargements et la corbeille (voir ENTRY_CACHE) :
+    une navigation répétée ou un re-téléchargement ne redemande pas les métadonnées à l'API.
+    Thread-safe (alimenté depuis les threads de listing).
+    """
+    def __init__(self, max_size: int = ENTRY_CACHE_SIZE, ttl: float = ENTRY_CACHE_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def extract(entry: Any) -> Optional[Dict[str, Any]]:
+        """Extrait les métadonnées utiles d'une entrée de listing ou d'une réponse get_file_entry."""
+        if not isinstance(entry, dict): return None
+        if isinstance(entry.get("fileEntry"), dict): entry = entry["fileEntry"]
+        if not entry.get("hash"): return None
+        return {
+            "hash": entry["hash"],
+            "size": int(entry.get("file_size") or entry.get("size") or 0),
+            "updated_at": entry.get("updated_at"),
+        }
+
+    def get(self, entry_id: Any) -> Optional[Dict[str, Any]]:
+        key = str(entry_id)
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None or time.monotonic() - item[0] > self.ttl:
+                if item is not None: del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return item[1]
+
+    def put(self, entry_id: Any, meta: Dict[str, Any]) -> None:
+        key = str(entry_id)
+        with self._lock:
+            self._entries[key] = (time.monotonic(), meta)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size: self._entries.popitem(last=False)
+
+    def remember(self, entries: List[Dict[str, Any]]) -> None:
+        """Mémorise les entrées d'un listing qui portent déjà leur hash."""
+        for entry in entries or []:
+            meta = self.extract(entry)
+            if meta and entry.get("id") is not None: self.put(entry["id"], meta)
+
+    def invalidate(self, entry_ids: List[Any]) -> None:
+        with self._lock:
+            for entry_id in entry_ids: self._entries.pop(str(entry_id), None)
+
+    def clear(self) -> None:
+        with self._lock: self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+ENTRY_CACHE = EntryMetadataCache()
+
+def resolve_entries(client: Any, entry_ids: List[Any], cache: Optional[EntryMetadataCache] = None, workers: int = METADATA_WORKERS) -> Dict[str, Dict[str, Any]]:
+    """
+    Résout les métadonnées (hash, size, updated_at) d'un lot d'entrées.
+    Les ids déjà en cache ne sont pas redemandés ; les autres sont récupérés en parallèle
+    (get_file_entry, `workers` requêtes simultanées) puis mis en cache.
+
+    Args:
+        client: DrimeAPIClient (ou tout objet exposant get_file_entry).
+        entry_ids: Ids à résoudre (doublons ignorés).
+        cache: Cache à utiliser. Par défaut ENTRY_CACHE.
+
+    Returns:
+        Dict id -> métadonnées. Les ids introuvables ou en erreur sont absents.
+    """
+    if cache is None: cache = ENTRY_CACHE
+    resolved: Dict[str, Dict[str, Any]] = {}
+    missing = []
+    for entry_id in dict.fromkeys(str(i) for i in entry_ids):
+        meta = cache.get(entry_id)
+        if meta: resolved[entry_id] = meta
+        else: missing.append(entry_id)
+    if not missing: return resolved
+
+    def fetch(entry_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            res = client.get_file_entry(entry_id)
+            if res is not None and res.status_code == 200: return EntryMetadataCache.extract(res.json())
+        except Exception: pass
+        return None
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, min(workers, len(missing))), thread_name_prefix="MetaResolve") as executor:
+        for entry_id, meta in zip(missing, executor.map(fetch, missing)):
+            if not meta: continue
+            cache.put(entry_id, meta)
+            resolved[entry_id] = meta
+    return resolved
+
 class DrimeAPIClient:
     """
     Client centralisé pour l'API Drime.
@@ -36,16 +786,84 @@ class DrimeAPIClient:
     def __init__(self, api_key: str, api_base_url: str = API_BASE_URL):
         self.api_key = api_key
         self.api_base_url = api_base_url
-        self.session = requests.Session()
+        self.part_workers = PART_WORKERS
+        self.list_per_page = LIST_PER_PAGE
         self.headers = {
             "Authorization": f"Bearer {api_key}",
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
         }
-        self.session.headers.update(self.headers)
+        self._session_lock = threading.Lock()
+        self.retry_policy = RETRY_POLICY
+        self.api_pool_size = DEFAULT_POOL_SIZE
+        self.storage_pool_size = DEFAULT_POOL_SIZE
+        self.session = self._build_session(self.api_pool_size, self.headers)
+        self.storage_session = self._build_session(self.storage_pool_size, {"User-Agent": self.headers["User-Agent"]})
+
+    @staticmethod
+    def _build_session(pool_size: int, headers: Dict[str, str]) -> requests.Session:
+        """
+        Crée une session dont le pool de connexions (keep-alive) est dimensionné pour `pool_size` threads.
+        Les pools urllib3 sont thread-safe : une session est partagée par tous les workers.
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=POOL_HOSTS, pool_maxsize=pool_size)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update(headers)
+        return session
+
+    def configure_pools(self, workers: int, part_workers: Optional[int] = None, semaphores: int = 0) -> None:
+        """
+        Dimensionne les pools de connexions selon la concurrence configurée.
+        - API (hôte Drime) : un worker par fichier + marge pour l'UI.
+        - Stockage (S3, URLs signées) : workers × parts parallèles par fichier.
+        Sans effet si la taille ne change pas (les connexions ouvertes sont conservées).
+        
+        Args:
+            workers: Nombre de workers de transfert (CONF_KEY_WORKERS).
+            part_workers: Parts multipart envoyées en parallèle par fichier.
+            semaphores: Limite d'uploads simples simultanés (0 = workers).
+        """
+        workers = max(1, int(workers or 1))
+        part_workers = max(1, int(part_workers or self.part_workers))
+        concurrent_files = max(workers, int(semaphores or 0))
+        api_size = max(DEFAULT_POOL_SIZE, concurrent_files + POOL_UI_MARGIN)
+        storage_size = max(DEFAULT_POOL_SIZE, concurrent_files * part_workers)
+        with self._session_lock:
+            if api_size != self.api_pool_size:
+                adapter = HTTPAdapter(pool_connections=POOL_HOSTS, pool_maxsize=api_size)
+                self.session.mount("https://", adapter)
+                self.session.mount("http://", adapter)
+                self.api_pool_size = api_size
+            if storage_size != self.storage_pool_size:
+                adapter = HTTPAdapter(pool_connections=POOL_HOSTS, pool_maxsize=storage_size)
+                self.storage_session.mount("https://", adapter)
+                self.storage_session.mount("http://", adapter)
+                self.storage_pool_size = storage_size
+
+    def get_connection_stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Statistiques keep-alive par pool : connexions ouvertes (handshakes TCP/TLS) et requêtes servies.
+        Un ratio requests/connections élevé signifie que les connexions sont bien réutilisées.
+        """
+        stats = {}
+        for name, session in (("api", self.session), ("storage", self.storage_session)):
+            connections = 0; requests_count = 0
+            try:
+                for adapter in {id(a): a for a in session.adapters.values()}.values():
+                    for key in adapter.poolmanager.pools.keys():
+                        pool = adapter.poolmanager.pools.get(key)
+                        if pool is None: continue
+                        connections += pool.num_connections
+                        requests_count += pool.num_requests
+            except Exception: pass
+            stats[name] = {"connections": connections, "requests": requests_count}
+        return stats
 
     def _request(self, method: str, endpoint: str, **kwargs) -> requests.Response:
         """
         Wrapper centralisé pour toutes les requêtes API.
+        Les réponses 429 / 503 sont réessayées selon RETRY_POLICY (Retry-After, pause partagée).
         """
         url = endpoint if endpoint.startswith("http") else f"{self.api_base_url}{endpoint}"
         
@@ -55,20 +873,24 @@ class DrimeAPIClient:
             if toga.platform.current_platform == 'android': is_android = True
         except: pass
         
-        retries = 1 if is_android else 0
+        net_retries = 1 if is_android else 0
+        timeout = kwargs.pop('timeout', HTTP_TIMEOUT)
+        attempt = 0
         
-        while retries >= 0:
+        while True:
+            self.retry_policy.coordinator.wait()
             try:
-                resp = self.session.request(method, url, timeout=kwargs.pop('timeout', HTTP_TIMEOUT), **kwargs)
-                return resp
+                resp = self.session.request(method, url, timeout=timeout, **kwargs)
             except (requests.exceptions.ConnectionError, requests.exceptions.ChunkedEncodingError) as e:
-                if is_android and retries > 0:
+                if net_retries > 0:
                      print(f"[RESEAU] Echec {e}. Reset Session sur Android...")
-                     self.session.close()
-                     self.session = requests.Session()
-                     self.session.headers.update(self.headers)
-                     retries -= 1
-                     time.sleep(1)
+                     with self._session_lock:
+                         self.session.close()
+                         self.session = self._build_session(self.api_pool_size, self.headers)
+                     net_retries -= 1
+                     self.retry_policy.sleep(attempt)
+                     attempt += 1
+                     self._rewind_body(kwargs.get("data"))
                      continue
                 
                 raise DrimeNetworkError("Erreur de connexion : Impossible de joindre le serveur.")
@@ -76,8 +898,20 @@ class DrimeAPIClient:
                 raise DrimeNetworkError("Délai d'attente dépassé (Timeout).")
             except requests.exceptions.RequestException as e:
                 raise DrimeNetworkError(f"Erreur réseau inattendue : {e}")
-        
-        raise DrimeNetworkError("Impossible de se connecter après toutes les tentatives.")
+            
+            # Limitation de débit : pause coordonnée puis nouvelle tentative
+            if resp.status_code in THROTTLE_STATUSES and attempt < self.retry_policy.max_attempts - 1:
+                self.retry_policy.sleep(attempt, resp)
+                attempt += 1
+                self._rewind_body(kwargs.get("data"))
+                continue
+            return resp
+
+    @staticmethod
+    def _rewind_body(body: Any) -> None:
+        """Corps streamé (MultipartFormStream) : à relire depuis le début avant un nouvel envoi."""
+        rewind = getattr(body, "rewind", None)
+        if callable(rewind): rewind()
 
     def _handle_response(self, resp: requests.Response) -> requests.Response:
         """Analyse le code de statut et lève l'exception appropriée si erreur."""
@@ -190,35 +1024,32 @@ class DrimeAPIClient:
 
     def create_entry(self, data: Dict[str, Any]) -> requests.Response:
         """Crée une entrée de fichier ou dossier via l'API S3 (Interne)."""
-        return self.session.post(
-            f"{self.api_base_url}/s3/entries",
-            json=data,
-            timeout=HTTP_TIMEOUT
-        )
+        return self._request("POST", "/s3/entries", json=data, timeout=HTTP_TIMEOUT)
 
-    def upload_simple(self, file_path: str, workspace_id: str, relative_path: str, custom_file_name: Optional[str] = None) -> requests.Response:
+    def upload_simple(self, file_path: str, workspace_id: str, relative_path: str, custom_file_name: Optional[str] = None, progress_callback: Optional[Callable[[int], None]] = None) -> requests.Response:
         """
         Effectue un upload simple (non-multipart) pour les petits fichiers.
         Utilise le endpoint standard /uploads.
+        Le corps multipart/form-data est streamé depuis le disque (mémoire constante),
+        progress_callback(bytes) est appelé à chaque bloc envoyé.
         """
         file_name = custom_file_name if custom_file_name else os.path.basename(file_path)
         mime_type = mimetypes.guess_type(file_name)[0]
         if not mime_type: mime_type = "application/octet-stream"
         with open(file_path, 'rb') as f:
-            return self.session.post(
-                f"{self.api_base_url}/uploads",
-                files={"file": (file_name, f, mime_type)},
-                data={"relativePath": relative_path, "workspaceId": workspace_id},
-                timeout=HTTP_TIMEOUT * 2
+            body = MultipartFormStream(
+                {"relativePath": relative_path, "workspaceId": workspace_id},
+                "file", file_name, f, os.fstat(f.fileno()).st_size, mime_type, progress_callback
             )
+            return self._request("POST", "/uploads", data=body, headers={"Content-Type": body.content_type}, timeout=HTTP_TIMEOUT * 2)
 
     def upload_multipart_init(self, file_name: str, file_size: int, relative_path: str, workspace_id: str) -> requests.Response:
         """
         Initialise une session d'upload multipart (S3).
         Retourne l'uploadId et la clé nécessaire pour la suite.
         """
-        return self.session.post(
-            f"{self.api_base_url}/s3/multipart/create", 
+        return self._request(
+            "POST", "/s3/multipart/create",
             json={
                 "filename": file_name,
                 "mime": "application/octet-stream",
@@ -235,19 +1066,20 @@ class DrimeAPIClient:
         Obtient les URLs signées pour un lot de parties (chunks).
         Permet d'uploader les chunks directement vers le stockage objet.
         """
-        return self.session.post(
-            f"{self.api_base_url}/s3/multipart/batch-sign-part-urls",
+        return self._request(
+            "POST", "/s3/multipart/batch-sign-part-urls",
             json={"key": key, "uploadId": upload_id, "partNumbers": part_numbers},
             timeout=HTTP_TIMEOUT
         )
 
-    def upload_multipart_put_chunk(self, url: str, chunk: bytes) -> requests.Response:
+    def upload_multipart_put_chunk(self, url: str, chunk: Union[bytes, memoryview]) -> requests.Response:
         """
         Envoie un chunk de données vers l'URL signée (PUT direct).
+        Accepte une memoryview (buffer du BufferPool) envoyée telle quelle, sans copie.
         """
-        return requests.put(
+        return self.storage_session.put(
             url,
-            data=chunk,
+            data=_buffer_body(chunk),
             headers={"Content-Type": "application/octet-stream"},
             timeout=HTTP_TIMEOUT
         )
@@ -257,19 +1089,31 @@ class DrimeAPIClient:
         Finalise l'upload multipart une fois tous les chunks envoyés.
         Assemble le fichier côté serveur.
         """
-        return self.session.post(
-            f"{self.api_base_url}/s3/multipart/complete", 
+        return self._request(
+            "POST", "/s3/multipart/complete",
             json={"key": key, "uploadId": upload_id, "parts": parts},
             timeout=HTTP_TIMEOUT
         )
     
+    def upload_multipart_abort(self, key: str, upload_id: str) -> requests.Response:
+        """
+        Annule un upload multipart inachevé et libère les parties stockées côté serveur.
+        """
+        return self._request(
+            "POST", "/s3/multipart/abort",
+            json={"key": key, "uploadId": upload_id},
+            timeout=HTTP_TIMEOUT
+        )
+    
     def upload_file(
         self,
         file_path: str,
         workspace_id: str,
         relative_path: str,
         progress_callback: Optional[Callable[[int], None]] = None,
-        check_status_callback: Optional[Callable[[], bool]] = None
+        check_status_callback: Optional[Callable[[], bool]] = None,
+        part_workers: Optional[int] = None,
+        journal: Optional["MultipartJournal"] = None
     ) -> Dict[str, Any]:
         """
         Gère l'upload complet d'un fichier (Simple ou Multipart).
@@ -281,6 +1125,9 @@ class DrimeAPIClient:
             progress_callback: Fonction(bytes_transferred) appelée après chaque chunk.
             check_status_callback: Fonction() -> bool. Retourne False si l'action doit être annulée.
                                    Peut bloquer (time.sleep) si en pause.
+            part_workers: Nombre de parts envoyées en parallèle pour ce fichier (Multipart).
+                          Par défaut self.part_workers.
+            journal: MultipartJournal optionnel pour reprendre un upload multipart interrompu.
         
         Returns:
             Dict de l'entrée fichier créée, ou lève une exception.
@@ -293,18 +1140,15 @@ class DrimeAPIClient:
         
         if file_size <= MULTIPART_THRESHOLD:
                            
-            resp = self.upload_simple(file_path, workspace_id, relative_path, custom_file_name=file_name)
+            resp = self.upload_simple(file_path, workspace_id, relative_path, custom_file_name=file_name, progress_callback=progress_callback)
             self._handle_response(resp)                                       
             
-                                                       
-                                                                                          
             data = resp.json()
-            if progress_callback: progress_callback(file_size)
             return self._parse_file_entry(data)
 
         else:
                               
-            return self._upload_multipart_logic(file_path, file_size, relative_path, workspace_id, progress_callback, check_status_callback)
+            return self.upload_multipart_file(file_path, file_size, relative_path, workspace_id, progress_callback, check_status_callback, part_workers, journal)
 
     def _parse_file_entry(self, data: Any) -> Dict[str, Any]:
         """Helper pour extraire l'objet fileEntry de diverses réponses API."""
@@ -313,77 +1157,72 @@ class DrimeAPIClient:
             if 'id' in data: return data               
         return data
 
-    def _upload_multipart_logic(
+    def upload_multipart_file(
         self,
         file_path: str,
         file_size: int,
         relative_path: str,
         workspace_id: str,
-        progress_callback: Optional[Callable[[int], None]],
-        check_status_callback: Optional[Callable[[], bool]]
+        progress_callback: Optional[Callable[[int], None]] = None,
+        check_status_callback: Optional[Callable[[], bool]] = None,
+        part_workers: Optional[int] = None,
+        journal: Optional["MultipartJournal"] = None,
+        identity: Optional[Dict[str, Any]] = None,
+        on_resume: Optional[Callable[[int], None]] = None
     ) -> Dict[str, Any]:
-        """Logique interne Multipart (S3)."""
+        """
+        Upload Multipart (S3). Les parts d'un même fichier sont envoyées en parallèle.
+        Si un `journal` est fourni, un upload interrompu du même fichier est repris à la première part manquante.
+        `identity` (taille, mtime, hash partiel) évite de relire le fichier quand l'appelant la connaît déjà ;
+        `on_resume(nb_parts)` est appelé lors d'une reprise. Si le serveur refuse l'uploadId repris, l'upload
+        repart de zéro et `progress_callback` reçoit d'abord l'opposé des octets déjà notifiés.
+        """
         file_name = Path(relative_path).name
-        num_parts = math.ceil(file_size / CHUNK_SIZE)
-        
-                 
-        init_resp = self.upload_multipart_init(file_name, file_size, relative_path, workspace_id)
-        self._handle_response(init_resp)
-        init_data = init_resp.json()
-        upload_id = init_data['uploadId']
-        key = init_data['key']
+        if journal is not None and identity is None: identity = journal.file_identity(file_path)
+        resumed = journal.get(file_path, relative_path, chunk_size=CHUNK_SIZE, **identity) if journal is not None and identity else None
         
-        uploaded_parts = []
-        bytes_transferred = 0
+        if resumed:
+            upload_id, key = resumed['upload_id'], resumed['key']
+            if on_resume: on_resume(len(resumed['parts']))
+        else:
+            init_resp = self.upload_multipart_init(file_name, file_size, relative_path, workspace_id)
+            self._handle_response(init_resp)
+            init_data = init_resp.json()
+            upload_id = init_data['uploadId']
+            key = init_data['key']
+            if journal is not None and identity: journal.start(file_path, relative_path, upload_id, key, chunk_size=CHUNK_SIZE, **identity)
         
-        with open(file_path, "rb") as f:
-            part_number = 1
-            while part_number <= num_parts:
-                                    
-                if check_status_callback:
-                    if not check_status_callback(): raise DrimeClientError("Annulation utilisateur.")
-                
-                batch_end = min(part_number + BATCH_SIZE - 1, num_parts)
-                batch_nums = list(range(part_number, batch_end + 1))
-                
-                               
-                sign_resp = self.upload_multipart_sign_batch(key, upload_id, batch_nums)
-                self._handle_response(sign_resp)
-                sign_data = sign_resp.json()
-                urls_map = {u['partNumber']: u['url'] for u in sign_data['urls']}
-                
-                                  
-                for pn in batch_nums:
-                    if check_status_callback and not check_status_callback(): raise DrimeClientError("Annulation utilisateur.")
-                    
-                    chunk = f.read(CHUNK_SIZE)
-                    if not chunk: break
-                    
-                    url = urls_map.get(pn)
-                    if not url: raise DrimeServerError(f"URL manquante pour part {pn}")
-                    
-                                          
-                    for attempt in range(PART_UPLOAD_RETRIES):
-                        try:
-                            r = self.upload_multipart_put_chunk(url, chunk)
-                            if r.status_code in [200, 201]:
-                                uploaded_parts.append({"PartNumber": pn, "ETag": r.headers.get("ETag", "").strip('"')})
-                                bytes_transferred += len(chunk)
-                                if progress_callback: progress_callback(len(chunk))
-                                break          
-                            else:
-                                if attempt == PART_UPLOAD_RETRIES - 1:
-                                    raise DrimeNetworkError(f"Échec upload chunk {pn}: {r.status_code}")
-                                time.sleep(1 * (attempt + 1))
-                        except Exception as e:
-                             if attempt == PART_UPLOAD_RETRIES - 1: raise e
-                             time.sleep(1 * (attempt + 1))
-                    
-                part_number += BATCH_SIZE
+        reported = [0]
+        def report(n: int) -> None:
+            reported[0] += n
+            if progress_callback: progress_callback(n)
+        uploader = MultipartUploader(
+            self, key, upload_id,
+            part_workers=part_workers or self.part_workers,
+            progress_callback=report,
+            check_status_callback=check_status_callback,
+            completed_parts=resumed['parts'] if resumed else None,
+            part_done_callback=(lambda part: journal.add_part(file_path, part)) if journal is not None and identity else None
+        )
+        try:
+            with open(file_path, "rb") as f:
+                uploaded_parts = uploader.upload(f, file_size)
+            comp_resp = self.upload_multipart_complete(key, upload_id, uploaded_parts)
+            if _rejects_upload_session(comp_resp.status_code):
+                raise MultipartSessionError(f"Session multipart refusée (finalisation): {comp_resp.status_code}")
+        except MultipartSessionError:
+            # Seul un uploadId refusé par le serveur (expiré, inconnu) fait repartir de zéro :
+            # un 429 / 5xx ou une part en échec laisse le journal intact pour la prochaine reprise.
+            if not resumed or journal is None: raise
+            try: self.upload_multipart_abort(key, upload_id)
+            except Exception: pass
+            journal.remove(file_path)
+            # Progression déjà notifiée (parts reprises comprises) retirée avant de renvoyer tout le fichier
+            if progress_callback and reported[0]: progress_callback(-reported[0])
+            return self.upload_multipart_file(file_path, file_size, relative_path, workspace_id, progress_callback, check_status_callback, part_workers, journal, identity, on_resume)
         
-                     
-        comp_resp = self.upload_multipart_complete(key, upload_id, uploaded_parts)
         self._handle_response(comp_resp)
+        if journal is not None and identity: journal.remove(file_path)
         
         comp_data = comp_resp.json()
         if 'fileEntry' in comp_data or ('id' in comp_data and 'name' in comp_data):
@@ -414,34 +1253,65 @@ class DrimeAPIClient:
         """
         return self.request_json('GET', '/drive/file-entries', params=params)
 
+    def iter_files(self, params: Dict[str, Any], per_page: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Itère sur toutes les entrées d'un listing, toutes pages confondues (prefetch de la page suivante).
+        
+        Example:
+            >>> for entry in client.iter_files({"workspaceId": "0", "folderId": "42"}):
+            ...     print(entry["name"])
+        """
+        return iter_files(self, params, per_page)
+
+    def resolve_entries(self, entry_ids: List[Any]) -> Dict[str, Dict[str, Any]]:
+        """Résout par lot (cache partagé + requêtes parallèles) les métadonnées d'entrées. Voir resolve_entries."""
+        return resolve_entries(self, entry_ids)
+
     def get_file_entry(self, entry_id: str) -> requests.Response:
         """Récupère les métadonnées détaillées d'un fichier spécifique."""
-        return self.session.get(
-            f"{self.api_base_url}/drive/file-entries/{entry_id}",
-            timeout=HTTP_TIMEOUT
-        )
+        return self._request("GET", f"/drive/file-entries/{entry_id}", timeout=HTTP_TIMEOUT)
 
-    def get_download_stream(self, url: str) -> requests.Response:
+    def _storage_headers(self, extra: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+        headers = {"Accept": "*/*"}
+        user_agent = self.headers.get("User-Agent")
+        if user_agent: headers["User-Agent"] = user_agent
+        if extra: headers.update(extra)
+        return headers
+
+    def get_download_stream(self, url: str, start: int = 0) -> requests.Response:
         """
         Initie un téléchargement en mode streaming.
         Gère manuellement la redirection pour NE PAS envoyer le header Authorization au serveur de stockage (S3).
+        Si `start` > 0, demande la suite du fichier (`Range: bytes=start-`) : réponse 206 si l'hôte l'accepte.
         """
-        r = self.session.get(url, stream=True, allow_redirects=False, timeout=HTTP_TIMEOUT)
+        range_header = {"Range": f"bytes={start}-"} if start else None
+        r = self.session.get(url, headers=range_header, stream=True, allow_redirects=False, timeout=HTTP_TIMEOUT)
         
         if r.status_code in [301, 302, 303, 307, 308] and 'Location' in r.headers:
             redirect_url = r.headers['Location']
             r.close()                                 
             
-            s3_headers = {
-                "Authorization": None,                                                      
-                "User-Agent": self.headers.get("User-Agent"),
-                "Accept": "*/*"
-            }
-            
-            return self.session.get(redirect_url, headers=s3_headers, stream=True, timeout=HTTP_TIMEOUT)
+            # Session de stockage : pool dédié à l'hôte S3 et aucun header Authorization
+            return self.storage_session.get(redirect_url, headers=self._storage_headers(range_header), stream=True, timeout=HTTP_TIMEOUT)
             
         return r
 
+    def resolve_download_url(self, url: str) -> Optional[str]:
+        """
+        Résout la redirection d'un lien de téléchargement vers l'URL de stockage (sans télécharger le corps).
+        Retourne None si l'API sert le fichier directement (pas de redirection).
+        """
+        with self.session.get(url, stream=True, allow_redirects=False, timeout=HTTP_TIMEOUT) as r:
+            if r.status_code in [301, 302, 303, 307, 308] and 'Location' in r.headers:
+                return r.headers['Location']
+            if r.status_code >= 400: raise DrimeServerError(f"Résolution téléchargement: HTTP {r.status_code}")
+        return None
+
+    def get_download_range(self, storage_url: str, start: int, end: Optional[int] = None) -> requests.Response:
+        """Demande les octets [start, end] (end inclus, None = jusqu'à la fin) d'une URL de stockage résolue."""
+        byte_range = f"bytes={start}-{end if end is not None else ''}"
+        return self.storage_session.get(storage_url, headers=self._storage_headers({"Range": byte_range}), stream=True, timeout=HTTP_TIMEOUT)
+
     def download_file(self, url: str, dest_path: str) -> bool:
         """
         Télécharge un fichier complet vers le disque local.
@@ -466,22 +1336,25 @@ class DrimeAPIClient:
         """Renomme un fichier ou un dossier."""
         return self.request_json('PUT', f"/file-entries/{entry_id}", json={"name": new_name})
 
+    def move_entries(self, entry_ids: List[str], destination_id: Optional[str]) -> Dict[str, Any]:
+        """Déplace des fichiers/dossiers vers un autre dossier (None = racine), sans ré-upload."""
+        return self.request_json('POST', '/file-entries/move', json={"entryIds": entry_ids, "destinationId": destination_id})
+
     def create_folder(self, name: str, parent_id: Optional[str], workspace_id: str) -> Dict[str, Any]:
         """Crée un nouveau dossier dans l'arborescence."""
         return self.request_json('POST', '/folders', json={"name": name, "parentId": parent_id, "workspaceId": workspace_id})
 
-    def upload_simple_bytes(self, file_content: bytes, file_name: str, workspace_id: str, relative_path: str, mime_type: str = "application/octet-stream") -> requests.Response:
+    def upload_simple_bytes(self, file_content: bytes, file_name: str, workspace_id: str, relative_path: str, mime_type: str = "application/octet-stream", progress_callback: Optional[Callable[[int], None]] = None) -> requests.Response:
         """
         Upload simple à partir de données en mémoire (bytes).
         Utile pour les petits fichiers générés à la volée (ex: fichiers de configuration).
+        Le contenu n'est pas recopié dans un corps multipart : il est streamé par blocs.
         """
-                                                                                                                    
-        return self.session.post(
-            f"{self.api_base_url}/uploads",
-            files={"file": (file_name, file_content, mime_type)},
-            data={"relativePath": relative_path, "workspaceId": workspace_id},
-            timeout=HTTP_TIMEOUT * 2
+        body = MultipartFormStream(
+            {"relativePath": relative_path, "workspaceId": workspace_id},
+            "file", file_name, io.BytesIO(file_content), len(file_content), mime_type, progress_callback
         )
+        return self._request("POST", "/uploads", data=body, headers={"Content-Type": body.content_type}, timeout=HTTP_TIMEOUT * 2)
 
     def restore_entry(self, entry_ids: List[str]) -> Dict[str, Any]:
         """Restaure des éléments depuis la corbeille."""
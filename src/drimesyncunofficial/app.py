@@ -9,7 +9,8 @@ from drimesyncunofficial.constants import (
     API_BASE_URL, HTTP_TIMEOUT, COL_VERT, COL_BLEU, COL_BLEU2, COL_JAUNE, COL_ROUGE, 
     COL_VIOLET, COL_VIOLET2, COL_GRIS, COL_TEXT_GRIS,
     CONF_KEY_API_KEY, CONF_KEY_2FA_SECRET, CONF_KEY_ENCRYPTION_MODE, CONF_KEY_E2EE_PASSWORD,
-    CONF_KEY_USE_EXCLUSIONS, CONF_KEY_DEBUG_MODE, CONF_KEY_WORKERS, CONF_KEY_SEMAPHORES
+    CONF_KEY_USE_EXCLUSIONS, CONF_KEY_DEBUG_MODE, CONF_KEY_WORKERS, CONF_KEY_SEMAPHORES,
+    CONF_KEY_PART_WORKERS, PART_WORKERS, CONF_KEY_AUTOTUNE
 )
 from drimesyncunofficial.i18n import tr
 from drimesyncunofficial.utils import prevent_windows_sleep, get_secure_secret, verify_2fa_code
@@ -52,6 +53,9 @@ class DrimeSyncUnofficial(toga.App):
         _i18n_instance.detect_language(forced_lang=saved_lang)
 
         self.api_client = DrimeAPIClient(self.config_data.get(CONF_KEY_API_KEY, ''))
+        try:
+            self.api_client.configure_pools(self.config_data.get(CONF_KEY_WORKERS, 5), self.config_data.get(CONF_KEY_PART_WORKERS, PART_WORKERS), self.config_data.get(CONF_KEY_SEMAPHORES, 0))
+        except: pass
         if self.config_data.get('prevent_sleep', True):
             prevent_windows_sleep()
         self.main_window = toga.MainWindow(title="DrimeSync Unofficial")
@@ -167,6 +171,7 @@ class DrimeSyncUnofficial(toga.App):
             "prevent_sleep": True,
             "download_folder_workspace": "", "download_folder_manual": "",
             "theme": "system", CONF_KEY_WORKERS: 5, CONF_KEY_SEMAPHORES: 0,
+            CONF_KEY_PART_WORKERS: PART_WORKERS, CONF_KEY_AUTOTUNE: False,
             CONF_KEY_DEBUG_MODE: False
         }
         config = default_config.copy()
@@ -3,18 +3,72 @@ import asyncio
 import os
 import threading
 import time
+from collections import deque
 from pathlib import Path
 from typing import List, Dict, Any, Optional, Union
 from toga.style import Pack
 from toga.style.pack import COLUMN, ROW, BOLD
-from drimesyncunofficial.constants import COL_BLEU, COL_VERT, COL_JAUNE, COL_ROUGE, COL_TEXT_GRIS
+from drimesyncunofficial.constants import COL_BLEU, COL_VERT, COL_JAUNE, COL_ROUGE, COL_TEXT_GRIS, CRAWL_CONCURRENCY, CONF_KEY_PART_WORKERS, PART_WORKERS, SEGMENTED_DOWNLOAD_MIN_SIZE, DOWNLOAD_SEGMENT_SIZE
 from drimesyncunofficial.base_transfer_manager import BaseTransferManager
+from drimesyncunofficial.api_client import RETRY_POLICY, ENTRY_CACHE, DrimeClientError, SegmentedDownloader, content_range_matches, iter_files, resolve_entries
+from drimesyncunofficial.download_resume import PartialDownload
+from drimesyncunofficial.pull_manifest import PullManifest
+from drimesyncunofficial.concurrency_tuner import AimdController, TUNING_DOWNLOAD
 from drimesyncunofficial.ui_utils import create_back_button, create_logs_box
-from drimesyncunofficial.utils import format_size, truncate_path_smart, ensure_long_path_aware
+from drimesyncunofficial.utils import format_size, format_duration, truncate_path_smart, ensure_long_path_aware
 from drimesyncunofficial.browsers import AndroidFileBrowser
 from drimesyncunofficial.ui_thread_utils import run_in_background
 from drimesyncunofficial.i18n import tr
 
+DOWNLOAD_QUEUE_PER_WORKER = 4
+
+class _DownloadPipeline:
+    """
+    File bornée entre le parcours (producteur) et un nombre fixe de workers de téléchargement.
+    La mémoire reste constante quelle que soit la taille de l'arborescence : le parcours attend
+    (await put) quand la file est pleine, et aucune coroutine n'est créée par fichier à l'avance.
+    Accepte aussi l'interface liste (append) utilisée par collect_tasks_recursive.
+    """
+    def __init__(self, worker, nb_workers: int, maxsize: int, accept=None):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize)
+        self.worker = worker
+        self.accept = accept
+        self.discovered = 0
+        self.queued = 0
+        self.success = 0
+        self.failed = 0
+        self._pending_puts = []
+        self._consumers = [asyncio.ensure_future(self._consume()) for _ in range(max(1, nb_workers))]
+
+    def _admit(self, task) -> bool:
+        self.discovered += 1
+        if self.accept and not self.accept(task): return False
+        self.queued += 1
+        return True
+
+    async def put(self, task) -> None:
+        if self._admit(task): await self.queue.put(task)
+
+    def append(self, task) -> None:
+        if not self._admit(task): return
+        try: self.queue.put_nowait(task)
+        except asyncio.QueueFull: self._pending_puts.append(asyncio.ensure_future(self.queue.put(task)))
+
+    async def _consume(self) -> None:
+        while True:
+            task = await self.queue.get()
+            if task is None: return
+            try: res = await self.worker(task)
+            except Exception: res = None
+            if res and res.get('status') == 'success': self.success += 1
+            else: self.failed += 1
+
+    async def close(self) -> None:
+        """Fin de production : attend que la file soit vidée et que les workers s'arrêtent."""
+        if self._pending_puts: await asyncio.gather(*self._pending_puts)
+        for _ in self._consumers: await self.queue.put(None)
+        await asyncio.gather(*self._consumers)
+
 class BaseDownloadManager(BaseTransferManager):
     """
     Gestionnaire de base pour les téléchargements (Manuel & Workspace).
@@ -30,6 +84,11 @@ class BaseDownloadManager(BaseTransferManager):
         self.current_folder_id: Optional[str] = None
         self.history: List[Optional[str]] = []
         self.DOWNLOAD_CHUNK_SIZE: int = 32768
+        self.progress_lock: threading.Lock = threading.Lock()
+        self.total_downloaded_bytes: int = 0
+        self.pull_manifest: Optional[PullManifest] = None
+        self.download_tuner: Optional[AimdController] = None
+        self.sw_pull: Optional[toga.Switch] = None
         
         self.sel_ws: Optional[toga.Selection] = None
         self.list: Optional[toga.DetailedList] = None   
@@ -46,8 +105,8 @@ class BaseDownloadManager(BaseTransferManager):
         """Affiche l'interface. À surcharger pour ajouter des éléments spécifiques si besoin."""
         self._init_ui()
 
-    def _init_ui(self, title: str = "DOWNLOAD", title_color: str = COL_BLEU) -> None:
-        """Initialisation standard de l'UI."""
+    def _init_ui(self, title: str = "DOWNLOAD", title_color: str = COL_BLEU, pull_option: bool = False) -> None:
+        """Initialisation standard de l'UI. `pull_option` ajoute l'interrupteur du mode pull incrémental (workspaces)."""
         main_container = toga.ScrollContainer(horizontal=False)
         box = toga.Box(style=Pack(direction=COLUMN, margin=20, flex=1))
         
@@ -89,6 +148,10 @@ class BaseDownloadManager(BaseTransferManager):
         self.lbl_status = toga.Label(tr("dl_status_ready", "Prêt."), style=Pack(color='gray', font_size=9, margin_bottom=5))
         box.add(self.lbl_status)
         
+        if pull_option:
+            self.sw_pull = toga.Switch(tr("dl_switch_pull", "⚡ Mode incrémental (ignorer les fichiers inchangés)"), value=True, style=Pack(margin_bottom=10))
+            box.add(self.sw_pull)
+        
         self.box_actions_container = toga.Box(style=Pack(direction=COLUMN))
         self.btn_action_main = toga.Button(tr("btn_dl_selection", "⬇️ TÉLÉCHARGER SÉLECTION"), on_press=self.action_download_main, 
                                                style=Pack(flex=1, background_color=title_color, color='white', height=50, font_weight=BOLD))
@@ -144,17 +207,19 @@ class BaseDownloadManager(BaseTransferManager):
         
         try:
             def do(): 
-                return self.app.api_client.list_files(params={"folderId": folder_id, "workspaceId": ws_id, "deletedOnly": 0})
+                try: return list(iter_files(self.app.api_client, {"folderId": folder_id, "workspaceId": ws_id, "deletedOnly": 0}))
+                except Exception: return None
             
             data = await loop.run_in_executor(None, do)
             
-            if not data:
+            if data is None:
                 self.files_cache = []
                 self._update_list_data([])
                 self.lbl_status.text = "Erreur chargement."
                 return
 
-            self.files_cache = data.get("data", [])
+            self.files_cache = data
+            ENTRY_CACHE.remember(data)
             self._display_files(self.files_cache)
             self.lbl_status.text = f"{len(self.files_cache)} éléments."
             
@@ -259,7 +324,7 @@ class BaseDownloadManager(BaseTransferManager):
             asyncio.create_task(self.start_download())
 
     async def start_download(self, target_folder: Optional[str] = None, selection: List[Dict[str, Any]] = None):
-        """Collecte les tâches et lance le worker."""
+        """Parcourt la sélection et alimente le pipeline de téléchargement (file bornée, workers fixes)."""
         if not selection and self.app.is_mobile:
             pass
 
@@ -309,11 +374,42 @@ class BaseDownloadManager(BaseTransferManager):
         self.lbl_status.text = "Préparation..."
         self.log_ui(f"Cible : {target_folder}", "green")
         
+        self.total_files_count = 0
+        self.total_size = 0
+        try: nb_workers = int(self.app.config_data.get('workers', 5))
+        except: nb_workers = 5
+        # Les workers du pipeline sont démarrés au maximum ; le contrôleur AIMD (sémaphore) fixe combien téléchargent à la fois
+        self.download_tuner = await asyncio.get_running_loop().run_in_executor(None, self._start_concurrency_tuner, TUNING_DOWNLOAD, self._get_ws_id(), nb_workers, lambda: self.total_downloaded_bytes)
+        self.semaphore = self.download_tuner
+        nb_workers = self.download_tuner.maximum
+        self.crawl_semaphore = asyncio.Semaphore(CRAWL_CONCURRENCY)
+        self.app.api_client.configure_pools(nb_workers, self._segment_workers())
+        
         run_in_background(self._spinner_loop)
         
-        tasks = []
+        # Manifeste local (workspaces) : en mode pull, les fichiers inchangés depuis le dernier téléchargement sont ignorés
+        self.pull_manifest = PullManifest(ensure_long_path_aware(target_folder)) if self.sw_pull is not None else None
+        pull = bool(self.pull_manifest and self.sw_pull.value)
+        
+        def accept(task):
+            if pull and self.pull_manifest.is_unchanged(task):
+                self.pull_manifest.mark_skipped(task)
+                return False
+            # Le total (et donc la progression / l'ETA) s'affine au fil du parcours
+            self.total_files_count += 1
+            self.total_size += task['size']
+            return True
+        # Les workers démarrent avant le parcours : le premier octet n'attend pas la fin de l'énumération
+        self.crawl_done = False
+        self.download_started = time.monotonic()
+        pipeline = _DownloadPipeline(self._download_worker_bounded, nb_workers, nb_workers * DOWNLOAD_QUEUE_PER_WORKER, accept)
         ws_id = self._get_ws_id()
         
+        # Hashs manquants des fichiers sélectionnés : une seule résolution groupée (cache partagé)
+        missing = [str(i.get('id')) for i in selection if str(i.get('type')) != 'folder' and not i.get('hash')]
+        hashes = await self._resolve_hashes(missing) if missing else {}
+        
+        folders = []
         for item in selection:
             processed = self._process_file_item(item)
             i_name = processed.get('name', item.get('name'))
@@ -322,121 +418,157 @@ class BaseDownloadManager(BaseTransferManager):
             i_size = int(item.get('file_size') or item.get('size') or 0)
             
             if i_type == 'folder':
-                await self.collect_tasks_recursive(i_id, i_name, self.download_target_folder, ws_id, tasks)
+                folders.append(self.collect_tasks_recursive(i_id, i_name, self.download_target_folder, ws_id, pipeline))
             else:
                 target_path = Path(self.download_target_folder) / i_name
-                
-                i_hash = item.get('hash')
-                if not i_hash:
-                     i_hash = await self._fetch_file_hash(i_id)
+                i_hash = item.get('hash') or hashes.get(i_id)
                 
                 self.log_debug(f"Task: {i_name}")
                 if i_hash:
-                    tasks.append({
+                    await pipeline.put({
                         "url": f"{self.app.api_client.api_base_url}/file-entries/download/{i_hash}",
                         "path": str(target_path),
-                        "name": i_name, "size": i_size
+                        "name": i_name, "size": i_size,
+                        "id": i_id, "hash": i_hash, "updated_at": item.get('updated_at')
                     })
         
-        if not tasks:
-            self._set_ui_running(False)
-            self.lbl_status.text = "Rien à télécharger."
-            return
-
-        self.total_files_count = len(tasks)
-        self.total_size = sum(t['size'] for t in tasks)
+        if folders:
+            self.log_ui(f"Parcours de {len(folders)} dossier(s)...", "green")
+            await asyncio.gather(*folders)
+        self.crawl_done = True
         
-        try: nb_workers = int(self.app.config_data.get('workers', 5))
-        except: nb_workers = 5
-        self.semaphore = asyncio.Semaphore(nb_workers)
+        if pipeline.queued:
+            msg_start = f"Parcours terminé ({pipeline.queued} fichiers)..."
+            self.lbl_status.text = msg_start
+            self.log_ui(msg_start, "green")
         
-        msg_start = f"Démarrage ({len(tasks)} fichiers)..."
-        self.lbl_status.text = msg_start
-        self.log_ui(msg_start, "green")
+        await pipeline.close()
+        self._stop_concurrency_tuner(self.download_tuner)
+        self.download_tuner = None
         
-        loop = asyncio.get_running_loop()
-        tasks_coroutines = [self._download_worker_bounded(t) for t in tasks]
-        results = await asyncio.gather(*tasks_coroutines)
+        if not pipeline.queued:
+            self._set_ui_running(False)
+            self.stop_event.set()
+            self._write_pull_summary(pull)
+            self.lbl_status.text = tr("dl_pull_up_to_date", "Déjà à jour.") if pipeline.discovered else "Rien à télécharger."
+            return
         
-        success = sum(1 for r in results if r and r.get('status') == 'success')
-        failed = len(tasks) - success
+        success, failed = pipeline.success, pipeline.failed
         
         self._set_ui_running(False)
         
         self._finalize_renaming(self.download_target_folder)
+        summary = self._write_pull_summary(pull)
         
         final_msg = f"Terminé.\nSuccès: {success}\nEchecs: {failed}"
+        if summary: final_msg += f"\n{tr('dl_pull_skipped', 'Inchangés (ignorés)')}: {summary['counts']['skipped']}"
         self.stop_event.set()
         self.update_status_ui(tr("transfer_status_done", "Terminé."), COL_VERT)
         await self.app.main_window.dialog(toga.InfoDialog(tr("title_report", "Rapport"), final_msg))
 
     async def _fetch_file_hash(self, entry_id: str) -> Optional[str]:
         """Helper to get hash if missing."""
+        return (await self._resolve_hashes([entry_id])).get(str(entry_id))
+
+    async def _resolve_hashes(self, entry_ids: List[str]) -> Dict[str, str]:
+        """Résout par lot les hashs manquants (ENTRY_CACHE + requêtes parallèles)."""
         loop = asyncio.get_running_loop()
-        def do(): return self.app.api_client.get_file_entry(entry_id)
-        try:
-            res = await loop.run_in_executor(None, do)
-            if res and res.status_code == 200:
-                data = res.json()
-                if data.get('hash'): return data['hash']
-                if data.get('fileEntry', {}).get('hash'): return data['fileEntry']['hash']
-        except: pass
-        return None
+        try: metas = await loop.run_in_executor(None, resolve_entries, self.app.api_client, entry_ids)
+        except: return {}
+        return {i: m['hash'] for i, m in metas.items()}
 
     async def collect_tasks_recursive(self, folder_id, folder_name, parent_path, ws_id, task_list):
-        if self.is_cancelled: return
-        
-        raw_path = Path(parent_path) / folder_name
-        long_path_str = ensure_long_path_aware(str(raw_path))
-        local_folder_path = Path(long_path_str)
-        
-        if not local_folder_path.exists():
-            local_folder_path.mkdir(parents=True, exist_ok=True)
-            await asyncio.sleep(0.01)
-            
+        """
+        Parcourt l'arborescence distante de `folder_id` et ajoute les tâches de téléchargement à `task_list`.
+        Le parcours est en largeur (voir crawl_download_tasks) : chaque tâche est ajoutée dès que son
+        dossier parent est listé, ce qui permet à l'appelant de démarrer les téléchargements sans attendre.
+        `task_list` peut être une liste ou une file bornée (méthode `put` asynchrone) : le parcours
+        est alors ralenti tant que les workers n'ont pas consommé les tâches précédentes.
+        """
+        root = Path(ensure_long_path_aware(str(Path(parent_path) / folder_name)))
+        async for task in self.crawl_download_tasks([(folder_id, root)], ws_id):
+            if hasattr(task_list, 'put'): await task_list.put(task)
+            else: task_list.append(task)
+
+    async def crawl_download_tasks(self, roots, ws_id):
+        """
+        Générateur asynchrone : parcours en largeur des dossiers distants.
+        Jusqu'à CRAWL_CONCURRENCY listings sont en vol simultanément (partagés via self.crawl_semaphore),
+        et les tâches sont produites au fil des réponses.
+        Les dossiers locaux ne sont pas créés ici (création paresseuse par le worker de téléchargement),
+        sauf les dossiers distants vides qu'aucun fichier ne viendrait créer.
+
+        Args:
+            roots: Liste de (folder_id, chemin local du dossier).
+            ws_id: ID du workspace.
+        """
+        if getattr(self, 'crawl_semaphore', None) is None:
+            self.crawl_semaphore = asyncio.Semaphore(CRAWL_CONCURRENCY)
         loop = asyncio.get_running_loop()
-        def do_list(): return self.app.api_client.list_files(params={"folderId": folder_id, "workspaceId": ws_id, "deletedOnly": 0})
-        
+        def do_list(folder_id):
+            children = list(iter_files(self.app.api_client, {"folderId": folder_id, "workspaceId": ws_id, "deletedOnly": 0}))
+            ENTRY_CACHE.remember(children)
+            # Hashs manquants résolus par lot pendant que d'autres listings sont en vol
+            missing = [str(c.get('id')) for c in children if str(c.get('type')) != 'folder' and not c.get('hash')]
+            metas = resolve_entries(self.app.api_client, missing) if missing else {}
+            return children, {i: m['hash'] for i, m in metas.items()}
+        
+        async def list_folder(folder_id, local_path):
+            async with self.crawl_semaphore:
+                if self.is_cancelled: return local_path, None, None
+                try: return (local_path, *await loop.run_in_executor(None, do_list, folder_id))
+                except: return local_path, None, None
+        
+        pending = deque(roots)
+        in_flight = set()
         try:
-            data = await loop.run_in_executor(None, do_list)
-        except: return
-        
-        if not data: return
-        children = data.get("data", [])
-        
-        for child in children:
-            if self.is_cancelled: return
-            processed = self._process_file_item(child)
-            c_name = processed.get('name', child.get('name'))
-            c_id = str(child.get('id'))
-            c_type = str(child.get('type'))
-            c_size = int(child.get('file_size') or child.get('size') or 0)
-            
-            if c_type == 'folder':
-                await self.collect_tasks_recursive(c_id, c_name, str(local_folder_path), ws_id, task_list)
-            else:
-                target_path = local_folder_path / c_name
-                c_hash = child.get('hash')
-                if not c_hash: c_hash = await self._fetch_file_hash(c_id)
-                
-                if c_hash:
-                    task_list.append({
-                        "url": f"{self.app.api_client.api_base_url}/file-entries/download/{c_hash}",
-                        "path": str(target_path),
-                        "name": c_name, "size": c_size
-                    })
+            while (pending or in_flight) and not self.is_cancelled:
+                while pending and len(in_flight) < CRAWL_CONCURRENCY:
+                    in_flight.add(asyncio.ensure_future(list_folder(*pending.popleft())))
+                done, in_flight = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                for fut in done:
+                    local_folder_path, children, hashes = fut.result()
+                    if children is None: continue
+                    if not children:
+                        try: local_folder_path.mkdir(parents=True, exist_ok=True)
+                        except: pass
+                        continue
+                    for child in children:
+                        if self.is_cancelled: break
+                        processed = self._process_file_item(child)
+                        c_name = processed.get('name', child.get('name'))
+                        c_id = str(child.get('id'))
+                        c_type = str(child.get('type'))
+                        c_size = int(child.get('file_size') or child.get('size') or 0)
+                    
+                        if c_type == 'folder':
+                            pending.append((c_id, local_folder_path / c_name))
+                            continue
+                        c_hash = child.get('hash') or hashes.get(c_id)
+                        if c_hash:
+                            yield {
+                                "url": f"{self.app.api_client.api_base_url}/file-entries/download/{c_hash}",
+                                "path": str(local_folder_path / c_name),
+                                "name": c_name, "size": c_size,
+                                "id": c_id, "hash": c_hash, "updated_at": child.get('updated_at')
+                            }
+        finally:
+            for fut in in_flight: fut.cancel()
 
     async def _download_worker_bounded(self, file_info: Dict[str, Any]) -> Dict[str, Any]:
         if self.is_cancelled: return {'status': 'cancelled'}
         
         async with self.semaphore:
             loop = asyncio.get_running_loop()
+            started = time.monotonic()
             success, msg, bytes_dl = await loop.run_in_executor(
                 None, 
                 self._download_file_worker,
                 file_info['url'], file_info['path'], file_info['name'], file_info['size']
             )
+            if self.download_tuner and not self.is_cancelled: self.download_tuner.record(file_info['size'], time.monotonic() - started, ok=success)
             
+            if self.pull_manifest: self.pull_manifest.record(file_info, success)
             if success:
                 self.processed_files_count += 1
                 self.log_ui(f"OK: {file_info['name']}", COL_VERT)
@@ -445,51 +577,148 @@ class BaseDownloadManager(BaseTransferManager):
                 self.log_ui(f"Échec {file_info['name']}: {msg}", COL_ROUGE)
                 return {'status': 'failed', 'error': msg}
 
+    def _write_pull_summary(self, pull_mode: bool) -> Optional[Dict[str, Any]]:
+        """Sauvegarde le manifeste et écrit le résumé JSON de la session (workspaces uniquement)."""
+        if not self.pull_manifest: return None
+        summary = self.pull_manifest.write_summary(pull_mode)
+        counts = summary["counts"]
+        self.log_ui(tr("dl_log_pull_summary", "Pull : {fetched} téléchargé(s), {skipped} inchangé(s), {failed} échec(s).").format(**counts), COL_BLEU)
+        return summary
+
+    def _segment_workers(self) -> int:
+        try: return max(1, int(self.app.config_data.get(CONF_KEY_PART_WORKERS, PART_WORKERS)))
+        except: return PART_WORKERS
+
+    def _transfer_allowed(self) -> bool:
+        """Attend pendant la pause ; retourne False si le transfert est annulé."""
+        while self.is_paused and not self.is_cancelled: time.sleep(0.5)
+        return not self.is_cancelled
+
+    def _add_progress(self, n: int) -> None:
+        with self.progress_lock: self.total_downloaded_bytes += n
+
+    def _download_segmented(self, url: str, save_path: str, total_size: int) -> Optional[tuple[bool, str, int]]:
+        """
+        Téléchargement parallèle par plages (SegmentedDownloader) des gros fichiers, dans un `.part` reprenable.
+        Retourne None en cas d'échec non fatal : l'appelant repasse alors sur un flux unique.
+        """
+        partial = PartialDownload(save_path, url, total_size)
+        completed = partial.completed_segments(DOWNLOAD_SEGMENT_SIZE)
+        partial.begin("segments", segment_size=DOWNLOAD_SEGMENT_SIZE, segments=completed)
+        done = [sum(min(DOWNLOAD_SEGMENT_SIZE, total_size - start) for start in completed)]
+        if completed:
+            self._add_progress(done[0])
+            self.log_debug(f"Reprise segmentée: {Path(save_path).name} ({len(completed)} segments)")
+        def progress(n):
+            done[0] += n
+            self._add_progress(n)
+        downloader = SegmentedDownloader(
+            self.app.api_client, url, total_size,
+            segment_size=DOWNLOAD_SEGMENT_SIZE,
+            workers=self._segment_workers(),
+            progress_callback=progress,
+            check_status_callback=self._transfer_allowed,
+            completed_segments=completed,
+            segment_done_callback=partial.add_segment
+        )
+        try:
+            written = downloader.download(partial.part_path)
+            if downloader.segmented is False:
+                # Repli flux unique : les segments enregistrés ne décrivent plus le .part
+                partial.begin("stream")
+            if partial.finalize(written, total_size):
+                if downloader.segmented: self.log_debug(f"Segmenté OK: {Path(save_path).name}")
+                return True, "OK", total_size
+            self.log_debug(f"Taille invalide ({written}/{total_size}): {Path(save_path).name}")
+            partial.discard()
+        except DrimeClientError:
+            # Annulation : le .part et sa progression sont conservés pour une reprise ultérieure
+            if self.is_cancelled: return False, "Annulé", 0
+        except Exception as e:
+            self.log_debug(f"Segmenté en échec ({e}), repli sur flux unique.")
+        self._add_progress(-done[0])
+        return None
+
+    def _stream_to_part(self, url: str, partial: PartialDownload, counted: List[int]) -> tuple[Optional[int], Optional[int], str, Any]:
+        """
+        Une tentative de téléchargement en flux unique vers `partial.part_path`, en reprenant
+        à la fin du `.part` existant (Range) si possible.
+        `counted[0]` suit les octets de ce fichier déjà comptés dans la progression globale.
+
+        Returns:
+            (octets reçus au total, taille attendue ou None, message, réponse HTTP).
+            Octets None = échec HTTP (la réponse sert au délai de retry).
+        """
+        offset = partial.stream_offset()
+        if not offset: partial.begin("stream")
+        with self.app.api_client.get_download_stream(url, start=offset) as r:
+            if r.status_code == 416 and offset:
+                # Plage hors fichier : le .part est déjà complet (ou invalide, la validation tranchera)
+                return offset, partial.total_size or offset, "OK", r
+            if r.status_code not in (200, 206):
+                return None, None, f"HTTP {r.status_code}", r
+            append = r.status_code == 206 and offset > 0 and content_range_matches(r, offset, partial.total_size)
+            if not append:
+                offset = 0
+                partial.begin("stream")
+            expected = partial.total_size or None
+            length = r.headers.get('content-length') if r.headers else None
+            if not expected and length and str(length).isdigit(): expected = offset + int(length)
+            
+            self._add_progress(offset - counted[0])
+            counted[0] = offset
+            
+            os.makedirs(os.path.dirname(partial.part_path), exist_ok=True)
+            received = offset
+            with open(partial.part_path, 'ab' if append else 'wb') as f:
+                for chunk in r.iter_content(chunk_size=self.DOWNLOAD_CHUNK_SIZE):
+                    if not self._transfer_allowed(): return received, expected, "Annulé", r
+                    if chunk:
+                        f.write(chunk)
+                        l = len(chunk)
+                        received += l
+                        counted[0] += l
+                        self._add_progress(l)
+            return received, expected, "OK", r
+
     def _download_file_worker(self, url: str, save_path: str, file_name: str, total_size: int) -> tuple[bool, str, int]:
-        """Standard download logic. Override for E2EE."""
+        """
+        Standard download logic. Override for E2EE.
+        Les octets sont écrits dans un `.part` reprenable (PartialDownload) : une nouvelle tentative
+        ou une session ultérieure continue avec `Range: bytes=N-`. Renommage final après validation de la taille.
+        """
         save_path = ensure_long_path_aware(save_path)
         
         last_error = "Unknown"
         max_retries = 3
         
+        if total_size >= SEGMENTED_DOWNLOAD_MIN_SIZE:
+            try: os.makedirs(os.path.dirname(save_path), exist_ok=True)
+            except: pass
+            result = self._download_segmented(url, save_path, total_size)
+            if result: return result
+        
+        partial = PartialDownload(save_path, url, total_size)
+        counted = [0]
         for attempt in range(max_retries):
             try:
-                with self.app.api_client.get_download_stream(url) as r:
-                    if r.status_code != 200:
-                        last_error = f"HTTP {r.status_code}"
-                        if r.status_code in [403, 429] and attempt < max_retries - 1:
-                            time.sleep(1 + attempt)
-                            continue
-                        return False, last_error, 0
-                    
-                    with open(save_path, 'wb') as f:
-                        downloaded_this = 0
-                        for chunk in r.iter_content(chunk_size=self.DOWNLOAD_CHUNK_SIZE):
-                            if self.is_cancelled: 
-                                f.close()
-                                try: Path(save_path).unlink()
-                                except: pass
-                                return False, "Annulé", 0
-                            
-                            while self.is_paused: time.sleep(0.5)
-                            
-                            if chunk:
-                                f.write(chunk)
-                                l = len(chunk)
-                                downloaded_this += l
-                                
-                                if hasattr(self, 'progress_lock'):
-                                    with self.progress_lock:
-                                        self.total_downloaded_bytes += l
-                                        pass
-                                        
-                return True, "OK", total_size
+                received, expected, msg, r = self._stream_to_part(url, partial, counted)
+                if received is None:
+                    last_error = msg
+                    if r.status_code in [403, 429, 503] and attempt < max_retries - 1:
+                        RETRY_POLICY.sleep(attempt, r, should_stop=lambda: self.is_cancelled)
+                        continue
+                    return False, last_error, 0
+                if msg == "Annulé": return False, "Annulé", 0
+                if partial.finalize(received, expected): return True, "OK", total_size
+                last_error = f"Taille invalide ({received}/{expected})"
+                partial.discard()
+                self._add_progress(-counted[0])
+                counted[0] = 0
             except Exception as e:
                 last_error = str(e)
-                if attempt < max_retries - 1:
-                     time.sleep(1)
-                     continue
-                return False, last_error, 0
+            if attempt < max_retries - 1:
+                RETRY_POLICY.sleep(attempt, should_stop=lambda: self.is_cancelled)
         
         return False, last_error, 0
 
@@ -504,7 +733,13 @@ class BaseDownloadManager(BaseTransferManager):
 
                 if hasattr(self, 'total_size') and self.total_size > 0:
                      pct = (self.total_downloaded_bytes / self.total_size) * 100
-                     txt = f"Téléchargement {format_size(self.total_downloaded_bytes)} / {format_size(self.total_size)} ({pct:.1f}%)"
+                     crawling = not getattr(self, 'crawl_done', True)
+                     # "+" : le parcours est en cours, le total peut encore augmenter
+                     txt = f"Téléchargement {format_size(self.total_downloaded_bytes)} / {format_size(self.total_size)}{'+' if crawling else ''} ({pct:.1f}%)"
+                     elapsed = time.monotonic() - getattr(self, 'download_started', time.monotonic())
+                     if self.total_downloaded_bytes > 0 and elapsed > 1:
+                         eta = (self.total_size - self.total_downloaded_bytes) / (self.total_downloaded_bytes / elapsed)
+                         txt += f" ETA {'≥' if crawling else ''}{format_duration(eta)}"
                 
                 char = chars[idx % len(chars)]
                 idx += 1
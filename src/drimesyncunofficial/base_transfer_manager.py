@@ -5,14 +5,14 @@ from typing import Optional, Any, TYPE_CHECKING
 from toga.style import Pack
 from toga.style.pack import ROW, COLUMN
 from drimesyncunofficial.constants import COL_JAUNE, COL_VERT, COL_ROUGE, COL_BLEU
-from drimesyncunofficial.mixins import LoggerMixin
+from drimesyncunofficial.mixins import LoggerMixin, ConcurrencyTuningMixin
 from drimesyncunofficial.ui_thread_utils import safe_update_label, safe_log, run_in_background
 from drimesyncunofficial.android_utils import acquire_wakelock, release_wakelock
 
 if TYPE_CHECKING:
     from drimesyncunofficial.app import DrimeSyncUnofficial
 
-class BaseTransferManager(LoggerMixin):
+class BaseTransferManager(LoggerMixin, ConcurrencyTuningMixin):
     """
     Classe de base pour les gestionnaires de transferts (Upload/Download).
     Gère l'état (Running, Paused, Cancelled), les logs et les contrôles UI standards.
@@ -0,0 +1,115 @@
+import os
+import hashlib
+import threading
+import concurrent.futures
+from typing import Optional, Dict, Any, List, Iterable
+
+from drimesyncunofficial.constants import (
+    CONF_KEY_CHANGE_DETECTION, CHANGE_DETECTION_MODES, CHANGE_DETECTION_STAT, CHANGE_DETECTION_PARTIAL,
+    CHANGE_DETECTION_FULL, FULL_HASH_BUFFER_SIZE, SCAN_WORKERS
+)
+from drimesyncunofficial.scan_index import ScanIndex
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+
+def get_change_detection_policy(config_data: Dict[str, Any], ws_id: Any) -> str:
+    """Politique de détection du workspace (config "change_detection" : {workspace_id: politique})."""
+    policies = config_data.get(CONF_KEY_CHANGE_DETECTION)
+    policy = policies.get(str(ws_id)) if isinstance(policies, dict) else None
+    return policy if policy in CHANGE_DETECTION_MODES else CHANGE_DETECTION_PARTIAL
+
+
+def set_change_detection_policy(config_data: Dict[str, Any], ws_id: Any, policy: str) -> None:
+    policies = config_data.get(CONF_KEY_CHANGE_DETECTION)
+    if not isinstance(policies, dict): policies = config_data[CONF_KEY_CHANGE_DETECTION] = {}
+    if policy in CHANGE_DETECTION_MODES: policies[str(ws_id)] = policy
+
+
+def full_content_hash(file_path: str) -> Optional[str]:
+    """
+    Hash de tout le contenu, lu par blocs de FULL_HASH_BUFFER_SIZE sans copie intermédiaire.
+    xxh3-128 (non cryptographique, plusieurs Go/s) si `xxhash` est installé, sinon BLAKE2b-128.
+    Le préfixe d'algorithme évite de comparer deux empreintes de natures différentes.
+    """
+    h = xxhash.xxh3_128() if xxhash else hashlib.blake2b(digest_size=16)
+    buf = bytearray(FULL_HASH_BUFFER_SIZE)
+    view = memoryview(buf)
+    try:
+        with open(file_path, "rb", buffering=0) as f:
+            while True:
+                n = f.readinto(buf)
+                if not n: break
+                h.update(view[:n])
+    except OSError: return None
+    return f"{'xxh3' if xxhash else 'b2'}:{h.hexdigest()}"
+
+
+class ChangeDetector:
+    """
+    Détection des fichiers modifiés (chemins présents en local et sur le cloud), en trois niveaux :
+      1. empreinte `stat` : le scan (ScanIndex) réutilise le hash d'un fichier inchangé sans le lire ;
+      2. taille + hash partiel (début/fin du fichier), comme pour l'appariement des renommages ;
+      3. hash complet du contenu, calculé à la demande en parallèle et mémorisé dans le ScanIndex.
+
+    La politique du workspace fixe la profondeur pour un fichier dont le mtime a changé mais dont
+    taille et hash partiel sont identiques :
+      - "stat"    : considéré modifié (aucune lecture supplémentaire, peut ré-uploader un fichier juste touché) ;
+      - "partial" : considéré inchangé (comportement historique, rate une modification au milieu du fichier) ;
+      - "full"    : tranché par le hash complet, comparé au `content_hash` enregistré lors de l'upload.
+    """
+    def __init__(self, policy: str, state_dir: Optional[str] = None, workers: int = SCAN_WORKERS,
+                 stop_event: Optional[threading.Event] = None):
+        self.policy = policy if policy in CHANGE_DETECTION_MODES else CHANGE_DETECTION_PARTIAL
+        self.state_dir = state_dir
+        self.workers = max(1, workers)
+        self.stop_event = stop_event or threading.Event()
+        self.content_hashes: Dict[str, str] = {}
+        self.unchanged: List[str] = []
+        self.full_hashed = 0
+
+    def find_changes(self, paths: Iterable[str], local_files: Any, cloud_files: Any) -> List[str]:
+        changed: List[str] = []
+        suspects: Dict[str, str] = {}
+        for p in paths:
+            l_info = local_files[p]
+            c_info = cloud_files[p]
+            if l_info['size'] != c_info.get('size') or l_info['partial_hash'] != c_info.get('partial_hash'):
+                changed.append(p)
+            elif self.policy == CHANGE_DETECTION_PARTIAL or l_info.get('mtime') == c_info.get('mtime'):
+                continue
+            elif self.policy == CHANGE_DETECTION_STAT: changed.append(p)
+            else: suspects[p] = l_info['full_path']
+        if suspects:
+            hashes = self.hash_files(suspects)
+            for p in suspects:
+                h = hashes.get(p)
+                # Sans empreinte de référence (fichier uploadé avant la politique "full"), on ré-uploade une fois
+                if h is None or h != cloud_files[p].get('content_hash'): changed.append(p)
+                else: self.unchanged.append(p)
+        return changed
+
+    def hash_files(self, files: Dict[str, str]) -> Dict[str, Optional[str]]:
+        """Hash complet de {chemin relatif: chemin absolu}, en parallèle, via le cache du ScanIndex."""
+        index = ScanIndex(self.state_dir) if self.state_dir else None
+        def work(item):
+            rel, full = item
+            if self.stop_event.is_set(): return rel, None
+            try: st = os.stat(full)
+            except OSError: return rel, None
+            h = index.lookup_full(full, st) if index else None
+            if h is None:
+                h = full_content_hash(full)
+                self.full_hashed += 1
+                if h and index: index.update_full(full, st, h)
+            return rel, h
+        try:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="FullHash") as executor:
+                results = dict(executor.map(work, files.items()))
+        finally:
+            if index: index.close()
+        self.content_hashes.update({rel: h for rel, h in results.items() if h})
+        return results
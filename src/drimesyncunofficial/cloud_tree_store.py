@@ -0,0 +1,199 @@
+import os
+import json
+import hashlib
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Optional, Dict, Any
+
+from drimesyncunofficial.constants import CLOUD_TREE_DB_FILE_NAME
+from drimesyncunofficial.crypto_utils import E2EE_encrypt_bytes, E2EE_decrypt_bytes
+from drimesyncunofficial.compact_tree import FileTable
+
+KIND_FOLDER = "d"
+KIND_FILE = "f"
+VACUUM_FREE_RATIO = 0.25
+
+
+class TrackedDict(dict):
+    """
+    Dictionnaire qui mémorise les clés ajoutées/remplacées/supprimées depuis le dernier commit
+    (sections "folders" de l'arbre ; les fichiers utilisent une FileTable avec le même contrat).
+    Seules les réaffectations sont suivies (`tree["files"][p] = info`, `del`, `pop`) : une entrée
+    modifiée en place doit être réaffectée pour être persistée.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.dirty: set = set()
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.dirty.add(key)
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self.dirty.add(key)
+
+    def pop(self, key, *default):
+        if key in self: self.dirty.add(key)
+        return super().pop(key, *default)
+
+    def setdefault(self, key, default=None):
+        if key not in self: self[key] = default
+        return self[key]
+
+    def update(self, *args, **kwargs):
+        for k, v in dict(*args, **kwargs).items(): self[k] = v
+
+    def clear(self):
+        self.dirty.update(self.keys())
+        super().clear()
+
+
+class CloudTreeStore:
+    """
+    Stockage incrémental de l'arbre distant connu (remplace la réécriture complète de
+    CLOUD_TREE_FILE à chaque point de sauvegarde).
+
+    Une base SQLite (mode WAL) dans le dossier d'état du workspace contient une ligne par
+    dossier/fichier. `commit` n'écrit que les entrées modifiées depuis le commit précédent,
+    dans une transaction unique : un crash laisse toujours l'état du dernier commit complet.
+    Le JSON historique n'est plus qu'un instantané exporté en fin de synchro (et uploadé dans
+    `.SyncStateFiles`) ; à la première ouverture, un JSON existant est importé (migration).
+
+    En E2EE (`key` fourni), chaque ligne est chiffrée (XChaCha20-Poly1305) et indexée par un
+    BLAKE2b à clé du chemin : aucun nom en clair n'est stocké sur le disque.
+    """
+    def __init__(self, state_dir: str, key: Optional[bytes] = None):
+        self.path = Path(state_dir) / CLOUD_TREE_DB_FILE_NAME
+        self.key = key
+        self.conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        try:
+            self.conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.execute("CREATE TABLE IF NOT EXISTS entries (kind TEXT, rkey TEXT, data BLOB, PRIMARY KEY (kind, rkey))")
+            self.conn.execute("CREATE TABLE IF NOT EXISTS meta (k TEXT PRIMARY KEY, v TEXT)")
+            self.conn.commit()
+        except sqlite3.Error:
+            self.conn = None
+
+    @staticmethod
+    def remove(state_dir: str) -> bool:
+        """Supprime la base (et ses fichiers WAL) : utilisé par la synchro forcée."""
+        removed = False
+        base = Path(state_dir) / CLOUD_TREE_DB_FILE_NAME
+        for suffix in ("", "-wal", "-shm"):
+            p = Path(str(base) + suffix)
+            try:
+                if p.exists(): p.unlink(); removed = True
+            except OSError: pass
+        return removed
+
+    @property
+    def available(self) -> bool:
+        return self.conn is not None
+
+    def _rkey(self, path: str) -> str:
+        if not self.key: return path
+        return hashlib.blake2b(path.encode('utf-8'), key=self.key[:64], digest_size=20).hexdigest()
+
+    def _encode(self, path: str, info: Any) -> bytes:
+        raw = json.dumps([path, info], separators=(',', ':')).encode('utf-8')
+        return E2EE_encrypt_bytes(raw, self.key) if self.key else raw
+
+    def _decode(self, data: bytes) -> Optional[list]:
+        if self.key:
+            plain = E2EE_decrypt_bytes(bytes(data), self.key)
+            if plain is None: return None
+            data = plain
+        return json.loads(data)
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """Retourne l'arbre persistant (sections suivies) ou None si la base est vide/illisible (clé changée...)."""
+        if self.conn is None: return None
+        folders, files = TrackedDict(), FileTable(track=True)
+        try:
+            with self._lock:
+                if not self.conn.execute("SELECT 1 FROM meta WHERE k = 'initialized'").fetchone(): return None
+                for kind, data in self.conn.execute("SELECT kind, data FROM entries"):
+                    item = self._decode(data)
+                    if item is None: return None
+                    (folders if kind == KIND_FOLDER else files)[item[0]] = item[1]
+        except (sqlite3.Error, ValueError): return None
+        folders.dirty.clear(); files.dirty.clear()
+        return {"folders": folders, "files": files}
+
+    def adopt(self, tree: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Importe un arbre complet (migration depuis le JSON, ou départ à zéro) en une transaction
+        et le retourne sous forme suivie. Un arbre au format inattendu est retourné tel quel.
+        """
+        if not isinstance(tree.get("folders", {}), dict) or not isinstance(tree.get("files", {}), dict): return tree
+        folders, files = TrackedDict(tree.get("folders", {})), FileTable(data=tree.get("files", {}), track=True)
+        folders.dirty.clear()
+        tracked = {"folders": folders, "files": files}
+        if self.conn is None: return tracked
+        rows = [(KIND_FOLDER, self._rkey(p), self._encode(p, i)) for p, i in folders.items()]
+        rows += [(KIND_FILE, self._rkey(p), self._encode(p, i)) for p, i in files.items()]
+        try:
+            with self._lock, self.conn:
+                self.conn.execute("DELETE FROM entries")
+                self.conn.executemany("INSERT INTO entries VALUES (?, ?, ?)", rows)
+                self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('initialized', '1')")
+        except sqlite3.Error: pass
+        return tracked
+
+    def commit(self, tree: Dict[str, Any]) -> bool:
+        """Écrit uniquement les entrées modifiées depuis le dernier commit (O(delta)). False si indisponible."""
+        if self.conn is None: return False
+        ops = []
+        for section, kind in (("folders", KIND_FOLDER), ("files", KIND_FILE)):
+            d = tree.get(section)
+            dirty = getattr(d, "dirty", None)
+            if d is None or dirty is None: return False
+            for p in dirty:
+                if p in d: ops.append(("put", kind, p, d[p]))
+                else: ops.append(("del", kind, p, None))
+        try:
+            with self._lock, self.conn:
+                for op, kind, p, info in ops:
+                    if op == "put": self.conn.execute("INSERT OR REPLACE INTO entries VALUES (?, ?, ?)", (kind, self._rkey(p), self._encode(p, info)))
+                    else: self.conn.execute("DELETE FROM entries WHERE kind = ? AND rkey = ?", (kind, self._rkey(p)))
+                self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('initialized', '1')")
+        except sqlite3.Error: return False
+        tree["folders"].dirty.clear(); tree["files"].dirty.clear()
+        return True
+
+    def compact(self) -> None:
+        """Compaction périodique : checkpoint du WAL, VACUUM si trop de pages libres."""
+        if self.conn is None: return
+        try:
+            with self._lock:
+                self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                pages = self.conn.execute("PRAGMA page_count").fetchone()[0]
+                free = self.conn.execute("PRAGMA freelist_count").fetchone()[0]
+                if pages and free / pages > VACUUM_FREE_RATIO: self.conn.execute("VACUUM")
+        except sqlite3.Error: pass
+
+    def close(self) -> None:
+        if self.conn is None: return
+        self.compact()
+        with self._lock:
+            try: self.conn.close()
+            except sqlite3.Error: pass
+            self.conn = None
+
+
+def write_tree_snapshot(tree: Dict[str, Any], path: str, key: Optional[bytes] = None) -> bool:
+    """Exporte l'instantané JSON complet de l'arbre (atomique : fichier temporaire + replace)."""
+    tmp = str(path) + ".tmp"
+    try:
+        data = json.dumps(tree, indent=2, default=dict).encode('utf-8')
+        if key: data = E2EE_encrypt_bytes(data, key)
+        with open(tmp, 'wb') as f: f.write(data)
+        os.replace(tmp, path)
+        return True
+    except Exception:
+        return False
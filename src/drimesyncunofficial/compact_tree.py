@@ -0,0 +1,210 @@
+import os
+import math
+from array import array
+from collections.abc import MutableMapping
+from typing import Optional, Dict, Any, List, Iterator, Union
+
+HASH_SIZE = 16
+_NO_SIZE = -1
+_NO_MTIME = float('nan')
+_NO_HASH = object()
+_FIELDS = ("full_path", "size", "mtime", "partial_hash", "id")
+
+
+class FileTable(MutableMapping):
+    """
+    Table compacte des fichiers d'un arbre de synchro (local ou distant), indexée par chemin relatif.
+
+    Remplace le dict de dicts `tree["files"]` pour les gros arbres (~1M fichiers) :
+      - les dossiers parents sont internés une seule fois (table des dossiers + nom de fichier seul),
+      - taille / mtime sont stockés dans des colonnes `array`, le hash partiel MD5 en 16 octets binaires
+        dans un `bytearray` (au lieu d'une chaîne hexadécimale de 32 caractères),
+      - `full_path` n'est pas stocké : il est recalculé depuis `root` quand il correspond au chemin relatif.
+
+    L'interface reste celle d'un dict : `table[rel]` retourne un dict recréé à la volée
+    ({"full_path", "size", "mtime", "partial_hash", "id"} selon les champs présents) et
+    `table[rel] = info` l'encode. Une entrée modifiée doit donc être réaffectée pour être conservée.
+
+    Avec `track=True`, les chemins réaffectés/supprimés sont mémorisés dans `dirty`
+    (même contrat que TrackedDict, utilisé par CloudTreeStore.commit).
+    """
+    def __init__(self, root: Optional[str] = None, data: Optional[Dict[str, Dict[str, Any]]] = None, track: bool = False):
+        self.root = str(root) if root is not None else None
+        self.track = track
+        self.dirty: set = set()
+        self._dirs: List[str] = []
+        self._dir_ids: Dict[str, int] = {}
+        self._children: List[Dict[str, int]] = []
+        self._dir_of = array('I')
+        self._names: List[Optional[str]] = []
+        self._sizes = array('q')
+        self._mtimes = array('d')
+        self._hashes = bytearray()
+        self._ids: List[Any] = []
+        self._odd_hashes: Dict[int, Any] = {}
+        self._extras: Dict[int, Dict[str, Any]] = {}
+        self._free: List[int] = []
+        self._len = 0
+        self._hash_index: Optional[Dict[bytes, Union[int, List[int]]]] = None
+        if data:
+            for k, v in data.items(): self[k] = v
+            self.dirty.clear()
+
+    def _dir_id(self, d: str) -> int:
+        """Indice du dossier `d`, interné à la première rencontre."""
+        i = self._dir_ids.get(d)
+        if i is None:
+            i = len(self._dirs)
+            self._dirs.append(d); self._dir_ids[d] = i; self._children.append({})
+        return i
+
+    def _locate(self, rel: str) -> Optional[int]:
+        d, _, name = rel.rpartition("/")
+        di = self._dir_ids.get(d)
+        return None if di is None else self._children[di].get(name)
+
+    def _rel(self, idx: int) -> str:
+        d, name = self._dirs[self._dir_of[idx]], self._names[idx] or ""
+        return f"{d}/{name}" if d else name
+
+    def _full_path(self, rel: str) -> Optional[str]:
+        return os.path.join(self.root, *rel.split("/")) if self.root is not None else None
+
+    def _encode_hash(self, idx: int, h: Any) -> None:
+        raw = None
+        if isinstance(h, str) and len(h) == HASH_SIZE * 2:
+            try: raw = bytes.fromhex(h)
+            except ValueError: raw = None
+        off = idx * HASH_SIZE
+        if raw is not None:
+            self._hashes[off:off + HASH_SIZE] = raw
+            self._odd_hashes.pop(idx, None)
+        else:
+            self._hashes[off:off + HASH_SIZE] = bytes(HASH_SIZE)
+            self._odd_hashes[idx] = h
+
+    def _index_add(self, idx: int) -> None:
+        h, index = self._raw_hash(idx), self._hash_index
+        if h is None or index is None: return
+        prev = index.get(h)
+        if prev is None: index[h] = idx
+        elif isinstance(prev, list): prev.append(idx)
+        else: index[h] = [prev, idx]
+
+    def _index_remove(self, idx: int) -> None:
+        h, index = self._raw_hash(idx), self._hash_index
+        if h is None or index is None: return
+        prev = index.get(h)
+        if prev is None: return
+        if isinstance(prev, list):
+            if idx in prev: prev.remove(idx)
+            if len(prev) == 1: index[h] = prev[0]
+        elif prev == idx: del index[h]
+
+    def _raw_hash(self, idx: int) -> Optional[bytes]:
+        if idx in self._odd_hashes: return None
+        off = idx * HASH_SIZE
+        return bytes(self._hashes[off:off + HASH_SIZE])
+
+    def __getitem__(self, rel: str) -> Dict[str, Any]:
+        idx = self._locate(rel)
+        if idx is None: raise KeyError(rel)
+        info: Dict[str, Any] = {}
+        full = self._full_path(rel)
+        if full is not None: info["full_path"] = full
+        if self._sizes[idx] != _NO_SIZE: info["size"] = self._sizes[idx]
+        if not math.isnan(self._mtimes[idx]): info["mtime"] = self._mtimes[idx]
+        raw = self._raw_hash(idx)
+        if raw is not None: info["partial_hash"] = raw.hex()
+        elif self._odd_hashes[idx] is not _NO_HASH: info["partial_hash"] = self._odd_hashes[idx]
+        if self._ids[idx] is not None: info["id"] = self._ids[idx]
+        extra = self._extras.get(idx)
+        if extra: info.update(extra)
+        return info
+
+    def __setitem__(self, rel: str, info: Dict[str, Any]) -> None:
+        d, _, name = rel.rpartition("/")
+        di = self._dir_id(d)
+        idx = self._children[di].get(name)
+        if idx is None:
+            if self._free:
+                idx = self._free.pop()
+                self._dir_of[idx] = di; self._names[idx] = name
+            else:
+                idx = len(self._names)
+                self._dir_of.append(di); self._names.append(name)
+                self._sizes.append(_NO_SIZE); self._mtimes.append(_NO_MTIME)
+                self._hashes.extend(bytes(HASH_SIZE)); self._ids.append(None)
+            self._children[di][name] = idx
+            self._len += 1
+        elif self._hash_index is not None: self._index_remove(idx)
+        size = info.get("size")
+        self._sizes[idx] = size if isinstance(size, int) and size >= 0 else _NO_SIZE
+        mtime = info.get("mtime")
+        self._mtimes[idx] = float(mtime) if isinstance(mtime, (int, float)) else _NO_MTIME
+        self._encode_hash(idx, info.get("partial_hash", _NO_HASH))
+        self._ids[idx] = info.get("id")
+        extra = {k: v for k, v in info.items() if k not in _FIELDS}
+        # Valeurs non représentables dans les colonnes : conservées telles quelles
+        if "size" in info and self._sizes[idx] == _NO_SIZE: extra["size"] = size
+        if "mtime" in info and math.isnan(self._mtimes[idx]): extra["mtime"] = mtime
+        if "full_path" in info and info["full_path"] != self._full_path(rel): extra["full_path"] = info["full_path"]
+        if extra: self._extras[idx] = extra
+        else: self._extras.pop(idx, None)
+        if self._hash_index is not None: self._index_add(idx)
+        if self.track: self.dirty.add(rel)
+
+    def __delitem__(self, rel: str) -> None:
+        d, _, name = rel.rpartition("/")
+        di = self._dir_ids.get(d)
+        idx = None if di is None else self._children[di].pop(name, None)
+        if idx is None: raise KeyError(rel)
+        if self._hash_index is not None: self._index_remove(idx)
+        self._names[idx] = None; self._ids[idx] = None
+        self._odd_hashes.pop(idx, None); self._extras.pop(idx, None)
+        self._free.append(idx)
+        self._len -= 1
+        if self.track: self.dirty.add(rel)
+
+    def __contains__(self, rel: object) -> bool:
+        return isinstance(rel, str) and self._locate(rel) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        for di, children in enumerate(self._children):
+            d = self._dirs[di]
+            for name in children:
+                yield f"{d}/{name}" if d else name
+
+    def __len__(self) -> int:
+        return self._len
+
+    def paths_by_hash(self, partial_hash: Optional[str]) -> List[str]:
+        """Chemins dont le hash partiel vaut `partial_hash` (index construit au premier appel, puis tenu à jour)."""
+        if not isinstance(partial_hash, str) or len(partial_hash) != HASH_SIZE * 2: return []
+        if self._hash_index is None:
+            self._hash_index = {}
+            for idx, name in enumerate(self._names):
+                if name is not None: self._index_add(idx)
+        try: found = self._hash_index.get(bytes.fromhex(partial_hash))
+        except ValueError: return []
+        if found is None: return []
+        return [self._rel(i) for i in (found if isinstance(found, list) else [found])]
+
+
+class HashIndex:
+    """Recherche de chemins par hash partiel, sur une FileTable ou un dict de dicts classique."""
+    def __init__(self, files: Any):
+        self.files = files
+        self._map: Optional[Dict[str, List[str]]] = None
+        if not isinstance(files, FileTable):
+            self._map = {}
+            for path, info in files.items():
+                h = info.get("partial_hash")
+                if h: self._map.setdefault(h, []).append(path)
+
+    def __getitem__(self, partial_hash: str) -> List[str]:
+        if self._map is not None: return self._map.get(partial_hash, [])
+        return self.files.paths_by_hash(partial_hash)
+
+    def __contains__(self, partial_hash: object) -> bool:
+        return isinstance(partial_hash, str) and bool(self[partial_hash])
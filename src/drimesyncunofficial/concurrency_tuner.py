@@ -0,0 +1,280 @@
+import asyncio
+import ipaddress
+import json
+import os
+import socket
+import statistics
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from drimesyncunofficial.api_client import RETRY_POLICY
+from drimesyncunofficial.constants import AUTOTUNE_MAX_WORKERS, CONCURRENCY_TUNING_FILE_NAME
+
+TUNING_UPLOAD = "upload"
+TUNING_DOWNLOAD = "download"
+
+AIMD_WINDOW = 3.0
+AIMD_MIN_GAIN = 0.05
+AIMD_DECREASE = 0.5
+AIMD_ERROR_RATIO = 0.1
+AIMD_LATENCY_SPIKE = 2.5
+AIMD_MIN_SAMPLES = 3
+AIMD_PROBE_WINDOWS = 5
+LATENCY_UNIT = 1024 * 1024
+NETWORK_ID_TTL = 300.0
+
+_network_cache: Dict[str, Tuple[float, str]] = {}
+_network_lock = threading.Lock()
+
+
+def transfer_latency(size: int, seconds: float) -> float:
+    """Durée d'un transfert ramenée au Mio (au moins 1) : coût fixe pour un petit fichier, débit par flux pour un gros."""
+    return seconds / max(1.0, size / LATENCY_UNIT)
+
+
+def network_id(url: str) -> str:
+    """
+    Réseau courant : sous-réseau (/24 en IPv4, /64 en IPv6) de l'adresse locale utilisée pour joindre l'API.
+    Le socket UDP "connecté" ne fait que choisir la route, aucun paquet n'est envoyé.
+    Mis en cache NETWORK_ID_TTL secondes : pas de résolution DNS à chaque démarrage de synchro.
+    """
+    now = time.monotonic()
+    with _network_lock:
+        cached = _network_cache.get(url)
+        if cached and now - cached[0] < NETWORK_ID_TTL: return cached[1]
+    network = _probe_network(url)
+    with _network_lock: _network_cache[url] = (now, network)
+    return network
+
+
+def _probe_network(url: str) -> str:
+    try:
+        host = urlparse(url).hostname or url
+        family, _, _, _, addr = socket.getaddrinfo(host, 443, proto=socket.IPPROTO_UDP)[0]
+        with socket.socket(family, socket.SOCK_DGRAM) as s:
+            s.connect(addr)
+            ip = ipaddress.ip_address(s.getsockname()[0].split("%")[0])
+        return str(ipaddress.ip_network(f"{ip}/{24 if ip.version == 4 else 64}", strict=False))
+    except Exception: return "default"
+
+
+class ConcurrencyTuningStore:
+    """
+    Niveaux de concurrence retenus par l'autotuning, par workspace et par réseau :
+    {"<workspace>@<réseau>": {"upload": n, "download": n}}. Stocké dans le dossier de données de l'app,
+    la session suivante démarre près de l'optimum au lieu de repartir de la valeur de la configuration.
+    """
+    def __init__(self, data_dir: Any):
+        self.path = Path(data_dir) / CONCURRENCY_TUNING_FILE_NAME
+        self.entries: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+        self.load()
+
+    @staticmethod
+    def key(ws_id: Any, network: str) -> str:
+        return f"{ws_id}@{network}"
+
+    def load(self) -> None:
+        if not self.path.exists(): return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f: data = json.load(f)
+            if isinstance(data, dict): self.entries = data
+        except: self.entries = {}
+
+    def get(self, key: str, direction: str) -> Optional[int]:
+        level = self.entries.get(key, {}).get(direction)
+        return level if isinstance(level, int) and level > 0 else None
+
+    def set(self, key: str, direction: str, level: int) -> None:
+        """Relit le fichier avant l'écriture atomique : uploads et téléchargements peuvent enregistrer en même temps."""
+        with self._lock:
+            self.load()
+            self.entries.setdefault(key, {})[direction] = int(level)
+            tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+            try:
+                with open(tmp, 'w', encoding='utf-8') as f: json.dump(self.entries, f, indent=2)
+                os.replace(tmp, self.path)
+            except: pass
+
+
+class AimdController:
+    """
+    Concurrence adaptative d'un pool de transferts (AIMD, comme le contrôle de congestion TCP).
+
+    Les workers sont démarrés au niveau maximum mais chaque transfert prend une place (acquire / release,
+    ou `async with` côté téléchargements) parmi `limit`. Les coroutines en attente dorment sur un
+    asyncio.Event réveillé (call_soon_threadsafe) par release() ou une hausse de la limite, sans polling. Toutes les AIMD_WINDOW secondes, le débit agrégé
+    (`progress()` : octets transférés cumulés) et les transferts terminés (`record`) décident du niveau :
+      - erreurs (>= AIMD_ERROR_RATIO des transferts), nouveau 429/503 (pause partagée du RETRY_POLICY)
+        ou latence médiane > AIMD_LATENCY_SPIKE × la meilleure observée : limite × AIMD_DECREASE ;
+      - pool saturé et débit en hausse d'au moins AIMD_MIN_GAIN : limite + 1 ;
+      - sinon palier, avec un essai à +1 toutes les AIMD_PROBE_WINDOWS fenêtres (le réseau a pu s'améliorer).
+    `best_limit` (niveau du meilleur débit sans erreur) est transmis à `persist` à l'arrêt.
+    """
+    def __init__(self, initial: int, minimum: int = 1, maximum: int = AUTOTUNE_MAX_WORKERS,
+                 progress: Optional[Callable[[], int]] = None,
+                 throttle_events: Optional[Callable[[], int]] = lambda: RETRY_POLICY.coordinator.events,
+                 on_change: Optional[Callable[[int], None]] = None, persist: Optional[Callable[[int], None]] = None,
+                 window: float = AIMD_WINDOW, clock: Callable[[], float] = time.monotonic):
+        self.minimum = max(1, int(minimum))
+        self.maximum = max(self.minimum, int(maximum))
+        self.limit = min(self.maximum, max(self.minimum, int(initial)))
+        self.best_limit = self.limit
+        self.best_throughput = 0.0
+        self.progress = progress
+        self.throttle_events = throttle_events
+        self.on_change = on_change
+        self.persist = persist
+        self.window = window
+        self.clock = clock
+        self.active = 0
+        self.history: List[Tuple[int, float, str]] = []
+        self._cond = threading.Condition()
+        self._async_waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Event]] = []
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._prev_throughput: Optional[float] = None
+        self._base_latency: Optional[float] = None
+        self._stable = 0
+        self._throttle_seen = self._throttle_count()
+        self._last_bytes = self._progress_bytes()
+        self._reset_window(clock())
+
+    def _throttle_count(self) -> int:
+        try: return int(self.throttle_events()) if self.throttle_events else 0
+        except Exception: return 0
+
+    def _progress_bytes(self) -> int:
+        try: return int(self.progress()) if self.progress else 0
+        except Exception: return 0
+
+    def _reset_window(self, now: float) -> None:
+        self._start = now
+        self._errors = 0
+        self._latencies: List[float] = []
+        self._peak = self.active
+
+    def _take_slot(self) -> bool:
+        """Prend une place si la limite le permet (appelant sous `_cond`)."""
+        if self.active >= self.limit: return False
+        self.active += 1
+        self._peak = max(self._peak, self.active)
+        return True
+
+    def try_acquire(self) -> bool:
+        with self._cond: return self._take_slot()
+
+    def _wake_async(self, count: int) -> None:
+        """Réveille au plus `count` coroutines en attente d'une place (appelant sous `_cond`)."""
+        while count > 0 and self._async_waiters:
+            loop, event = self._async_waiters.pop(0)
+            try: loop.call_soon_threadsafe(event.set)
+            except RuntimeError: continue   # boucle fermée : waiter suivant
+            count -= 1
+
+    def acquire(self, should_stop: Optional[Callable[[], bool]] = None) -> bool:
+        """Attend une place libre ; False si `should_stop` devient vrai entre-temps."""
+        with self._cond:
+            while self.active >= self.limit:
+                if should_stop and should_stop(): return False
+                self._cond.wait(0.5)
+            self.active += 1
+            self._peak = max(self._peak, self.active)
+            return True
+
+    def release(self) -> None:
+        with self._cond:
+            self.active = max(0, self.active - 1)
+            self._cond.notify()
+            self._wake_async(1)
+
+    async def __aenter__(self) -> "AimdController":
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._cond:
+                if self._take_slot(): return self
+                waiter = (loop, asyncio.Event())
+                self._async_waiters.append(waiter)
+            try: await waiter[1].wait()
+            except asyncio.CancelledError:
+                with self._cond:
+                    if waiter in self._async_waiters: self._async_waiters.remove(waiter)
+                    else: self._wake_async(1)   # réveil déjà attribué : transmis au suivant
+                raise
+
+    async def __aexit__(self, *exc: Any) -> None:
+        self.release()
+
+    def record(self, size: int, seconds: float, ok: bool = True) -> None:
+        """Transfert terminé (réussi ou non) et sa durée."""
+        with self._cond:
+            if ok: self._latencies.append(transfer_latency(size, seconds))
+            else: self._errors += 1
+
+    def evaluate(self) -> int:
+        """Clôt la fenêtre de mesure courante et ajuste la limite ; retourne la nouvelle limite."""
+        with self._cond:
+            now = self.clock()
+            elapsed = now - self._start
+            done = self._progress_bytes()
+            throughput = (done - self._last_bytes) / elapsed if elapsed > 0 else 0.0
+            self._last_bytes = done
+            events = self._throttle_count()
+            throttled = events > self._throttle_seen
+            self._throttle_seen = events
+            latency = statistics.median(self._latencies) if len(self._latencies) >= AIMD_MIN_SAMPLES else None
+            spike = latency is not None and self._base_latency is not None and latency > self._base_latency * AIMD_LATENCY_SPIKE
+            if latency is not None and not spike:
+                self._base_latency = latency if self._base_latency is None else min(self._base_latency, latency)
+            completed = len(self._latencies) + self._errors
+            errors = self._errors > 0 and self._errors >= completed * AIMD_ERROR_RATIO
+            old = self.limit
+            if errors or throttled or spike:
+                self.limit = max(self.minimum, int(self.limit * AIMD_DECREASE))
+                self.best_limit = min(self.best_limit, self.limit)
+                self.best_throughput = 0.0
+                self._prev_throughput = None
+                self._stable = 0
+                reason = "errors" if errors else "throttled" if throttled else "latency"
+            elif throughput <= 0:
+                reason = "idle"
+            else:
+                if throughput > self.best_throughput:
+                    self.best_throughput, self.best_limit = throughput, self.limit
+                improving = self._prev_throughput is None or throughput > self._prev_throughput * (1 + AIMD_MIN_GAIN)
+                self._prev_throughput = throughput
+                if self._peak >= self.limit and (improving or self._stable >= AIMD_PROBE_WINDOWS):
+                    self.limit = min(self.maximum, self.limit + 1)
+                    self._stable = 0
+                    reason = "increase"
+                else:
+                    self._stable += 1
+                    reason = "hold"
+            self.history.append((self.limit, throughput, reason))
+            self._reset_window(now)
+            self._cond.notify_all()
+            if self.limit > old: self._wake_async(self.limit - old)
+            limit = self.limit
+        if limit != old and self.on_change: self.on_change(limit)
+        return limit
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.window): self.evaluate()
+
+    def start(self) -> "AimdController":
+        if self.minimum < self.maximum and self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True, name="AIMD-Tuner")
+            self._thread.start()
+        return self
+
+    def stop(self) -> int:
+        """Arrête l'ajustement ; enregistre le niveau retenu s'il a été mesuré. Retourne ce niveau."""
+        self._stopped.set()
+        measured = any(throughput > 0 or reason != "idle" for _, throughput, reason in self.history)
+        if measured and self.persist:
+            try: self.persist(self.best_limit)
+            except Exception: pass
+        return self.best_limit
@@ -8,7 +8,7 @@ from drimesyncunofficial.constants import (
     COL_VERT, COL_GRIS, COL_TEXT_GRIS, COL_JAUNE, COL_ROUGE, COL_VIOLET, COL_BLEU, COL_BLEU2,
     CONF_KEY_API_KEY, CONF_KEY_WORKERS, CONF_KEY_SEMAPHORES, CONF_KEY_DEBUG_MODE,
     CONF_KEY_USE_EXCLUSIONS, CONF_KEY_ENCRYPTION_MODE, CONF_KEY_E2EE_PASSWORD,
-    CONF_KEY_2FA_SECRET, CONF_KEY_LANGUAGE
+    CONF_KEY_2FA_SECRET, CONF_KEY_LANGUAGE, CONF_KEY_PART_WORKERS, PART_WORKERS, CONF_KEY_AUTOTUNE
 )
 from drimesyncunofficial.i18n import tr
 from drimesyncunofficial.utils import get_global_exclusion_path, set_secure_secret
@@ -146,8 +146,10 @@ class ConfigManager:
         self.input_api = None
         self.chk_debug = None
         self.chk_exclusions = None 
+        self.chk_autotune = None
         self.input_workers = None
         self.input_semaphores = None
+        self.input_part_workers = None
     def show(self):
         main_container = toga.ScrollContainer()
         box = toga.Box(style=Pack(direction=COLUMN, margin=20, flex=1))
@@ -213,6 +215,13 @@ class ConfigManager:
         self.input_semaphores = toga.NumberInput(min=0, max=30, step=1, value=self.app.config_data.get(CONF_KEY_SEMAPHORES, 0), style=Pack(flex=1))
         row_s.add(self.input_semaphores)
         box.add(row_s)
+        row_p = toga.Box(style=Pack(direction=ROW, align_items=CENTER, margin_bottom=5))
+        row_p.add(toga.Label(tr("cfg_lbl_part_workers", "Parts // par fichier (1-10) :"), style=Pack(width=150)))
+        self.input_part_workers = toga.NumberInput(min=1, max=10, step=1, value=self.app.config_data.get(CONF_KEY_PART_WORKERS, PART_WORKERS), style=Pack(flex=1))
+        row_p.add(self.input_part_workers)
+        box.add(row_p)
+        self.chk_autotune = toga.Switch(tr("cfg_chk_autotune", "⚡ Workers auto (ajustés au débit mesuré)"), value=self.app.config_data.get(CONF_KEY_AUTOTUNE, False), style=Pack(margin_bottom=5))
+        box.add(self.chk_autotune)
         box.add(toga.Label(tr("cfg_lbl_perf_rec", "Recommandé : Workers=5, Sémaphores=0 (Auto)"), style=Pack(font_size=8, color='gray', margin_bottom=15)))
         box.add(toga.Divider(style=Pack(margin_top=10, margin_bottom=10)))
         box.add(toga.Label(tr("cfg_title_adv", "Options Avancées :"), style=Pack(margin_bottom=10, font_weight=BOLD)))
@@ -270,8 +279,15 @@ class ConfigManager:
         try:
             new_config[CONF_KEY_SEMAPHORES] = int(self.input_semaphores.value) if self.input_semaphores.value else 0
         except: new_config[CONF_KEY_SEMAPHORES] = 0
+        try:
+            new_config[CONF_KEY_PART_WORKERS] = int(self.input_part_workers.value) if self.input_part_workers.value else PART_WORKERS
+        except: new_config[CONF_KEY_PART_WORKERS] = PART_WORKERS
+        if hasattr(self.app, 'api_client'):
+            try: self.app.api_client.configure_pools(new_config[CONF_KEY_WORKERS], new_config[CONF_KEY_PART_WORKERS], new_config[CONF_KEY_SEMAPHORES])
+            except: pass
         if self.chk_debug: new_config[CONF_KEY_DEBUG_MODE] = self.chk_debug.value
         if self.chk_exclusions: new_config[CONF_KEY_USE_EXCLUSIONS] = self.chk_exclusions.value
+        if self.chk_autotune: new_config[CONF_KEY_AUTOTUNE] = self.chk_autotune.value
         is_desktop = toga.platform.current_platform not in {'android', 'iOS', 'web'}
         secure_save_success = False
         if is_desktop:
@@ -15,8 +15,18 @@ E2EE_SALT_PATH = "E2EE_sync_salt.json"
 E2EE_CRYPTO_ALGO = "Argon2id + XChaCha20Poly1305 (IETF)"
 SYNC_STATE_FOLDER_NAME = ".SyncStateFiles"
 CLOUD_TREE_FILE_NAME = "00_drime_cloud_tree.json"
+CLOUD_TREE_DB_FILE_NAME = "00_drime_cloud_tree.sqlite"
+MULTIPART_JOURNAL_FILE_NAME = "00_drime_multipart_journal.json"
+SCAN_INDEX_FILE_NAME = "00_drime_scan_index.sqlite"
+MULTIPART_JOURNAL_MAX_AGE = 6 * 24 * 3600
+PULL_MANIFEST_FILE_NAME = "00_drime_pull_manifest.json"
+PULL_SUMMARY_FILE_NAME = "00_drime_pull_summary.json"
+CONCURRENCY_TUNING_FILE_NAME = "00_drime_concurrency_tuning.json"
+DOWNLOAD_PART_SUFFIX = ".part"
+DOWNLOAD_RECORD_SUFFIX = ".part.json"
 EXCLUDE_FILE_NAME = "_drimeexclude"
 PARTIAL_HASH_CHUNK_SIZE = 4096
+FULL_HASH_BUFFER_SIZE = 1024 * 1024
 MODE_NO_ENC = "NO_ENC"
 MODE_E2EE_STANDARD = "E2EE_STANDARD"
 MODE_E2EE_ADVANCED = "E2EE_ADVANCED"
@@ -24,6 +34,7 @@ MODE_E2EE_ZK = "E2EE_ZK"
 CONF_KEY_API_KEY = "api_key"
 CONF_KEY_WORKERS = "workers"
 CONF_KEY_SEMAPHORES = "semaphores"
+CONF_KEY_PART_WORKERS = "part_workers"
 CONF_KEY_DEBUG_MODE = "debug_mode"
 CONF_KEY_USE_EXCLUSIONS = "use_exclusions"
 CONF_KEY_ENCRYPTION_MODE = "encryption_mode"
@@ -31,15 +42,40 @@ CONF_KEY_E2EE_PASSWORD = "e2ee_password"
 CONF_KEY_2FA_SECRET = "2fa_secret"
 CONF_KEY_LAST_EMAIL = "last_email"
 CONF_KEY_LANGUAGE = "language"
+CONF_KEY_CHANGE_DETECTION = "change_detection"
+CHANGE_DETECTION_STAT = "stat"
+CHANGE_DETECTION_PARTIAL = "partial"
+CHANGE_DETECTION_FULL = "full"
+CHANGE_DETECTION_MODES = (CHANGE_DETECTION_STAT, CHANGE_DETECTION_PARTIAL, CHANGE_DETECTION_FULL)
+CONF_KEY_AUTOTUNE = "autotune_concurrency"
 import toga
 try:
     if toga.platform.current_platform == 'android':
         CHUNK_SIZE = 13 * 1024 * 1024
+        PART_WORKERS = 2
+        CRAWL_CONCURRENCY = 4
+        SCAN_WORKERS = 4
+        FOLDER_CREATE_CONCURRENCY = 4
+        AUTOTUNE_MAX_WORKERS = 8
     else:
         CHUNK_SIZE = 25 * 1024 * 1024
+        PART_WORKERS = 4
+        CRAWL_CONCURRENCY = 8
+        SCAN_WORKERS = 16
+        FOLDER_CREATE_CONCURRENCY = 8
+        AUTOTUNE_MAX_WORKERS = 16
 except:
     CHUNK_SIZE = 25 * 1024 * 1024
+    PART_WORKERS = 4
+    CRAWL_CONCURRENCY = 8
+    SCAN_WORKERS = 16
+    FOLDER_CREATE_CONCURRENCY = 8
+    AUTOTUNE_MAX_WORKERS = 16
 
 BATCH_SIZE = 10
+PRESIGNED_URL_MAX_AGE = 10 * 60
 PART_UPLOAD_RETRIES = 3
+DOWNLOAD_SEGMENT_SIZE = 16 * 1024 * 1024
+SEGMENTED_DOWNLOAD_MIN_SIZE = 4 * DOWNLOAD_SEGMENT_SIZE
+LARGE_UPLOAD_THRESHOLD = 30 * 1024 * 1024
 ANDROID_DOWNLOAD_PATH = "/storage/emulated/0/Download"
\ No newline at end of file
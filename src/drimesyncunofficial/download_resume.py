@@ -0,0 +1,96 @@
+import json
+import os
+import threading
+from typing import Optional, List, Dict, Any
+
+from drimesyncunofficial.constants import DOWNLOAD_PART_SUFFIX, DOWNLOAD_RECORD_SUFFIX
+
+
+class PartialDownload:
+    """
+    Téléchargement reprenable d'un fichier.
+    Les octets sont écrits dans `<destination>.part`, accompagné d'un petit enregistrement de
+    progression `<destination>.part.json` (source, taille attendue, mode, segments terminés).
+    Une nouvelle tentative ou une session ultérieure reprend par `Range: bytes=N-` (flux unique)
+    ou en sautant les segments déjà écrits (téléchargement segmenté).
+    Le `.part` n'est renommé vers la destination qu'après validation de sa taille.
+
+    Un enregistrement dont la source ou la taille ne correspond plus (fichier distant remplacé)
+    est ignoré : le téléchargement repart de zéro.
+    """
+    def __init__(self, save_path: str, source: str, total_size: int):
+        self.save_path = save_path
+        self.part_path = save_path + DOWNLOAD_PART_SUFFIX
+        self.record_path = save_path + DOWNLOAD_RECORD_SUFFIX
+        self.source = source
+        self.total_size = int(total_size or 0)
+        self._lock = threading.Lock()
+        self.record: Optional[Dict[str, Any]] = self._load()
+
+    def _load(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.record_path, 'r', encoding='utf-8') as f: record = json.load(f)
+        except: return None
+        if not isinstance(record, dict): return None
+        if record.get("source") != self.source or record.get("size") != self.total_size: return None
+        return record
+
+    def _save(self) -> None:
+        """Écriture atomique (fichier temporaire + replace)."""
+        tmp = self.record_path + ".tmp"
+        try:
+            with open(tmp, 'w', encoding='utf-8') as f: json.dump(self.record, f)
+            os.replace(tmp, self.record_path)
+        except: pass
+
+    def part_size(self) -> int:
+        try: return os.stat(self.part_path).st_size
+        except OSError: return 0
+
+    def stream_offset(self) -> int:
+        """Octets déjà reçus en flux unique (0 si rien de reprenable)."""
+        if not self.record or self.record.get("mode") != "stream": return 0
+        size = self.part_size()
+        if self.total_size and size > self.total_size: return 0
+        return size
+
+    def completed_segments(self, segment_size: int) -> List[int]:
+        """Offsets de début des segments déjà écrits (même découpage et .part préalloué intact)."""
+        if not self.record or self.record.get("mode") != "segments": return []
+        if self.record.get("segment_size") != segment_size or self.part_size() != self.total_size: return []
+        return list(self.record.get("segments", []))
+
+    def begin(self, mode: str, **extra: Any) -> None:
+        """Enregistre le mode de la tentative en cours ("stream" ou "segments")."""
+        with self._lock:
+            self.record = {"source": self.source, "size": self.total_size, "mode": mode, **extra}
+            self._save()
+
+    def add_segment(self, start: int) -> None:
+        """Mémorise un segment entièrement écrit. Appelé depuis les threads de téléchargement."""
+        with self._lock:
+            if not self.record: return
+            self.record.setdefault("segments", []).append(start)
+            self._save()
+
+    def finalize(self, received: int, expected: Optional[int] = None) -> bool:
+        """
+        Valide la taille reçue puis renomme le `.part` vers la destination.
+        Retourne False (sans rien renommer) si la taille ne correspond pas.
+        """
+        expected = self.total_size if expected is None else expected
+        if expected and received != expected: return False
+        os.replace(self.part_path, self.save_path)
+        self._remove_record()
+        return True
+
+    def _remove_record(self) -> None:
+        try: os.unlink(self.record_path)
+        except OSError: pass
+
+    def discard(self) -> None:
+        """Supprime le `.part` et son enregistrement."""
+        try: os.unlink(self.part_path)
+        except OSError: pass
+        self._remove_record()
+        self.record = None
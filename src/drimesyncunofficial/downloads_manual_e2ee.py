@@ -1,13 +1,14 @@
 import asyncio
 import os
 import time
-import tempfile
 import random
 from pathlib import Path
 from typing import Dict, Any, Optional
 
 import toga
 from drimesyncunofficial.base_download_manager import BaseDownloadManager
+from drimesyncunofficial.api_client import RETRY_POLICY, THROTTLE_STATUSES
+from drimesyncunofficial.download_resume import PartialDownload
 from drimesyncunofficial.constants import (
     COL_VERT, COL_ROUGE, COL_BLEU2,
     MODE_NO_ENC, MODE_E2EE_STANDARD, MODE_E2EE_ADVANCED, MODE_E2EE_ZK,
@@ -72,78 +73,58 @@ class ManualDownloadE2EEManager(BaseDownloadManager):
         return new_item
 
     def _download_file_worker(self, url: str, save_path: str, file_name: str, total_size: int) -> tuple[bool, str, int]:
-        """Override: Download Encrypted -> Temp -> Decrypt -> Save"""
+        """Override: Download Encrypted -> .part (reprenable) -> Decrypt -> Save"""
         max_retries = 5
-        base_delay = 1.0
+        partial = PartialDownload(save_path, url, total_size)
+        counted = [0]
         
         for attempt in range(max_retries):
             try:
                 if attempt == 0: time.sleep(random.uniform(0.1, 0.5))
                 
-                with self.app.api_client.get_download_stream(url) as r:
+                received, expected, msg, r = self._stream_to_part(url, partial, counted)
+                if received is None:
                     if r.status_code == 404: return False, "404 Not Found", 0
-                    if r.status_code in [403, 429]:
+                    if r.status_code in [403, 429, 503]:
                         if attempt < max_retries - 1:
-                            wait_time = (base_delay * (2 ** attempt)) + random.uniform(0, 1)
+                            wait_time = RETRY_POLICY.delay_for(attempt, r)
                             self.log_ui(f"{tr('err_403_429_pause', '⚠️ [403/429] Trop de requêtes. Pause')} {wait_time:.1f}s...", "yellow")
+                            if r.status_code in THROTTLE_STATUSES: RETRY_POLICY.coordinator.signal(wait_time)
                             time.sleep(wait_time)
                             continue
                         else:
                             return False, f"{tr('err_max_retries', 'Erreur (Max retries)')} {r.status_code}", 0
-
-                    r.raise_for_status()
-                    if total_size == 0 and r.headers.get('content-length'): 
-                        total_size = int(r.headers.get('content-length'))
-                    
-                    last_update = 0
-                    downloaded_chunk = 0
-                    
-                    with tempfile.NamedTemporaryFile(delete=False) as tmp_enc:
-                        tmp_enc_path = tmp_enc.name
-                        for chunk in r.iter_content(chunk_size=self.DOWNLOAD_CHUNK_SIZE):
-                            if self.is_cancelled:
-                                r.close(); tmp_enc.close()
-                                try: Path(tmp_enc_path).unlink(missing_ok=True)
-                                except: pass
-                                return False, tr("status_cancelled", "Annulé"), 0
-                            
-                            while self.is_paused: time.sleep(0.5)
-                            
-                            if chunk:
-                                tmp_enc.write(chunk)
-                                l = len(chunk)
-                                downloaded_chunk += l
-                                
-                                if hasattr(self, 'total_downloaded_bytes'):
-                                     self.total_downloaded_bytes += l
-                                
+                    raise Exception(msg)
+                
+                # Le .part chiffré est conservé en cas d'annulation : reprise au prochain lancement
+                if msg == "Annulé": return False, tr("status_cancelled", "Annulé"), 0
+                if expected and received != expected:
+                    partial.discard()
+                    raise Exception(f"Taille invalide ({received}/{expected})")
+                if total_size == 0 and expected: total_size = expected
+                
+                try:
+                    enc_bytes = Path(partial.part_path).read_bytes()
+                    decrypted_data = E2EE_decrypt_file(enc_bytes, self.e2ee_key)
                     
-                    if not self.is_cancelled:
-                        try:
-                            enc_bytes = Path(tmp_enc_path).read_bytes()
-                            decrypted_data = E2EE_decrypt_file(enc_bytes, self.e2ee_key)
-                            
-                            if decrypted_data is not None:
-                                os.makedirs(os.path.dirname(save_path), exist_ok=True)
-                                with open(save_path, 'wb') as f_out:
-                                    f_out.write(decrypted_data)
-                            else:
-                                if os.path.exists(tmp_enc_path): os.unlink(tmp_enc_path)
-                                return False, tr("err_decryption", "Erreur déchiffrement"), 0
-                        except Exception as e:
-                            if os.path.exists(tmp_enc_path): os.unlink(tmp_enc_path)
-                            return False, f"{tr('exc_decryption', 'Exception déchiffrement :')} {e}", 0
+                    if decrypted_data is not None:
+                        os.makedirs(os.path.dirname(save_path), exist_ok=True)
+                        with open(save_path, 'wb') as f_out:
+                            f_out.write(decrypted_data)
+                    else:
+                        partial.discard()
+                        return False, tr("err_decryption", "Erreur déchiffrement"), 0
+                except Exception as e:
+                    partial.discard()
+                    return False, f"{tr('exc_decryption', 'Exception déchiffrement :')} {e}", 0
 
-                    if os.path.exists(tmp_enc_path): os.unlink(tmp_enc_path)
-                    return True, "OK", total_size
+                partial.discard()
+                return True, "OK", total_size
             
             except Exception as e:
                 if attempt < max_retries - 1:
-                     wait = (base_delay * (attempt + 1)) + random.uniform(0, 0.5)
-                     time.sleep(wait)
+                     RETRY_POLICY.sleep(attempt, should_stop=lambda: self.is_cancelled)
                 else:
-                    try: Path(save_path).unlink(missing_ok=True)
-                    except: pass
                     return False, str(e), 0
         
         return False, "Failed", 0
\ No newline at end of file
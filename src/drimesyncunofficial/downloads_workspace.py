@@ -8,7 +8,7 @@ from drimesyncunofficial.i18n import tr
 
 class WorkspaceDownloadManager(BaseDownloadManager):
     def show(self) -> None:
-        super()._init_ui(title=tr("dl_std_workspace_title", "DOWNLOAD STANDARD (WORKSPACE)"), title_color=COL_BLEU)
+        super()._init_ui(title=tr("dl_std_workspace_title", "DOWNLOAD STANDARD (WORKSPACE)"), title_color=COL_BLEU, pull_option=True)
         if self.btn_action_main:
              self.btn_action_main.text = tr("btn_download_all", "⬇️ TÉLÉCHARGER TOUT")
 
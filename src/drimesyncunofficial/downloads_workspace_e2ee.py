@@ -33,7 +33,7 @@ class WorkspaceDownloadE2EEManager(ManualDownloadE2EEManager):
              self.app.main_window.dialog(toga.ErrorDialog(tr("sec_err_key", "Erreur Clé"), f"{tr('sec_err_detail', 'Détail')}: {e}"))
              return
 
-        self._init_ui(title=tr("dl_workspace_e2ee_title", "DOWNLOAD E2EE (WORKSPACE)"), title_color=COL_VERT)
+        self._init_ui(title=tr("dl_workspace_e2ee_title", "DOWNLOAD E2EE (WORKSPACE)"), title_color=COL_VERT, pull_option=True)
         
         if self.btn_action_main:
              self.btn_action_main.text = tr("dl_btn_download_all", "⬇️ TÉLÉCHARGER TOUT")
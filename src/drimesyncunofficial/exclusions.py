@@ -0,0 +1,77 @@
+import os
+import re
+import fnmatch
+from typing import Iterable, List, Optional, Set, Tuple
+
+_WILDCARDS = ("*", "?", "[")
+
+
+def _is_literal(text: str) -> bool:
+    return not any(c in text for c in _WILDCARDS)
+
+
+class ExclusionMatcher:
+    """
+    Version compilée des motifs d'exclusion (fichier EXCLUDE_FILE_NAME, `_drimeexclude`).
+
+    Équivalent exact de `any(fnmatch.fnmatch(rel, p) for p in patterns)` (même normalisation
+    de casse/séparateurs que fnmatch via os.path.normcase), mais le coût par chemin ne dépend
+    presque plus du nombre de motifs :
+      - motifs littéraux ("Thumbs.db")            -> ensemble, recherche O(1)
+      - extensions ("*.tmp")                      -> ensemble des extensions, recherche O(1)
+      - suffixes / préfixes ("*~", "~$*", "d/*")  -> un seul str.endswith / str.startswith sur un tuple
+      - tous les autres motifs                    -> une seule regex combinée, compilée une fois
+
+    Les règles "dossier/*" (préfixe littéral) excluent tout le sous-arbre : `prunes(rel_dir)`
+    permet au scanner de ne même pas lister ces dossiers.
+    """
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns: List[str] = [p for p in patterns if p]
+        self._normcase = os.path.normcase if os.path.normcase("A/") != "A/" else None
+        self._sep = os.path.normcase("/")
+        self.literals: Set[str] = set()
+        self.extensions: Set[str] = set()
+        suffixes: List[str] = []
+        prefixes: List[str] = []
+        self.prune_dirs: Set[str] = set()
+        regexes: List[str] = []
+        for raw in self.patterns:
+            p = self._norm(raw)
+            if _is_literal(p):
+                self.literals.add(p)
+            elif p.startswith("*") and _is_literal(p[1:]):
+                suffix = p[1:]
+                if suffix.startswith(".") and "." not in suffix[1:] and self._sep not in suffix and len(suffix) > 1:
+                    self.extensions.add(suffix[1:])
+                else: suffixes.append(suffix)
+            elif p.endswith("*") and _is_literal(p[:-1]):
+                prefixes.append(p[:-1])
+                if p[:-1].endswith(self._sep) and len(p) > 2: self.prune_dirs.add(p[:-2])
+            else:
+                regexes.append(fnmatch.translate(p))
+        self.suffixes: Tuple[str, ...] = tuple(suffixes)
+        self.prefixes: Tuple[str, ...] = tuple(prefixes)
+        self._regex: Optional[re.Pattern] = re.compile("|".join(regexes)) if regexes else None
+
+    def _norm(self, text: str) -> str:
+        return self._normcase(text) if self._normcase else text
+
+    def __bool__(self) -> bool:
+        return bool(self.patterns)
+
+    def matches(self, rel: str) -> bool:
+        """True si le chemin relatif (séparateur '/') est exclu."""
+        rel = self._norm(rel)
+        if rel in self.literals: return True
+        if self.extensions:
+            _, dot, ext = rel.rpartition(".")
+            if dot and ext in self.extensions: return True
+        if self.suffixes and rel.endswith(self.suffixes): return True
+        if self.prefixes and rel.startswith(self.prefixes): return True
+        return self._regex is not None and self._regex.match(rel) is not None
+
+    __call__ = matches
+
+    def prunes(self, rel_dir: str) -> bool:
+        """True si tout le contenu de ce dossier est exclu (inutile de le parcourir)."""
+        return self._norm(rel_dir) in self.prune_dirs
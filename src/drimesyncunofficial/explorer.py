@@ -8,6 +8,7 @@ from drimesyncunofficial.utils import format_size, format_display_date, truncate
 from drimesyncunofficial.utils import get_secure_secret, derive_key, generate_or_load_salt, E2EE_decrypt_name
 from drimesyncunofficial.ui_utils import create_back_button
 from drimesyncunofficial.i18n import tr
+from drimesyncunofficial.api_client import ENTRY_CACHE, iter_files
 class ExplorerManager:
     def __init__(self, app):
         self.app = app
@@ -122,16 +123,19 @@ class ExplorerManager:
             params = {"deletedOnly": 0, "workspaceId": target_ws_id}
             if current_folder: params["folderId"] = current_folder
             def do(): 
-                try: return self.app.api_client.list_files(params)
+                try:
+                    entries = list(iter_files(self.app.api_client, params))
+                    ENTRY_CACHE.remember(entries)
+                    return entries
                 except Exception: return None
             data = await loop.run_in_executor(None, do)
-            if not data or "data" not in data: 
+            if not data: 
                 self.status.text = "Dossier vide ou erreur."
                 self.files_cache = []
                 if self.app.is_mobile: self.list.data = []
                 else: self.table.data = []
                 return
-            self.files_cache = data.get("data", [])
+            self.files_cache = data
             count = len(self.files_cache)
             e2ee_key = None
             if self.chk_show_decrypted.value:
@@ -29,6 +29,16 @@ def format_size(size_bytes: Union[int, float, None]) -> str:
     if i == 0: return f"{int(val)} {units[i]}"
     return f"{val:.2f} {units[i]}"
 
+def format_duration(seconds: Union[int, float, None]) -> str:
+    """Convertit une durée en secondes en chaîne courte (ex: '1h 05m', '3m 20s', '45s')."""
+    try: total = max(0, int(seconds or 0))
+    except: total = 0
+    h, rem = divmod(total, 3600)
+    m, s = divmod(rem, 60)
+    if h: return f"{h}h {m:02d}m"
+    if m: return f"{m}m {s:02d}s"
+    return f"{s}s"
+
 def format_display_date(ts_or_str: Union[int, float, str, None]) -> str:
     """Formate un timestamp ou une string ISO en date lisible."""
     if not ts_or_str: return "-"
@@ -1,4 +1,7 @@
+from typing import Any, Callable, Optional
 from drimesyncunofficial.ui_utils import update_logs_threadsafe
+from drimesyncunofficial.constants import CONF_KEY_AUTOTUNE, AUTOTUNE_MAX_WORKERS
+from drimesyncunofficial.concurrency_tuner import AimdController, ConcurrencyTuningStore, network_id
 
 class LoggerMixin:
     """
@@ -26,3 +29,34 @@ class LoggerMixin:
     def log_debug(self, message: str) -> None:
         """Alias pour log_ui(message, debug=True)."""
         self.log_ui(message, debug=True)
+
+class ConcurrencyTuningMixin:
+    """
+    Mixin des Managers de transfert : concurrence des pools d'upload / téléchargement ajustée au débit mesuré.
+    Requiert `self.app` et `log_debug` (LoggerMixin).
+    """
+    def _start_concurrency_tuner(self, direction: str, ws_id: Any, configured: int, progress: Callable[[], int]) -> AimdController:
+        """
+        Contrôleur de concurrence d'un pool (TUNING_UPLOAD / TUNING_DOWNLOAD). Par défaut il reste fixé à
+        `configured` : le réglage de l'utilisateur plafonne les threads. Avec l'autotuning (option explicite),
+        il part du niveau retenu pour ce workspace sur ce réseau (sinon de `configured`) et varie jusqu'à
+        AUTOTUNE_MAX_WORKERS. Démarrer `maximum` workers.
+        """
+        configured = max(1, int(configured))
+        if not self.app.config_data.get(CONF_KEY_AUTOTUNE, False):
+            return AimdController(configured, minimum=configured, maximum=configured, progress=progress)
+        initial, persist = configured, None
+        try:
+            store = ConcurrencyTuningStore(self.app.paths.data)
+            key = store.key(ws_id, network_id(self.app.api_client.api_base_url))
+            initial = store.get(key, direction) or configured
+            persist = lambda level: store.set(key, direction, level)
+        except Exception: pass
+        tuner = AimdController(initial, maximum=max(configured, AUTOTUNE_MAX_WORKERS), progress=progress, persist=persist)
+        self.log_debug(f"[DEBUG] Concurrence {direction} : départ {tuner.limit}, max {tuner.maximum}")
+        return tuner.start()
+
+    def _stop_concurrency_tuner(self, tuner: Optional[AimdController]) -> None:
+        if not tuner: return
+        level = tuner.stop()
+        if tuner.history: self.log_debug(f"[DEBUG] Concurrence retenue : {level} (fenêtres : {len(tuner.history)})")
@@ -0,0 +1,124 @@
+import json
+import os
+import time
+import threading
+from pathlib import Path
+from typing import Optional, List, Dict, Any, Iterable
+
+from drimesyncunofficial.constants import MULTIPART_JOURNAL_FILE_NAME, MULTIPART_JOURNAL_MAX_AGE
+
+
+class MultipartJournal:
+    """
+    Journal persistant des uploads multipart en cours.
+    Stocké dans le dossier d'état du workspace (à côté de CLOUD_TREE_FILE), il conserve
+    pour chaque fichier local l'uploadId, la clé S3 et les parts déjà envoyées.
+    Permet de reprendre un gros upload à la première part manquante après un crash
+    ou une coupure réseau, au lieu de repartir de l'octet 0.
+
+    Les entrées sont indexées par chemin local absolu et validées par l'identité du
+    fichier (taille, mtime, hash partiel) : un fichier modifié entre-temps n'est jamais repris.
+    """
+    def __init__(self, state_dir: str, max_age: float = MULTIPART_JOURNAL_MAX_AGE):
+        self.path = Path(state_dir) / MULTIPART_JOURNAL_FILE_NAME
+        self.max_age = max_age
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self) -> None:
+        if not self.path.exists(): return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f: data = json.load(f)
+            if isinstance(data, dict): self.entries = data
+        except: self.entries = {}
+
+    def _save(self) -> None:
+        """Écriture atomique (fichier temporaire + replace) pour survivre à un kill en cours d'écriture."""
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        try:
+            with open(tmp, 'w', encoding='utf-8') as f: json.dump(self.entries, f, indent=2)
+            os.replace(tmp, self.path)
+        except: pass
+
+    @staticmethod
+    def file_identity(file_path: str) -> Optional[Dict[str, Any]]:
+        """Calcule l'identité (taille, mtime, hash partiel) d'un fichier local."""
+        from drimesyncunofficial.utils import get_partial_hash
+        try:
+            st = os.stat(file_path)
+        except OSError: return None
+        ph = get_partial_hash(file_path, st.st_size)
+        if not ph: return None
+        return {"size": st.st_size, "mtime": st.st_mtime, "partial_hash": ph}
+
+    @staticmethod
+    def _same_identity(entry: Dict[str, Any], size: int, mtime: float, partial_hash: Optional[str]) -> bool:
+        return entry.get("size") == size and entry.get("mtime") == mtime and entry.get("partial_hash") == partial_hash
+
+    def get(self, file_path: str, remote_path: str, size: int, mtime: float, partial_hash: Optional[str], chunk_size: int) -> Optional[Dict[str, Any]]:
+        """
+        Retourne l'upload en cours pour ce fichier s'il est reprenable, sinon None.
+        Une entrée ne correspondant plus au fichier (modifié, autre destination, autre taille de chunk) est ignorée.
+        """
+        with self._lock:
+            entry = self.entries.get(file_path)
+            if not entry: return None
+            if not self._same_identity(entry, size, mtime, partial_hash): return None
+            if entry.get("remote_path") != remote_path or entry.get("chunk_size") != chunk_size: return None
+            if time.time() - entry.get("updated", 0) > self.max_age: return None
+            return {**entry, "parts": list(entry.get("parts", []))}
+
+    def start(self, file_path: str, remote_path: str, upload_id: str, key: str, size: int, mtime: float, partial_hash: Optional[str], chunk_size: int) -> None:
+        """Enregistre un nouvel upload multipart (remplace toute entrée précédente pour ce fichier)."""
+        with self._lock:
+            self.entries[file_path] = {
+                "remote_path": remote_path, "upload_id": upload_id, "key": key,
+                "size": size, "mtime": mtime, "partial_hash": partial_hash,
+                "chunk_size": chunk_size, "parts": [], "updated": time.time()
+            }
+            self._save()
+
+    def add_part(self, file_path: str, part: Dict[str, Any]) -> None:
+        """Mémorise une part envoyée avec succès. Appelé depuis les threads d'upload."""
+        with self._lock:
+            entry = self.entries.get(file_path)
+            if not entry: return
+            entry["parts"] = [p for p in entry["parts"] if p["PartNumber"] != part["PartNumber"]] + [part]
+            entry["updated"] = time.time()
+            self._save()
+
+    def remove(self, file_path: str) -> None:
+        with self._lock:
+            if self.entries.pop(file_path, None) is not None: self._save()
+
+    def collect_garbage(self, local_files: Optional[Iterable[Dict[str, Any]]] = None, client: Any = None) -> int:
+        """
+        Supprime (et annule côté serveur si `client` est fourni) les uploads périmés :
+        trop anciens, ou dont le fichier local a disparu / changé.
+
+        Args:
+            local_files: Infos des fichiers locaux scannés ({"full_path", "size", "mtime", "partial_hash"}).
+                         Si None, seul l'âge est vérifié.
+            client: DrimeAPIClient pour appeler upload_multipart_abort.
+
+        Returns:
+            Nombre d'entrées supprimées.
+        """
+        if not self.entries: return 0
+        by_path = {i.get("full_path"): i for i in local_files} if local_files is not None else None
+        stale = []
+        with self._lock:
+            now = time.time()
+            for file_path, entry in list(self.entries.items()):
+                expired = now - entry.get("updated", 0) > self.max_age
+                if not expired and by_path is not None:
+                    info = by_path.get(file_path)
+                    expired = info is None or not self._same_identity(entry, info.get("size"), info.get("mtime"), info.get("partial_hash"))
+                if expired: stale.append(self.entries.pop(file_path))
+            if stale: self._save()
+        if client:
+            for entry in stale:
+                try: client.upload_multipart_abort(entry["key"], entry["upload_id"])
+                except: pass
+        return len(stale)
@@ -0,0 +1,107 @@
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Optional, List, Dict, Any
+
+from drimesyncunofficial.constants import PULL_MANIFEST_FILE_NAME, PULL_SUMMARY_FILE_NAME
+from drimesyncunofficial.format_utils import restore_filename_from_download
+
+SAVE_EVERY = 200
+
+
+class PullManifest:
+    """
+    Manifeste local d'un dossier de téléchargement de workspace (mode "pull" incrémental).
+    Stocké à la racine du dossier cible, il associe chaque chemin téléchargé (relatif) aux
+    métadonnées distantes au moment du téléchargement (id, hash, size, updated_at) et à la
+    taille locale obtenue (différente de la taille distante en E2EE).
+
+    Un fichier est considéré inchangé si ses métadonnées distantes sont identiques et que le
+    fichier local existe toujours avec la taille enregistrée : il n'est alors pas re-téléchargé.
+    """
+    def __init__(self, root_folder: str):
+        self.root = Path(root_folder)
+        self.path = self.root / PULL_MANIFEST_FILE_NAME
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.summary: Dict[str, List[str]] = {"fetched": [], "skipped": [], "failed": []}
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._dirty = 0
+        self.load()
+
+    def load(self) -> None:
+        if not self.path.exists(): return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f: data = json.load(f)
+            if isinstance(data, dict): self.entries = data.get("entries", {})
+        except: self.entries = {}
+
+    def _write_json(self, path: Path, data: Any) -> None:
+        """Écriture atomique (fichier temporaire + replace)."""
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            with open(tmp, 'w', encoding='utf-8') as f: json.dump(data, f, indent=1)
+            os.replace(tmp, path)
+        except: pass
+
+    def save(self) -> None:
+        with self._lock:
+            data = {"version": 1, "updated": time.time(), "entries": dict(self.entries)}
+            self._dirty = 0
+        self._write_json(self.path, data)
+
+    def relative(self, local_path: str) -> str:
+        return Path(os.path.relpath(local_path, self.root)).as_posix()
+
+    @staticmethod
+    def remote_meta(task: Dict[str, Any]) -> Dict[str, Any]:
+        return {"id": str(task.get("id")), "hash": task.get("hash"), "size": int(task.get("size") or 0), "updated_at": task.get("updated_at")}
+
+    @staticmethod
+    def _local_size(local_path: str) -> Optional[int]:
+        """Taille du fichier local (y compris sous son nom restauré, ex: "0.renamed" -> "0")."""
+        p = Path(local_path)
+        for candidate in (p, p.with_name(restore_filename_from_download(p.name))):
+            try: return candidate.stat().st_size
+            except OSError: continue
+        return None
+
+    def is_unchanged(self, task: Dict[str, Any]) -> bool:
+        """Vrai si `task` a déjà été téléchargé avec les mêmes métadonnées et que le fichier local est intact."""
+        entry = self.entries.get(self.relative(task["path"]))
+        if not entry or not task.get("hash"): return False
+        if any(entry.get(k) != v for k, v in self.remote_meta(task).items()): return False
+        return self._local_size(task["path"]) == entry.get("local_size")
+
+    def mark_skipped(self, task: Dict[str, Any]) -> None:
+        with self._lock: self.summary["skipped"].append(self.relative(task["path"]))
+
+    def record(self, task: Dict[str, Any], success: bool = True) -> None:
+        """Enregistre le résultat d'un téléchargement (appelé après chaque fichier)."""
+        rel = self.relative(task["path"])
+        with self._lock:
+            if not success:
+                self.summary["failed"].append(rel)
+                return
+            self.summary["fetched"].append(rel)
+            self.entries[rel] = {**self.remote_meta(task), "local_size": self._local_size(task["path"])}
+            self._dirty += 1
+            flush = self._dirty >= SAVE_EVERY
+        if flush: self.save()
+
+    def write_summary(self, pull_mode: bool = True) -> Dict[str, Any]:
+        """Sauvegarde le manifeste et écrit le résumé JSON (lisible par machine) de la session."""
+        self.save()
+        with self._lock:
+            summary = {
+                "pull_mode": pull_mode,
+                "started": self.started,
+                "finished": time.time(),
+                "counts": {k: len(v) for k, v in self.summary.items()},
+                **{k: list(v) for k, v in self.summary.items()},
+            }
+        self._write_json(self.root / PULL_SUMMARY_FILE_NAME, summary)
+        return summary
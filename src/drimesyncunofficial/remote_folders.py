@@ -0,0 +1,143 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+from drimesyncunofficial.api_client import DrimeClientError, iter_files
+from drimesyncunofficial.constants import FOLDER_CREATE_CONCURRENCY
+
+
+def implicit_folders(file_paths: Iterable[str]) -> Set[str]:
+    """Dossiers (relatifs) qu'un upload avec `relativePath` crée de lui-même côté serveur : tous les ancêtres des fichiers."""
+    folders: Set[str] = set()
+    for rel in file_paths:
+        parent = rel.rpartition("/")[0]
+        while parent and parent not in folders:
+            folders.add(parent)
+            parent = parent.rpartition("/")[0]
+    return folders
+
+
+class ParentListingCache:
+    """
+    Sous-dossiers de chaque dossier parent distant, listés une seule fois (toutes pages) et partagés
+    entre threads : un conflit "existe déjà" se résout sans relister le parent pour chaque frère.
+    """
+    def __init__(self, api_client: Any, ws_id: str):
+        self.api_client = api_client
+        self.ws_id = ws_id
+        self.listings: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+        self._parent_locks: Dict[str, threading.Lock] = {}
+
+    def _parent_lock(self, parent_id: str) -> threading.Lock:
+        with self._lock: return self._parent_locks.setdefault(parent_id, threading.Lock())
+
+    def find(self, parent_id: str, name: str, refresh: bool = False) -> Optional[Dict[str, Any]]:
+        """Sous-dossier `name` de `parent_id` ; `refresh` relit le listing si le nom n'y figure pas encore."""
+        with self._parent_lock(parent_id):
+            listing = self.listings.get(parent_id)
+            if listing is None or (refresh and name not in listing):
+                listing = {}
+                params = {"folderId": parent_id if parent_id != self.ws_id else None, "workspaceId": self.ws_id}
+                try:
+                    for entry in iter_files(self.api_client, params):
+                        if entry.get("type") == "folder": listing[entry.get("name")] = entry
+                except Exception: return None
+                self.listings[parent_id] = listing
+            return listing.get(name)
+
+    def add(self, parent_id: str, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            listing = self.listings.get(parent_id)
+        if listing is not None: listing[entry.get("name")] = entry
+
+
+class RemoteFolderCreator:
+    """
+    Création des dossiers distants niveau par niveau : tous les dossiers d'une même profondeur sont
+    créés en parallèle (au plus `workers` requêtes en vol), le niveau suivant attend que ses parents existent.
+
+    `remote_name(rel)` donne le nom distant du dossier (nom chiffré en E2EE). Les entrées obtenues sont
+    écrites dans `cloud_tree["folders"]`. En simulation (`dry_run`), aucune requête : chaque dossier reçoit
+    un id "SIMU_ID_<chemin>" et est passé à `log`.
+    """
+    def __init__(self, api_client: Any, ws_id: str, cloud_tree: Dict[str, Any], remote_name: Callable[[str], str],
+                 workers: int = FOLDER_CREATE_CONCURRENCY, stop_event: Optional[threading.Event] = None,
+                 log: Optional[Callable[[str], None]] = None, dry_run: bool = False):
+        self.api_client = api_client
+        self.ws_id = ws_id
+        self.cloud_tree = cloud_tree
+        self.remote_name = remote_name
+        self.workers = max(1, workers)
+        self.stop_event = stop_event
+        self.log = log
+        self.dry_run = dry_run
+        self.cache = ParentListingCache(api_client, ws_id)
+        self.failed: List[str] = []
+        self._lock = threading.Lock()
+
+    def _parent_id(self, rel: str) -> Optional[str]:
+        parent = rel.rpartition("/")[0]
+        if not parent: return self.ws_id
+        entry = self.cloud_tree["folders"].get(parent)
+        return entry.get("id") if entry else None
+
+    def _store(self, rel: str, parent_id: str, entry: Dict[str, Any]) -> None:
+        self.cache.add(parent_id, entry)
+        with self._lock: self.cloud_tree["folders"][rel] = entry
+
+    def _simulate(self, rel: str, parent_id: str) -> Dict[str, Any]:
+        entry = {"id": f"SIMU_ID_{rel}", "name": self.remote_name(rel)}
+        self._store(rel, parent_id, entry)
+        if self.log: self.log(rel)
+        return entry
+
+    def create(self, rel: str) -> Optional[Dict[str, Any]]:
+        """Crée un dossier dont le parent existe déjà ; un conflit est résolu via le listing du parent."""
+        parent_id = self._parent_id(rel)
+        if parent_id is None: return None
+        if self.dry_run: return self._simulate(rel, parent_id)
+        name = self.remote_name(rel)
+        try:
+            resp = self.api_client.create_folder(name=name, parent_id=parent_id if parent_id != self.ws_id else None, workspace_id=self.ws_id)
+            entry = (resp.get("folder") or resp) if isinstance(resp, dict) else None
+            if entry and entry.get("id"):
+                self._store(rel, parent_id, entry)
+                if self.log: self.log(rel)
+                return entry
+        except DrimeClientError:
+            entry = self.cache.find(parent_id, name, refresh=True)
+            if entry:
+                self._store(rel, parent_id, entry)
+                return entry
+        except Exception: pass
+        return None
+
+    def resolve(self, rel: str) -> Optional[Dict[str, Any]]:
+        """Retrouve un dossier déjà créé côté serveur (upload relativePath) dans le listing de son parent, sinon le crée."""
+        parent_id = self._parent_id(rel)
+        if parent_id is None: return None
+        if self.dry_run: return self._simulate(rel, parent_id)
+        entry = self.cache.find(parent_id, self.remote_name(rel))
+        if entry:
+            self._store(rel, parent_id, entry)
+            return entry
+        return self.create(rel)
+
+    def run(self, folders: Iterable[str], resolve: bool = False) -> int:
+        """Traite `folders` (et leurs ancêtres manquants) par profondeur croissante. Retourne le nombre de dossiers obtenus."""
+        wanted = {f for f in folders if f}
+        wanted |= implicit_folders(wanted)
+        levels: Dict[int, List[str]] = {}
+        for rel in wanted:
+            if rel not in self.cloud_tree["folders"]: levels.setdefault(rel.count("/"), []).append(rel)
+        if not levels: return 0
+        action = self.resolve if resolve else self.create
+        done = 0
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="FolderCreate") as executor:
+            for depth in sorted(levels):
+                if self.stop_event and self.stop_event.is_set(): break
+                for rel, entry in zip(levels[depth], executor.map(action, levels[depth])):
+                    if entry: done += 1
+                    else: self.failed.append(rel)
+        return done
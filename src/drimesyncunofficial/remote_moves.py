@@ -0,0 +1,213 @@
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+MOVE_BATCH_SIZE = 100
+
+
+def _parent(rel: str) -> str:
+    return rel.rpartition("/")[0]
+
+
+def _rebase(rel: str, old_root: str, new_root: str) -> str:
+    return new_root + rel[len(old_root):]
+
+
+class MovePlan:
+    """
+    Résultat de plan_moves : `dir_moves` [(ancien dossier, nouveau dossier)] déplacés d'un bloc,
+    `file_moves` [(ancien chemin, nouveau chemin)] pour les fichiers hors de ces dossiers,
+    `covered` {ancien: nouveau} pour les fichiers transportés par un déplacement de dossier.
+    """
+    def __init__(self):
+        self.dir_moves: List[Tuple[str, str]] = []
+        self.file_moves: List[Tuple[str, str]] = []
+        self.covered: Dict[str, str] = {}
+
+    def __bool__(self) -> bool:
+        return bool(self.dir_moves or self.file_moves)
+
+
+def pair_moved_files(paths_to_add: Iterable[str], paths_to_delete: Set[str], local_files: Any, cloud_files: Any,
+                     cloud_hashes: Any, moved_from: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    """
+    Associe chaque nouveau chemin local à un chemin distant disparu de même hash partiel et même taille
+    ({nouveau: ancien}), quel que soit le dossier. L'indice d'inode du scan précédent (`moved_from`,
+    {nouveau: ancien}) départage les copies identiques ; à défaut on préfère le même nom puis le même parent.
+    Les fichiers vides (tous de même hash) ne sont pas appariés.
+    """
+    moved_from = moved_from or {}
+    pairs: Dict[str, str] = {}
+    taken: Set[str] = set()
+    ordered = sorted(paths_to_add, key=lambda p: (p not in moved_from, p))
+    for new in ordered:
+        info = local_files[new]
+        h = info.get("partial_hash")
+        if not info.get("size") or not h or h not in cloud_hashes: continue
+        candidates = [o for o in cloud_hashes[h]
+                      if o in paths_to_delete and o not in taken and cloud_files[o].get("size") == info["size"]]
+        if not candidates: continue
+        old = moved_from.get(new)
+        if old is None or old not in candidates:
+            name, parent = new.rpartition("/")[2], _parent(new)
+            old = min(candidates, key=lambda o: (o.rpartition("/")[2] != name, _parent(o) != parent, o))
+        pairs[new] = old
+        taken.add(old)
+    return pairs
+
+
+def plan_moves(pairs: Dict[str, str], cloud_tree: Dict[str, Any], local_folders: Set[str]) -> MovePlan:
+    """
+    Regroupe les fichiers appariés en déplacements de dossiers entiers quand c'est possible :
+    un dossier distant D (disparu localement) devient D' (nouveau localement) si tous les fichiers sous D
+    ont été retrouvés sous D' avec le même chemin relatif et si tous ses sous-dossiers existent sous D'.
+    Le plus haut dossier éligible l'emporte ; le reste donne des déplacements de fichiers.
+    """
+    plan = MovePlan()
+    cloud_folders = cloud_tree["folders"]
+    votes: Counter = Counter()
+    for new, old in pairs.items():
+        o, n = old.split("/"), new.split("/")
+        if o[-1] != n[-1]: continue
+        i = 1
+        while i < len(o) and i < len(n):
+            d_old, d_new = "/".join(o[:-i]), "/".join(n[:-i])
+            if d_old == d_new: break
+            votes[(d_old, d_new)] += 1
+            if o[-i - 1] != n[-i - 1]: break
+            i += 1
+    candidates = {(d, dn): c for (d, dn), c in votes.items()
+                  if d in cloud_folders and d not in local_folders and dn in local_folders and dn not in cloud_folders}
+    if candidates:
+        by_old: Dict[str, List[str]] = {}
+        for d, dn in candidates: by_old.setdefault(d, []).append(dn)
+        under: Counter = Counter()
+        for rel in cloud_tree["files"]:
+            parent = _parent(rel)
+            while parent:
+                if parent in by_old: under[parent] += 1
+                parent = _parent(parent)
+        invalid: Set[Tuple[str, str]] = set()
+        for rel in cloud_folders:
+            parent = _parent(rel)
+            while parent:
+                for dn in by_old.get(parent, ()):
+                    if _rebase(rel, parent, dn) not in local_folders: invalid.add((parent, dn))
+                parent = _parent(parent)
+        taken_old: List[str] = []
+        taken_new: List[str] = []
+        for (d, dn), count in sorted(candidates.items(), key=lambda kv: (kv[0][0].count("/"), kv[0])):
+            if (d, dn) in invalid or count != under[d]: continue
+            if any(d == t or d.startswith(t + "/") for t in taken_old): continue
+            if any(dn == t or dn.startswith(t + "/") for t in taken_new): continue
+            plan.dir_moves.append((d, dn))
+            taken_old.append(d); taken_new.append(dn)
+    roots = {d + "/": dn for d, dn in plan.dir_moves}
+    for new, old in sorted(pairs.items(), key=lambda kv: kv[1]):
+        root = next((r for r in roots if old.startswith(r)), None)
+        if root is not None and new == roots[root] + "/" + old[len(root):]: plan.covered[old] = new
+        else: plan.file_moves.append((old, new))
+    return plan
+
+
+class RemoteMover:
+    """
+    Exécute un MovePlan côté serveur : déplacement (re-parent) et renommage des entrées existantes,
+    sans ré-upload. `remote_name(rel, is_folder)` donne le nom distant (nom chiffré en E2EE, le contenu
+    n'est pas touché). `creator` (RemoteFolderCreator) fournit les dossiers de destination manquants.
+    Les entrées de `cloud_tree` sont ré-indexées sous leur nouveau chemin.
+    """
+    def __init__(self, api_client: Any, ws_id: str, cloud_tree: Dict[str, Any], local_files: Any,
+                 remote_name: Callable[[str, bool], str], creator: Any = None, dry_run: bool = False):
+        self.api_client = api_client
+        self.ws_id = ws_id
+        self.cloud_tree = cloud_tree
+        self.local_files = local_files
+        self.remote_name = remote_name
+        self.creator = creator
+        self.dry_run = dry_run
+        self.moved_dirs: List[Tuple[str, str]] = []
+        self.moved_files: List[Tuple[str, str]] = []
+        self.failed: List[Tuple[str, str]] = []
+
+    def _folder_id(self, rel: str) -> Optional[str]:
+        if not rel: return self.ws_id
+        entry = self.cloud_tree["folders"].get(rel)
+        return entry.get("id") if entry else None
+
+    def _dest(self, folder_id: str) -> Optional[str]:
+        return None if folder_id == self.ws_id else folder_id
+
+    def _rename(self, entry_id: Any, name: str) -> bool:
+        if self.dry_run: return True
+        try:
+            self.api_client.rename_entry(entry_id, name)
+            return True
+        except Exception: return False
+
+    def _move(self, entry_ids: List[Any], dest_id: str) -> bool:
+        if self.dry_run: return True
+        try:
+            for i in range(0, len(entry_ids), MOVE_BATCH_SIZE):
+                self.api_client.move_entries(entry_ids[i:i + MOVE_BATCH_SIZE], self._dest(dest_id))
+            return True
+        except Exception: return False
+
+    def _ensure_folders(self, folders: Iterable[str]) -> None:
+        missing = {f for f in folders if f and f not in self.cloud_tree["folders"]}
+        if not missing: return
+        if self.dry_run:
+            for f in sorted(missing, key=lambda x: x.count("/")):
+                self.cloud_tree["folders"][f] = {"id": f"SIMU_ID_{f}", "name": self.remote_name(f, True)}
+        elif self.creator: self.creator.run(missing, resolve=True)
+
+    def _rekey_file(self, old: str, new: str) -> None:
+        info = self.cloud_tree["files"].pop(old)
+        local = self.local_files[new]
+        info["mtime"] = local["mtime"]
+        info["partial_hash"] = local["partial_hash"]
+        self.cloud_tree["files"][new] = info
+
+    def _move_dir(self, d: str, dn: str, covered: Dict[str, str]) -> bool:
+        entry = self.cloud_tree["folders"][d]
+        self._ensure_folders([_parent(dn)])
+        dest_id = self._folder_id(_parent(dn))
+        if dest_id is None: return False
+        name = self.remote_name(dn, True)
+        renamed = self.remote_name(d, True) != name
+        if renamed and not self._rename(entry["id"], name): return False
+        if _parent(d) != _parent(dn) and not self._move([entry["id"]], dest_id):
+            # Renommé mais resté sous l'ancien parent : on rétablit l'ancien nom pour que l'arbre distant
+            # corresponde encore à cloud_tree avant le repli sur des déplacements de fichiers
+            if renamed: self._rename(entry["id"], self.remote_name(d, True))
+            return False
+        folders = self.cloud_tree["folders"]
+        for rel in [f for f in folders if f == d or f.startswith(d + "/")]:
+            folders[_rebase(rel, d, dn)] = folders.pop(rel)
+        folders[dn] = {**folders[dn], "name": name}
+        for old, new in covered.items(): self._rekey_file(old, new)
+        return True
+
+    def apply(self, plan: MovePlan) -> None:
+        """Applique le plan ; les déplacements impossibles sont listés dans `failed` (à ré-uploader / supprimer)."""
+        file_moves = list(plan.file_moves)
+        for d, dn in sorted(plan.dir_moves, key=lambda m: m[1].count("/")):
+            covered = {o: n for o, n in plan.covered.items() if o.startswith(d + "/")}
+            if self._move_dir(d, dn, covered): self.moved_dirs.append((d, dn))
+            # Échec (ex. dossier cible déjà créé par un upload) : on retombe sur des déplacements de fichiers
+            else: file_moves.extend(covered.items())
+        self._ensure_folders({_parent(new) for old, new in file_moves if _parent(old) != _parent(new)})
+        by_dest: Dict[str, List[Tuple[str, str]]] = {}
+        for old, new in file_moves:
+            name = self.remote_name(new, False)
+            entry_id = self.cloud_tree["files"][old]["id"]
+            if self.remote_name(old, False) != name and not self._rename(entry_id, name):
+                self.failed.append((old, new)); continue
+            if _parent(old) == _parent(new):
+                self._rekey_file(old, new); self.moved_files.append((old, new)); continue
+            by_dest.setdefault(_parent(new), []).append((old, new))
+        for parent, moves in by_dest.items():
+            dest_id = self._folder_id(parent)
+            if dest_id is None or not self._move([self.cloud_tree["files"][o]["id"] for o, _ in moves], dest_id):
+                self.failed.extend(moves); continue
+            for old, new in moves:
+                self._rekey_file(old, new); self.moved_files.append((old, new))
@@ -0,0 +1,119 @@
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Optional, Iterable, Dict
+
+from drimesyncunofficial.constants import SCAN_INDEX_FILE_NAME
+
+COMMIT_EVERY = 1000
+
+
+class ScanIndex:
+    """
+    Index persistant du scan local (SQLite, dans le dossier d'état du workspace).
+    Associe chaque chemin local absolu à son empreinte `stat` (taille, mtime_ns, inode, device)
+    et au hash partiel calculé lors d'un scan précédent (ainsi qu'au hash complet du contenu, s'il a été
+    calculé : colonne `full_hash`, remise à NULL dès que l'empreinte change).
+
+    Un fichier dont l'empreinte `stat` est identique réutilise son hash sans être ouvert :
+    un second scan ne coûte plus que des appels `stat`. Les entrées des fichiers disparus
+    sont purgées en fin de scan (prune) ; un inode disparu qui réapparaît sous un autre chemin
+    est signalé dans `moved` ({nouveau chemin: ancien chemin}), indice de déplacement pour la synchro.
+
+    Si la base ne peut pas être ouverte (dossier absent, disque en lecture seule...), l'index
+    est inactif : lookup retourne toujours None et les écritures sont ignorées.
+    """
+    def __init__(self, state_dir: str):
+        self.path = Path(state_dir) / SCAN_INDEX_FILE_NAME
+        self.conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.hits = 0
+        self.misses = 0
+        self.moved: Dict[str, str] = {}
+        try:
+            self.conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS files ("
+                "path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, ino INTEGER, dev INTEGER, partial_hash TEXT, full_hash TEXT)"
+            )
+            columns = [r[1] for r in self.conn.execute("PRAGMA table_info(files)")]
+            if "full_hash" not in columns: self.conn.execute("ALTER TABLE files ADD COLUMN full_hash TEXT")
+            self.conn.commit()
+        except sqlite3.Error:
+            self.conn = None
+
+    @staticmethod
+    def _signature(st: os.stat_result) -> tuple:
+        return (st.st_size, st.st_mtime_ns, st.st_ino, st.st_dev)
+
+    def lookup(self, path: str, st: os.stat_result) -> Optional[str]:
+        """Retourne le hash partiel mémorisé si l'empreinte `stat` est inchangée, sinon None."""
+        if self.conn is None: return None
+        with self._lock:
+            row = self.conn.execute("SELECT size, mtime_ns, ino, dev, partial_hash FROM files WHERE path = ?", (path,)).fetchone()
+        if row and tuple(row[:4]) == self._signature(st):
+            self.hits += 1
+            return row[4]
+        self.misses += 1
+        return None
+
+    def update(self, path: str, st: os.stat_result, partial_hash: str) -> None:
+        """Mémorise le hash d'un fichier (commit groupé toutes les COMMIT_EVERY écritures)."""
+        if self.conn is None: return
+        with self._lock:
+            self.conn.execute("INSERT OR REPLACE INTO files (path, size, mtime_ns, ino, dev, partial_hash) VALUES (?, ?, ?, ?, ?, ?)", (path, *self._signature(st), partial_hash))
+            self._pending += 1
+            if self._pending >= COMMIT_EVERY: self._commit()
+
+    def lookup_full(self, path: str, st: os.stat_result) -> Optional[str]:
+        """Hash complet mémorisé si l'empreinte `stat` est inchangée, sinon None."""
+        if self.conn is None: return None
+        with self._lock:
+            row = self.conn.execute("SELECT size, mtime_ns, ino, dev, full_hash FROM files WHERE path = ?", (path,)).fetchone()
+        return row[4] if row and tuple(row[:4]) == self._signature(st) else None
+
+    def update_full(self, path: str, st: os.stat_result, full_hash: str) -> None:
+        """Mémorise le hash complet d'un fichier dont l'empreinte `stat` correspond à l'entrée existante."""
+        if self.conn is None: return
+        with self._lock:
+            self.conn.execute("UPDATE files SET full_hash = ? WHERE path = ? AND size = ? AND mtime_ns = ? AND ino = ? AND dev = ?", (full_hash, path, *self._signature(st)))
+            self._pending += 1
+            if self._pending >= COMMIT_EVERY: self._commit()
+
+    def _commit(self) -> None:
+        try: self.conn.commit()
+        except sqlite3.Error: pass
+        self._pending = 0
+
+    def prune(self, root_folder: str, seen_paths: Iterable[str]) -> int:
+        """
+        Supprime les entrées situées sous `root_folder` qui n'ont pas été vues pendant le scan
+        (fichiers supprimés, déplacés ou désormais exclus). Retourne le nombre d'entrées purgées.
+        Les chemins vus dont l'inode appartenait à une entrée purgée sont reportés dans `moved`.
+        """
+        if self.conn is None: return 0
+        seen = set(seen_paths)
+        prefix = os.path.join(str(root_folder), "")
+        with self._lock:
+            # Plage [prefix, prefix + U+FFFF) : tous les chemins commençant par prefix, via l'index de clé primaire
+            rows = self.conn.execute("SELECT path, ino, dev FROM files WHERE path >= ? AND path < ?", (prefix, prefix + "￿")).fetchall()
+            stale = [(r[0],) for r in rows if r[0] not in seen]
+            if stale: self.conn.executemany("DELETE FROM files WHERE path = ?", stale)
+            self._commit()
+        # Inode 0 : non renseigné (DirEntry.stat sous Windows), inutilisable comme indice
+        vanished = {(r[2], r[1]): r[0] for r in rows if r[0] not in seen and r[1]}
+        if vanished:
+            self.moved = {r[0]: vanished[(r[2], r[1])] for r in rows if r[0] in seen and (r[2], r[1]) in vanished}
+        return len(stale)
+
+    def close(self) -> None:
+        if self.conn is None: return
+        with self._lock:
+            self._commit()
+            try: self.conn.close()
+            except sqlite3.Error: pass
+            self.conn = None
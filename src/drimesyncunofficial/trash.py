@@ -7,6 +7,7 @@ from drimesyncunofficial.utils import format_size, format_display_date, truncate
 from drimesyncunofficial.ui_utils import create_back_button
 from typing import Any, Optional, List, Dict
 from drimesyncunofficial.i18n import tr
+from drimesyncunofficial.api_client import ENTRY_CACHE, iter_files
 class TrashManager:
     """
     Gestionnaire de la Corbeille.
@@ -92,16 +93,19 @@ class TrashManager:
         try:
             self.status.text = "Chargement en cours..."
             def do(): 
-                try: return self.app.api_client.list_files({"workspaceId": target_ws_id, "deletedOnly": 1})
+                try:
+                    entries = list(iter_files(self.app.api_client, {"workspaceId": target_ws_id, "deletedOnly": 1}))
+                    ENTRY_CACHE.remember(entries)
+                    return entries
                 except Exception: return None
             data = await loop.run_in_executor(None, do)
-            if not data or isinstance(data, dict) and data.get('status_code', 0) >= 400 or "data" not in data: 
+            if not data: 
                 self.status.text = "Aucune donnée."
                 self.trash_files_cache = []
                 if self.app.is_mobile: self.list.data = []
                 else: self.table.data = []
                 return
-            files = data.get("data", [])
+            files = data
             self.trash_files_cache = files
             if self.app.is_mobile:
                 list_data = []
@@ -229,6 +233,7 @@ class TrashManager:
         """Fonction utilitaire pour supprimer des fichiers par lots."""
         loop = asyncio.get_running_loop()
         self.status.text = f"Suppression en cours ({len(ids)} éléments)..."
+        if delete_forever: ENTRY_CACHE.invalidate(ids)
         for i in range(0, len(ids), 50):
             batch = ids[i:i+50]
             def do(): 
@@ -2,7 +2,8 @@ import toga
 from toga.style import Pack
 from toga.style.pack import COLUMN, ROW, CENTER, LEFT, RIGHT, BOLD
 from drimesyncunofficial.constants import (
-    COL_VERT, COL_BLEU, COL_BLEU2, COL_JAUNE, COL_ROUGE, COL_VIOLET, COL_GRIS, COL_TEXT_GRIS, COL_BACKGROUND
+    COL_VERT, COL_BLEU, COL_BLEU2, COL_JAUNE, COL_ROUGE, COL_VIOLET, COL_GRIS, COL_TEXT_GRIS, COL_BACKGROUND,
+    CHANGE_DETECTION_STAT, CHANGE_DETECTION_PARTIAL, CHANGE_DETECTION_FULL
 )
 
 from drimesyncunofficial.i18n import tr
@@ -69,6 +70,23 @@ def create_button(text, on_press, style=None, enabled=True):
     btn.enabled = enabled
     return btn
 
+def change_detection_labels():
+    """Libellés des politiques de détection des changements (voir change_detection.ChangeDetector)."""
+    return {
+        CHANGE_DETECTION_STAT: tr("cd_mode_stat", "Rapide (date de modification)"),
+        CHANGE_DETECTION_PARTIAL: tr("cd_mode_partial", "Standard (hash partiel)"),
+        CHANGE_DETECTION_FULL: tr("cd_mode_full", "Complète (hash intégral)"),
+    }
+def create_change_detection_selection(policy, **style_kwargs):
+    """Crée le sélecteur de politique de détection des changements, positionné sur `policy`."""
+    labels = change_detection_labels()
+    selection = toga.Selection(items=list(labels.values()), style=Pack(**style_kwargs))
+    selection.value = labels.get(policy, labels[CHANGE_DETECTION_PARTIAL])
+    return selection
+def selected_change_detection(selection):
+    """Politique correspondant à la valeur affichée du sélecteur (None si inconnue)."""
+    return next((mode for mode, label in change_detection_labels().items() if label == selection.value), None)
+
 def update_logs_threadsafe(manager, message, color=None):
     """
     Met à jour les logs de l'interface utilisateur depuis n'importe quel thread.
@@ -0,0 +1,65 @@
+import threading
+from typing import Optional, Callable, Dict, Any, Set
+
+from drimesyncunofficial.compact_tree import HashIndex
+from drimesyncunofficial.upload_scheduler import SizeAwareUploadQueue
+
+FEED_POLL_INTERVAL = 0.2
+
+
+class MirrorUploadFeed:
+    """
+    Synchro miroir en flux : chaque fichier scanné est comparé tout de suite à l'arbre distant
+    connu et, s'il est nouveau ou modifié, part immédiatement dans la file d'upload
+    (les workers tournent déjà pendant le scan au lieu d'attendre sa fin).
+
+    Seules les décisions sûres sont prises au fil de l'eau. Un fichier absent du cloud mais dont
+    le hash partiel y existe déjà peut être un renommage/déplacement : il est laissé au diff
+    final, comme toutes les suppressions, qui s'exécute une fois l'ensemble local connu.
+    Les dossiers ne sont pas créés ici : l'upload avec `relativePath` crée ceux qui contiennent des fichiers.
+
+    `feeding` reste levé tant que le scan peut encore produire des fichiers : les workers
+    (upload_worker(..., feeding)) attendent au lieu de s'arrêter sur une file vide, et une
+    SizeAwareUploadQueue garde ses gros fichiers sous leur quota de workers.
+    """
+    def __init__(self, cloud_tree: Dict[str, Any], upload_queue: Any,
+                 on_queued: Optional[Callable[[Dict[str, Any]], None]] = None):
+        self.cloud_tree = cloud_tree
+        self.queue = upload_queue
+        self.on_queued = on_queued
+        self.cloud_hashes = HashIndex(cloud_tree["files"])
+        self.streamed: Set[str] = set()
+        self.feeding = threading.Event()
+        self.feeding.set()
+        if isinstance(upload_queue, SizeAwareUploadQueue): upload_queue.feeding = self.feeding
+
+    def on_entry(self, kind: str, rel: str, info: Optional[Dict[str, Any]] = None) -> None:
+        if kind != "file": return
+        cloud = self.cloud_tree["files"].get(rel)
+        if cloud is None:
+            if info["partial_hash"] in self.cloud_hashes: return
+        elif cloud.get("size") == info["size"] and cloud.get("partial_hash") == info["partial_hash"]: return
+        self.streamed.add(rel)
+        if self.on_queued: self.on_queued(info)
+        self.queue.put((rel, info))
+
+    def close(self) -> None:
+        """Plus aucun fichier ne sera ajouté : les workers s'arrêtent une fois la file vide."""
+        self.feeding.clear()
+
+
+def next_upload_item(q: Any, feeding: Optional[threading.Event]) -> Any:
+    """
+    Prochain élément de la file d'upload, ou None quand elle est épuisée.
+    Sans `feeding` (ou une fois le flux fermé), une file vide signifie la fin du travail ;
+    l'élément est relu après la fermeture pour ne rien perdre d'un dernier ajout.
+    """
+    while True:
+        try: return q.get_nowait()
+        except Exception:
+            if feeding is None: return None
+            if not feeding.is_set():
+                try: return q.get_nowait()
+                except Exception: return None
+            try: return q.get(timeout=FEED_POLL_INTERVAL)
+            except Exception: continue
@@ -0,0 +1,113 @@
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+from queue import Empty
+from typing import Any, Dict, Optional, Tuple
+
+from drimesyncunofficial.constants import LARGE_UPLOAD_THRESHOLD
+
+LANE_SMALL = "small"
+LANE_LARGE = "large"
+
+
+def large_lane_slots(workers: int) -> int:
+    """Part des workers réservée aux gros fichiers : un tiers, au moins un."""
+    return max(1, workers // 3)
+
+
+class SizeAwareUploadQueue:
+    """
+    File d'upload à deux voies, interchangeable avec `queue.Queue` pour les workers
+    (put / get / get_nowait / task_done) et partagée par les synchros miroir et l'upload manuel.
+
+      - voie "petits fichiers" (< LARGE_UPLOAD_THRESHOLD, upload simple) : FIFO ;
+      - voie "gros fichiers" (multipart) : le plus gros d'abord (LPT), pour qu'un fichier
+        énorme ne démarre pas en dernier et n'occupe pas seul un worker pendant que les autres attendent.
+
+    Chaque voie a sa concurrence : `large_slots` workers au plus pour les gros fichiers, le reste
+    pour les petits. La voie des petits fichiers peut emprunter tous les workers (transferts courts).
+    Tant que `feeding` est levé (scan en cours, voir MirrorUploadFeed), la voie des gros fichiers reste
+    sous son quota même si aucun petit fichier n'attend encore : des petits fichiers trouvés plus tard
+    ne doivent pas attendre derrière des uploads multipart de plusieurs Go. Une fois la file complète
+    (pas de `feeding`, ou flux fermé), une voie vide prête ses workers à l'autre et get_nowait ne lève
+    `Empty` que sur une file réellement vide (contrat des workers existants).
+    La voie d'un élément est suivie par thread, de get() jusqu'à task_done().
+    """
+    def __init__(self, workers: int = 1, threshold: int = LARGE_UPLOAD_THRESHOLD, large_slots: Optional[int] = None,
+                 feeding: Optional[threading.Event] = None):
+        self.threshold = threshold
+        self.feeding = feeding
+        self.large_slots = large_slots if large_slots is not None else large_lane_slots(workers)
+        self._small: deque = deque()
+        self._large: list = []
+        self._seq = itertools.count()
+        self._active = {LANE_SMALL: 0, LANE_LARGE: 0}
+        self._taken: Dict[int, str] = {}
+        self._cond = threading.Condition()
+
+    def set_workers(self, workers: int) -> None:
+        """Nouvelle concurrence totale (autotuning) : la part des gros fichiers suit."""
+        with self._cond: self.large_slots = large_lane_slots(workers)
+
+    def lane_of(self, item: Tuple[str, Dict[str, Any]]) -> str:
+        return LANE_LARGE if item[1].get("size", 0) >= self.threshold else LANE_SMALL
+
+    def put(self, item: Tuple[str, Dict[str, Any]]) -> None:
+        with self._cond:
+            if self.lane_of(item) == LANE_LARGE:
+                heapq.heappush(self._large, (-item[1].get("size", 0), next(self._seq), item))
+            else:
+                self._small.append(item)
+            self._cond.notify()
+
+    def _large_ready(self) -> bool:
+        if not self._large: return False
+        if self._active[LANE_LARGE] < self.large_slots: return True
+        # Emprunt des workers des petits fichiers : seulement quand plus aucun petit ne peut arriver
+        return not self._small and not (self.feeding is not None and self.feeding.is_set())
+
+    def _pick(self) -> Any:
+        # Gros fichier si sa voie a une place libre (ou s'il peut emprunter), sinon petit fichier
+        if self._large_ready():
+            lane, item = LANE_LARGE, heapq.heappop(self._large)[2]
+        elif self._small:
+            lane, item = LANE_SMALL, self._small.popleft()
+        else:
+            raise Empty
+        self._release()
+        self._active[lane] += 1
+        self._taken[threading.get_ident()] = lane
+        return item
+
+    def _release(self) -> None:
+        lane = self._taken.pop(threading.get_ident(), None)
+        if lane: self._active[lane] -= 1
+
+    def get(self, block: bool = True, timeout: Optional[float] = None) -> Any:
+        with self._cond:
+            deadline = None if timeout is None else time.monotonic() + timeout
+            # Attend un élément servable : file vide, ou gros fichiers seuls et voie pleine pendant le scan
+            while block and not self._small and not self._large_ready():
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0: break
+                self._cond.wait(remaining)
+            return self._pick()
+
+    def get_nowait(self) -> Any:
+        return self.get(block=False)
+
+    def task_done(self) -> None:
+        with self._cond:
+            self._release()
+            self._cond.notify_all()
+
+    def qsize(self) -> int:
+        with self._cond: return len(self._small) + len(self._large)
+
+    def empty(self) -> bool:
+        return self.qsize() == 0
+
+    def active(self, lane: str) -> int:
+        with self._cond: return self._active[lane]
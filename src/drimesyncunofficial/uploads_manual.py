@@ -17,8 +17,8 @@ from toga.style.pack import COLUMN, ROW, BOLD
 from drimesyncunofficial.constants import (
     COL_GRIS, COL_TEXT_GRIS, COL_VERT, COL_BLEU, COL_ROUGE, COL_JAUNE, COL_VIOLET, COL_BLEU2, 
     API_BASE_URL, HTTP_TIMEOUT, PARTIAL_HASH_CHUNK_SIZE,
-    CONF_KEY_API_KEY, CONF_KEY_WORKERS, CHUNK_SIZE, BATCH_SIZE, PART_UPLOAD_RETRIES,
-    ANDROID_DOWNLOAD_PATH
+    CONF_KEY_API_KEY, CONF_KEY_WORKERS, CONF_KEY_PART_WORKERS, CHUNK_SIZE, BATCH_SIZE, PART_UPLOAD_RETRIES,
+    ANDROID_DOWNLOAD_PATH, PART_WORKERS
 )
 from drimesyncunofficial.utils import format_size, sanitize_filename_for_upload, load_exclusion_patterns, truncate_path_smart
 from drimesyncunofficial.ui_utils import create_back_button, create_logs_box
@@ -26,9 +26,13 @@ from drimesyncunofficial.ui_thread_utils import safe_update_label, safe_log, run
 from drimesyncunofficial.browsers import AndroidFileBrowser
 from drimesyncunofficial.mixins import LoggerMixin
 from drimesyncunofficial.i18n import tr
+from drimesyncunofficial.api_client import RETRY_POLICY
 MULTIPART_THRESHOLD = 30 * 1024 * 1024 
 simple_upload_limiter: Optional[threading.Semaphore] = None
 from drimesyncunofficial.base_transfer_manager import BaseTransferManager
+from drimesyncunofficial.local_scanner import LocalScanner
+from drimesyncunofficial.upload_scheduler import SizeAwareUploadQueue
+from drimesyncunofficial.concurrency_tuner import AimdController, TUNING_UPLOAD
 
 class ManualUploadManager(BaseTransferManager):
     """
@@ -49,6 +53,7 @@ class ManualUploadManager(BaseTransferManager):
         self.total_size: int = 0
         self.total_transferred: int = 0
         self.progress_lock: threading.Lock = threading.Lock()
+        self.upload_tuner: Optional[AimdController] = None
         
         self.btn_send: Optional[toga.Button] = None
         self.btn_simu: Optional[toga.Button] = None
@@ -241,11 +246,16 @@ class ManualUploadManager(BaseTransferManager):
             self.total_size = sum(f['size'] for f in local_files.values())
             self.total_transferred = 0
             self.log_ui(f"{tr('log_stats_files', 'Fichiers')}: {total_files} | {tr('log_stats_size', 'Taille')}: {format_size(self.total_size)}")
-            upload_queue = Queue()
+            nb_workers = int(self.app.config_data.get(CONF_KEY_WORKERS, 3))
+            if not is_dry_run:
+                self.upload_tuner = self._start_concurrency_tuner(TUNING_UPLOAD, ws_id, nb_workers, lambda: self.total_transferred)
+                nb_workers = self.upload_tuner.maximum
+            upload_queue = SizeAwareUploadQueue(self.upload_tuner.limit if self.upload_tuner else nb_workers)
+            if self.upload_tuner: self.upload_tuner.on_change = upload_queue.set_workers
             result_queue = Queue()
             for rel, info in local_files.items():
                 upload_queue.put((rel, info))
-            nb_workers = int(self.app.config_data.get(CONF_KEY_WORKERS, 3))
+            self.app.api_client.configure_pools(nb_workers, int(self.app.config_data.get(CONF_KEY_PART_WORKERS, PART_WORKERS)))
             global simple_upload_limiter
             simple_upload_limiter = threading.Semaphore(nb_workers)
             workers = []
@@ -295,80 +305,92 @@ class ManualUploadManager(BaseTransferManager):
         except Exception as e:
             self.log_ui(f"{tr('log_error_generic', 'ERREUR')}: {e}", "red")
         finally:
+            self._stop_concurrency_tuner(self.upload_tuner)
+            self.upload_tuner = None
             def _reset(): self._set_ui_running(False)
             self.app.loop.call_soon_threadsafe(_reset)
-    def upload_worker_manual(self, upload_queue: Queue, result_queue: Queue, api_key: str, workspace_id: str, is_dry_run: bool) -> None:
+    def upload_worker_manual(self, upload_queue: SizeAwareUploadQueue, result_queue: Queue, api_key: str, workspace_id: str, is_dry_run: bool) -> None:
         """
         Worker thread générique.
         Récupère les tâches depuis la queue et tente l'upload (avec retries).
         """
         thread_name = threading.current_thread().name
+        tuner = self.upload_tuner
         while True:
-            try: 
-                rel_path, local_info = upload_queue.get_nowait()
-            except: 
-                break
-            if self.stop_event.is_set():
-                upload_queue.task_done()
-                continue
-            while self.is_paused and not self.stop_event.is_set(): 
-                time.sleep(0.5)
-            self.log_ui(f"[DEBUG] [{thread_name}] {tr('log_taking_over', 'Prise en charge')}: {rel_path}")
-            if is_dry_run:
-                result_queue.put((rel_path, "simulated", 0, 0))
-                upload_queue.task_done()
-                continue
-            path_parts = rel_path.split('/')
-            renamed_parts = [sanitize_filename_for_upload(p) for p in path_parts]
-            cloud_rel_path = '/'.join(renamed_parts)
-            if rel_path != cloud_rel_path:
-                msg_bug = tr('log_bug_workaround', "Contournement bug '0' généralisé")
-                self.log_ui(f"[yellow]{msg_bug}: {rel_path} -> {cloud_rel_path}[/yellow]")
+            if tuner and not tuner.acquire(self.stop_event.is_set): break
+            try:
+                try: 
+                    rel_path, local_info = upload_queue.get_nowait()
+                except: 
+                    break
+                if self.stop_event.is_set():
+                    upload_queue.task_done()
+                    continue
+                while self.is_paused and not self.stop_event.is_set(): 
+                    time.sleep(0.5)
+                self.log_ui(f"[DEBUG] [{thread_name}] {tr('log_taking_over', 'Prise en charge')}: {rel_path}")
+                if is_dry_run:
+                    result_queue.put((rel_path, "simulated", 0, 0))
+                    upload_queue.task_done()
+                    continue
+                path_parts = rel_path.split('/')
+                renamed_parts = [sanitize_filename_for_upload(p) for p in path_parts]
+                cloud_rel_path = '/'.join(renamed_parts)
+                if rel_path != cloud_rel_path:
+                    msg_bug = tr('log_bug_workaround', "Contournement bug '0' généralisé")
+                    self.log_ui(f"[yellow]{msg_bug}: {rel_path} -> {cloud_rel_path}[/yellow]")
                                                
-            def check_status():
+                def check_status():
                                
-                while self.is_paused and not self.stop_event.is_set():
-                    time.sleep(0.5)
-                return not self.stop_event.is_set()
+                    while self.is_paused and not self.stop_event.is_set():
+                        time.sleep(0.5)
+                    return not self.stop_event.is_set()
 
-            def progress_cb(chunk_size):
-                with self.progress_lock:
-                    self.total_transferred += chunk_size
-                    percent = int((self.total_transferred / self.total_size) * 100) if self.total_size > 0 else 0
-                    self.update_status_ui(f"{tr('status_uploading', 'Upload')} {format_size(self.total_transferred)}/{format_size(self.total_size)} {percent}%", COL_BLEU2)
+                def progress_cb(chunk_size):
+                    with self.progress_lock:
+                        self.total_transferred += chunk_size
+                        percent = int((self.total_transferred / self.total_size) * 100) if self.total_size > 0 else 0
+                        self.update_status_ui(f"{tr('status_uploading', 'Upload')} {format_size(self.total_transferred)}/{format_size(self.total_size)} {percent}%", COL_BLEU2)
 
-            for attempt in range(PART_UPLOAD_RETRIES):
+                ok = False
+                started = time.monotonic()
+                for attempt in range(PART_UPLOAD_RETRIES):
                                                                                                      
                                                       
-                try:
-                    res = self.app.api_client.upload_file(
-                        file_path=local_info["full_path"],
-                        workspace_id=workspace_id,
-                        relative_path=cloud_rel_path,
-                        progress_callback=progress_cb,
-                        check_status_callback=check_status
-                    )
+                    try:
+                        res = self.app.api_client.upload_file(
+                            file_path=local_info["full_path"],
+                            workspace_id=workspace_id,
+                            relative_path=cloud_rel_path,
+                            progress_callback=progress_cb,
+                            check_status_callback=check_status,
+                            part_workers=int(self.app.config_data.get(CONF_KEY_PART_WORKERS, PART_WORKERS))
+                        )
                     
                             
-                    result_queue.put( (rel_path, res, 0, 0) )
-                    break
+                        result_queue.put( (rel_path, res, 0, 0) )
+                        ok = bool(res)
+                        break
                     
-                except Exception as e:
+                    except Exception as e:
                                      
-                    err_msg = str(e)
-                    if "403" in err_msg or "Interdit" in err_msg:
-                        self.log_ui(f"[red]{tr('log_stop_attempts_403', 'Arrêt des tentatives pour')} {rel_path} (403 Forbidden)[/red]")
-                        result_queue.put( (rel_path, {'error': '403_FORBIDDEN'}, 0, 0) )
-                        break
+                        err_msg = str(e)
+                        if "403" in err_msg or "Interdit" in err_msg:
+                            self.log_ui(f"[red]{tr('log_stop_attempts_403', 'Arrêt des tentatives pour')} {rel_path} (403 Forbidden)[/red]")
+                            result_queue.put( (rel_path, {'error': '403_FORBIDDEN'}, 0, 0) )
+                            break
                     
-                    if attempt < (PART_UPLOAD_RETRIES - 1):
-                        self.log_ui(f"[yellow][{thread_name}] {tr('log_retry', 'Re-tentative')} {attempt+1}: {e}[/yellow]")
-                        time.sleep(5)
-                    else:
-                        self.log_ui(f"[red]{tr('log_final_failure', 'Échec final pour')} {rel_path}: {e}[/red]")
-                        result_queue.put( (rel_path, None, 0, 0) )
+                        if attempt < (PART_UPLOAD_RETRIES - 1):
+                            self.log_ui(f"[yellow][{thread_name}] {tr('log_retry', 'Re-tentative')} {attempt+1}: {e}[/yellow]")
+                            RETRY_POLICY.sleep(attempt, should_stop=self.stop_event.is_set)
+                        else:
+                            self.log_ui(f"[red]{tr('log_final_failure', 'Échec final pour')} {rel_path}: {e}[/red]")
+                            result_queue.put( (rel_path, None, 0, 0) )
             
-            upload_queue.task_done()
+                if tuner and not self.stop_event.is_set(): tuner.record(local_info["size"], time.monotonic() - started, ok=ok)
+                upload_queue.task_done()
+            finally:
+                if tuner: tuner.release()
     def generate_report(self, stats: Dict[str, Any], duration: float, final_status: str) -> str:
         if duration < 1: duration = 1
         speed = stats['bytes'] / duration
@@ -416,19 +438,12 @@ class ManualUploadManager(BaseTransferManager):
                         self.log_ui(f"{tr('log_error_read_file', 'Erreur Lecture Fichier')}: {item_path.name} - {e}", "red")
                 elif item_path.is_dir():
                     root_name = item_path.name
-                    try:
-                        for full_path in item_path.rglob('*'):
-                            if full_path.is_file():
-                                try:
-                                    rel_path_suffix = str(full_path.relative_to(item_path)).replace("\\", "/")
-                                    rel_path = f"{root_name}/{rel_path_suffix}"
-                                    stats = full_path.stat()
-                                    ph = self.get_partial_hash(full_path, stats.st_size)
-                                    if ph: local_files[rel_path] = {"full_path": str(full_path), "size": stats.st_size, "mtime": stats.st_mtime, "partial_hash": ph, "root": str(item_path)}
-                                except Exception:
-                                    continue
-                    except OSError as e:
-                        self.log_ui(f"{tr('log_error_read_folder', 'Impossible de lire le dossier complet (Restriction OS)')}: {root_name}", "red")
+                    scanner = LocalScanner(str(item_path), self.get_partial_hash, stop_event=self.stop_event, rel_prefix=f"{root_name}/")
+                    for item in scanner.scan():
+                        if item.kind == "file" and item.partial_hash:
+                            local_files[item.rel] = {"full_path": item.full_path, "size": item.stat.st_size, "mtime": item.stat.st_mtime, "partial_hash": item.partial_hash, "root": str(item_path)}
+                        elif item.kind == "error" and item.full_path == scanner.root:
+                            self.log_ui(f"{tr('log_error_read_folder', 'Impossible de lire le dossier complet (Restriction OS)')}: {root_name}", "red")
             except Exception as main_e:
                 self.log_ui(f"{tr('log_error_global_path', 'Erreur chemin global')}: {main_e}", "red")
         return local_files
@@ -22,9 +22,10 @@ from drimesyncunofficial.constants import (
     API_BASE_URL, HTTP_TIMEOUT, MODE_NO_ENC, MODE_E2EE_STANDARD, MODE_E2EE_ADVANCED, MODE_E2EE_ZK, 
     E2EE_CRYPTO_ALGO, SYNC_STATE_FOLDER_NAME, CLOUD_TREE_FILE_NAME, EXCLUDE_FILE_NAME, 
     PARTIAL_HASH_CHUNK_SIZE, PART_UPLOAD_RETRIES, CHUNK_SIZE, BATCH_SIZE,
-    CONF_KEY_API_KEY, CONF_KEY_WORKERS, CONF_KEY_ENCRYPTION_MODE, CONF_KEY_E2EE_PASSWORD,
-    ANDROID_DOWNLOAD_PATH
+    CONF_KEY_API_KEY, CONF_KEY_WORKERS, CONF_KEY_ENCRYPTION_MODE, CONF_KEY_E2EE_PASSWORD, CONF_KEY_PART_WORKERS,
+    ANDROID_DOWNLOAD_PATH, PART_WORKERS
 )
+from drimesyncunofficial.api_client import MultipartUploader, RETRY_POLICY
 from drimesyncunofficial.utils import format_size, sanitize_filename_for_upload, get_salt_path, derive_key, generate_or_load_salt
 from drimesyncunofficial.ui_utils import create_back_button, create_logs_box
 from drimesyncunofficial.ui_thread_utils import safe_update_label, safe_log, run_in_background
@@ -35,6 +36,7 @@ from drimesyncunofficial.i18n import tr
 MULTIPART_THRESHOLD = 30 * 1024 * 1024
 simple_upload_limiter: Optional[threading.Semaphore] = None
 from drimesyncunofficial.base_transfer_manager import BaseTransferManager
+from drimesyncunofficial.local_scanner import LocalScanner
 
 class ManualUploadE2EEManager(BaseTransferManager):
     """
@@ -271,6 +273,7 @@ class ManualUploadE2EEManager(BaseTransferManager):
             for rel, info in local_files.items():
                 upload_queue.put((rel, info))
             nb_workers = int(self.app.config_data.get(CONF_KEY_WORKERS, 3))
+            self.app.api_client.configure_pools(nb_workers, int(self.app.config_data.get(CONF_KEY_PART_WORKERS, PART_WORKERS)))
             global simple_upload_limiter
             simple_upload_limiter = threading.Semaphore(nb_workers)
             self.last_text = tr("dl_status_preparing", "Préparation...")
@@ -406,7 +409,7 @@ class ManualUploadE2EEManager(BaseTransferManager):
                 if attempt < (PART_UPLOAD_RETRIES - 1):
                     if is_simple: total_simple_retries += 1
                     else: total_multipart_retries += 1
-                    time.sleep(5)
+                    RETRY_POLICY.sleep(attempt, should_stop=self.stop_event.is_set)
             result_queue.put( (rel_path, result, total_simple_retries, total_multipart_retries) )
             upload_queue.task_done()
     def upload_simple_e2ee(self, local_info: Dict[str, Any], remote_path: str, api_key: str, ws_id: str, thread_name: str) -> Optional[Dict[str, Any]]:
@@ -454,7 +457,6 @@ class ManualUploadE2EEManager(BaseTransferManager):
                 encrypted_bytes = E2EE_encrypt_file(local_info["full_path"], self.e2ee_key)
                 tmp_file.write(encrypted_bytes)
             enc_size = Path(tmp_path).stat().st_size
-            num_parts = math.ceil(enc_size / CHUNK_SIZE)
             file_name = Path(remote_path).name
             init_resp = self.app.api_client.upload_multipart_init(file_name, enc_size, remote_path, ws_id)
             if init_resp.status_code not in [200, 201]: 
@@ -462,32 +464,18 @@ class ManualUploadE2EEManager(BaseTransferManager):
                 return None
             upload_id = init_resp.json()['uploadId']
             key = init_resp.json()['key']
-            uploaded_parts = []
+            def progress_cb(chunk_len):
+                with self.progress_lock:
+                    self.total_transferred += chunk_len
+                    percent = int((self.total_transferred / self.total_size) * 100) if self.total_size > 0 else 0
+                    self.update_status_ui(f"Upload {format_size(self.total_transferred)}/{format_size(self.total_size)} {percent}%", COL_BLEU2)
+            uploader = MultipartUploader(
+                self.app.api_client, key, upload_id,
+                part_workers=int(self.app.config_data.get(CONF_KEY_PART_WORKERS, PART_WORKERS)),
+                progress_callback=progress_cb, check_status_callback=self.check_wait_pause
+            )
             with open(tmp_path, "rb") as f:
-                part_number = 1
-                while part_number <= num_parts:
-                    if self.stop_event.is_set(): raise Exception("Cancelled")
-                    if not self.check_wait_pause(): raise Exception("Cancelled")
-                    batch_end = min(part_number + BATCH_SIZE - 1, num_parts)
-                    batch_nums = list(range(part_number, batch_end + 1))
-                    sign_resp = self.app.api_client.upload_multipart_sign_batch(key, upload_id, batch_nums)
-                    if sign_resp.status_code not in [200, 201]:
-                        if tmp_path: Path(tmp_path).unlink(missing_ok=True)
-                        return None
-                    urls_map = {u['partNumber']: u['url'] for u in sign_resp.json()['urls']}
-                    for pn in batch_nums:
-                        chunk = f.read(CHUNK_SIZE)
-                        if not chunk: break
-                        r = self.app.api_client.upload_multipart_put_chunk(urls_map[pn], chunk)
-                        if r.status_code in [200, 201]:
-                            uploaded_parts.append({"PartNumber": pn, "ETag": r.headers.get("ETag", "").strip('"')})
-                            with self.progress_lock:
-                                self.total_transferred += len(chunk)
-                                percent = int((self.total_transferred / self.total_size) * 100) if self.total_size > 0 else 0
-                                self.update_status_ui(f"Upload {format_size(self.total_transferred)}/{format_size(self.total_size)} {percent}%", COL_BLEU2)
-                        else:
-                            pass
-                    part_number += BATCH_SIZE
+                uploaded_parts = uploader.upload(f, enc_size)
             comp_resp = self.app.api_client.upload_multipart_complete(key, upload_id, uploaded_parts)
             if comp_resp.status_code not in [200, 201]:
                 if tmp_path: Path(tmp_path).unlink(missing_ok=True)
@@ -565,26 +553,18 @@ class ManualUploadE2EEManager(BaseTransferManager):
                         self.log_ui(f"Erreur Lecture: {item_path.name} - {e}", "red")
                 elif item_path.is_dir():
                     root_name = item_path.name
-                    try:
-                        for full_path in item_path.rglob('*'):
-                            if full_path.is_file():
-                                try:
-                                    rel_path_suffix = str(full_path.relative_to(item_path)).replace("\\", "/")
-                                    rel_path = f"{root_name}/{rel_path_suffix}"
-                                    stats = full_path.stat()
-                                    ph = self.get_partial_hash(full_path, stats.st_size)
-                                    if ph: 
-                                        local_files[rel_path] = {
-                                            "full_path": str(full_path), 
-                                            "size": stats.st_size, 
-                                            "mtime": stats.st_mtime, 
-                                            "partial_hash": ph, 
-                                            "root": str(item_path)
-                                        }
-                                except Exception:
-                                    continue
-                    except OSError as e:
-                        self.log_ui(f"Impossible de lire le dossier (Restriction OS): {root_name}", "red")
+                    scanner = LocalScanner(str(item_path), self.get_partial_hash, stop_event=self.stop_event, rel_prefix=f"{root_name}/")
+                    for item in scanner.scan():
+                        if item.kind == "file" and item.partial_hash:
+                            local_files[item.rel] = {
+                                "full_path": item.full_path, 
+                                "size": item.stat.st_size, 
+                                "mtime": item.stat.st_mtime, 
+                                "partial_hash": item.partial_hash, 
+                                "root": str(item_path)
+                            }
+                        elif item.kind == "error" and item.full_path == scanner.root:
+                            self.log_ui(f"Impossible de lire le dossier (Restriction OS): {root_name}", "red")
             except Exception as main_e:
                 self.log_ui(f"Erreur chemin global: {main_e}", "red")
         return local_files
\ No newline at end of file
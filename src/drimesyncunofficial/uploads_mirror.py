@@ -9,7 +9,6 @@ import mimetypes
 import hashlib
 import threading
 import re
-import fnmatch
 import tempfile
 from io import BytesIO
 from queue import Queue
@@ -21,12 +20,24 @@ from drimesyncunofficial.constants import (
     COL_GRIS, COL_TEXT_GRIS, COL_VERT, COL_ROUGE, COL_JAUNE, COL_BLEU, COL_VIOLET, COL_BLEU2, 
     API_BASE_URL, HTTP_TIMEOUT, SYNC_STATE_FOLDER_NAME, CLOUD_TREE_FILE_NAME, EXCLUDE_FILE_NAME, 
     PARTIAL_HASH_CHUNK_SIZE,
-    CONF_KEY_API_KEY, CONF_KEY_WORKERS, CONF_KEY_SEMAPHORES, CONF_KEY_USE_EXCLUSIONS,
-    ANDROID_DOWNLOAD_PATH
+    CONF_KEY_API_KEY, CONF_KEY_WORKERS, CONF_KEY_SEMAPHORES, CONF_KEY_USE_EXCLUSIONS, CONF_KEY_PART_WORKERS,
+    ANDROID_DOWNLOAD_PATH, PART_WORKERS
 )
-from drimesyncunofficial.api_client import DrimeClientError
+from drimesyncunofficial.api_client import DrimeClientError, iter_files
+from drimesyncunofficial.multipart_journal import MultipartJournal
+from drimesyncunofficial.scan_index import ScanIndex
+from drimesyncunofficial.cloud_tree_store import CloudTreeStore, write_tree_snapshot
+from drimesyncunofficial.compact_tree import FileTable, HashIndex
+from drimesyncunofficial.exclusions import ExclusionMatcher
+from drimesyncunofficial.local_scanner import LocalScanner
+from drimesyncunofficial.upload_feed import MirrorUploadFeed, next_upload_item
+from drimesyncunofficial.upload_scheduler import SizeAwareUploadQueue
+from drimesyncunofficial.concurrency_tuner import AimdController, TUNING_UPLOAD
+from drimesyncunofficial.remote_folders import RemoteFolderCreator, implicit_folders
+from drimesyncunofficial.remote_moves import RemoteMover, pair_moved_files, plan_moves
+from drimesyncunofficial.change_detection import ChangeDetector, get_change_detection_policy, set_change_detection_policy
 from drimesyncunofficial.utils import format_size, load_exclusion_patterns, truncate_path_smart, sanitize_filename_for_upload
-from drimesyncunofficial.ui_utils import create_back_button, create_logs_box
+from drimesyncunofficial.ui_utils import create_back_button, create_logs_box, change_detection_labels, create_change_detection_selection, selected_change_detection
 from drimesyncunofficial.ui_thread_utils import safe_update_label, safe_log, run_in_background
 from drimesyncunofficial.browsers import AndroidFileBrowser
 from drimesyncunofficial.base_transfer_manager import BaseTransferManager
@@ -34,6 +45,7 @@ from drimesyncunofficial.i18n import tr
 
 SYNC_STATE_FOLDER = SYNC_STATE_FOLDER_NAME
 CLOUD_TREE_FILE = CLOUD_TREE_FILE_NAME
+CLOUD_TREE_CHECKPOINT_INTERVAL = 20
 
 CHUNK_SIZE = 25 * 1024 * 1024
 BATCH_SIZE = 10
@@ -58,11 +70,16 @@ class MirrorUploadManager(BaseTransferManager):
         self.box_secondary_btns: Optional[toga.Box] = None
         self.txt_logs: Optional[toga.MultilineTextInput] = None
         self.selection_mirror_ws: Optional[toga.Selection] = None
+        self.selection_change_detection: Optional[toga.Selection] = None
         self.lbl_mirror_path: Optional[toga.Label] = None
         self.main_box_content = None
 
                                     
         self.simple_upload_limiter: Optional[threading.Semaphore] = None
+        self.upload_tuner: Optional[AimdController] = None
+        self.part_workers: int = PART_WORKERS
+        self.multipart_journal: Optional[MultipartJournal] = None
+        self.cloud_tree_store: Optional[CloudTreeStore] = None
         self.total_size: int = 0
         self.total_transferred: int = 0
         self.progress_lock: threading.Lock = threading.Lock()
@@ -96,6 +113,9 @@ class MirrorUploadManager(BaseTransferManager):
         selected_item_str = next((item for item in items if f"(ID: {current_saved_ws_id})" in item), items[0])
         self.selection_mirror_ws.value = selected_item_str
         box.add(self.selection_mirror_ws)
+        box.add(toga.Label(tr("lbl_change_detection", "Détection des changements :"), style=Pack(font_weight=BOLD, margin_bottom=5)))
+        self.selection_change_detection = create_change_detection_selection(get_change_detection_policy(self.app.config_data, self._get_selected_workspace_id()), width=220, margin_bottom=10)
+        box.add(self.selection_change_detection)
         
                          
                          
@@ -188,6 +208,8 @@ class MirrorUploadManager(BaseTransferManager):
         self.app.loop.call_soon_threadsafe(_update)
 
     def update_warnings(self, widget: Any) -> None:
+        if self.selection_change_detection:
+            self.selection_change_detection.value = change_detection_labels()[get_change_detection_policy(self.app.config_data, self._get_selected_workspace_id())]
         if not self.lbl_warning_ws: return
         sel = self._get_selected_workspace_id()
         e2ee_id = self.app.config_data.get('workspace_e2ee_id', '0')
@@ -236,6 +258,8 @@ class MirrorUploadManager(BaseTransferManager):
 
     def _save_config_file(self) -> None:
         self.app.config_data['workspace_standard_id'] = self._get_selected_workspace_id()
+        if self.selection_change_detection:
+            set_change_detection_policy(self.app.config_data, self._get_selected_workspace_id(), selected_change_detection(self.selection_change_detection))
         config_to_save = self.app.config_data.copy()
         is_desktop = toga.platform.current_platform not in {'android', 'iOS', 'web'}
         if is_desktop:
@@ -336,24 +360,13 @@ class MirrorUploadManager(BaseTransferManager):
         try:
                                                       
             all_ids = []
-            page = 1
-            while True:
-                 params['page'] = page
-                 self.log_ui(f"[DEBUG] Listing page {page}...")
-                 try:
-                                                                    
-                     data = self.app.api_client.list_files(params=params)
-                 except Exception as e:
-                     self.log_ui(f"[red]Erreur listing: {e}[/red]")
-                     return False
-                 
-                 if not data or 'data' not in data: break
-                 items = data['data']
-                 if not items: break
-                 for item in items: all_ids.append(str(item['id']))
-                 
-                 if len(items) < 20: break 
-                 page += 1
+            self.log_ui("[DEBUG] Listing...")
+            try:
+                for item in iter_files(self.app.api_client, params):
+                    all_ids.append(str(item['id']))
+            except Exception as e:
+                self.log_ui(f"[red]Erreur listing: {e}[/red]")
+                return False
             
             if not all_ids: return True
 
@@ -400,55 +413,43 @@ class MirrorUploadManager(BaseTransferManager):
             self.log_ui(f"{tr('debug_error_hash', '[DEBUG] Erreur hash')} {file_path}: {e}", "red")
             return None
 
-    def get_local_tree(self, root_folder: str, app_data_state_dir: str, use_exclusions: bool = True) -> Dict[str, Any]:
+    def get_local_tree(self, root_folder: str, app_data_state_dir: str, use_exclusions: bool = True, on_entry: Optional[Callable[..., None]] = None) -> Dict[str, Any]:
         self.log_ui(f"{tr('scan_local_folder', 'Scan du dossier local :')} {root_folder}")
-        tree = {"folders": set(), "files": {}}
-        exclusions = load_exclusion_patterns(self.app.paths, use_exclusions)
-        root_path_obj = Path(root_folder)
-        for root, dirs, files in os.walk(root_folder):
-            if self.stop_event.is_set(): break
-            
-                                
-            for d in dirs[:]:
-                full_dir = Path(root) / d
-                try:
-                    rel = str(full_dir.relative_to(root_path_obj)).replace("\\", "/")
-                except ValueError: continue
-                if any(fnmatch.fnmatch(rel, p) for p in exclusions): 
-                    dirs.remove(d); continue
-                tree["folders"].add(rel)
-                
-                          
-            for f in files:
-                full = Path(root) / f
-                try:
-                    rel = str(full.relative_to(root_path_obj)).replace("\\", "/")
-                except ValueError: continue
-                if any(fnmatch.fnmatch(rel, p) for p in exclusions): continue
-                try:
-                    st = full.stat()
-                    if st.st_size >= 0:
-                        ph = self.get_partial_hash(full, st.st_size)
-                        if ph: 
-                            tree["files"][rel] = {"full_path": str(full), "size": st.st_size, "mtime": st.st_mtime, "partial_hash": ph}
-                        else:
-                            self.log_ui(f"{tr('debug_hash_failed', '[DEBUG] Hash échoué pour')} {f} -> Ignoré", "yellow")
-                except Exception as e:
-                    self.log_ui(f"{tr('debug_access_error', '[DEBUG] Erreur accès')} {f}: {e}", "red")
+        tree = {"folders": set(), "files": FileTable(str(Path(root_folder)))}
+        exclusions = ExclusionMatcher(load_exclusion_patterns(self.app.paths, use_exclusions))
+        index = ScanIndex(app_data_state_dir)
+        scanner = LocalScanner(root_folder, self.get_partial_hash, exclusions, index, self.stop_event)
+        for item in scanner.scan():
+            if item.kind == "dir":
+                tree["folders"].add(item.rel)
+                if on_entry: on_entry("dir", item.rel)
+            elif item.kind == "file" and item.partial_hash:
+                info = {"full_path": item.full_path, "size": item.stat.st_size, "mtime": item.stat.st_mtime, "partial_hash": item.partial_hash}
+                tree["files"][item.rel] = info
+                if on_entry: on_entry("file", item.rel, info)
+            elif item.kind == "file":
+                self.log_ui(f"{tr('debug_hash_failed', '[DEBUG] Hash échoué pour')} {item.rel} -> Ignoré", "yellow")
+            else:
+                self.log_ui(f"{tr('debug_access_error', '[DEBUG] Erreur accès')} {item.rel}: {item.error}", "red")
+        tree["moved_from"] = scanner.moved_from
+        index.close()
         return tree
 
     def load_local_cloud_tree(self, app_data_state_dir: str, api_key: str, ws_id: str) -> Dict[str, Any]:
         path = os.path.join(app_data_state_dir, CLOUD_TREE_FILE)
+        if self.cloud_tree_store: self.cloud_tree_store.close()
+        self.cloud_tree_store = CloudTreeStore(app_data_state_dir)
+        tree = self.cloud_tree_store.load()
+        if tree is not None: return tree
         if not os.path.exists(path):
             self.log_ui(tr("debug_missing_local_state", "[DEBUG] État local manquant. Recherche Recovery..."))
             found_file = None
-            resp = self.app.api_client.list_files(params={"query": CLOUD_TREE_FILE, "workspaceId": ws_id})
-                                                                                                                                                                     
-            data = resp                   
-            if data and 'data' in data:
-                 for f in data['data']:
-                     if f['name'] == CLOUD_TREE_FILE:
-                         found_file = f; break
+            try:
+                for f in iter_files(self.app.api_client, {"query": CLOUD_TREE_FILE, "workspaceId": ws_id}):
+                    if f.get('name') == CLOUD_TREE_FILE:
+                        found_file = f; break
+            except Exception as e:
+                self.log_ui(f"{tr('error_recovery_failed', '[ERROR] Recovery failed:')} {e}", "red")
             
             if found_file:
                 msg_found = tr('info_state_found', "[INFO] Fichier d'état trouvé. Récupération...")
@@ -470,79 +471,131 @@ class MirrorUploadManager(BaseTransferManager):
             else:
                 self.log_ui(tr("info_no_remote_state", "[INFO] Pas d'état distant. Départ à zéro."), "yellow")
         
+        tree = {"folders": {}, "files": {}}
         if os.path.exists(path):
             try:
-                with open(path, 'rb') as f: return json.load(f)
+                with open(path, 'rb') as f: tree = json.load(f)
             except: pass
-        return {"folders": {}, "files": {}}
+        # Migration : le JSON (local ou récupéré) devient le contenu initial de la base incrémentale
+        return self.cloud_tree_store.adopt(tree)
 
     def save_local_cloud_tree(self, tree: Dict[str, Any], app_data_state_dir: str) -> None:
-        path = Path(app_data_state_dir) / CLOUD_TREE_FILE
-        try:
-            with open(path, 'w', encoding='utf-8') as f: json.dump(tree, f, indent=2)
-        except: pass
+        """Fin de synchro : commit des dernières modifications puis export de l'instantané JSON complet."""
+        if self.cloud_tree_store: self.cloud_tree_store.commit(tree)
+        write_tree_snapshot(tree, Path(app_data_state_dir) / CLOUD_TREE_FILE)
+
+    def checkpoint_cloud_tree(self, tree: Dict[str, Any], app_data_state_dir: str) -> None:
+        """Point de sauvegarde en cours de synchro : seules les entrées modifiées sont écrites."""
+        if not (self.cloud_tree_store and self.cloud_tree_store.commit(tree)):
+            self.save_local_cloud_tree(tree, app_data_state_dir)
 
     def handle_folder_creation(self, rel_folder_path: str, cloud_tree: Dict[str, Any], ws_id: str, is_dry_run: bool) -> None:
-        cloud_path = self._calculate_remote_path(rel_folder_path, is_folder=True)
-        if rel_folder_path in cloud_tree["folders"]: return
-        if "/" in rel_folder_path:
-            parent_rel = rel_folder_path.rsplit('/', 1)[0]
-            if parent_rel not in cloud_tree["folders"]:
-                self.handle_folder_creation(parent_rel, cloud_tree, ws_id, is_dry_run)
-            parent_id = cloud_tree["folders"][parent_rel]["id"]
-        else: parent_id = ws_id
-        
-        if is_dry_run:
-            self.log_ui(f"{tr('simu_create_folder', '[SIMU] Création dossier:')} {rel_folder_path}")
-            cloud_tree["folders"][rel_folder_path] = {"id": f"SIMU_ID_{rel_folder_path}", "name": cloud_path.split("/")[-1]}
-            return
-            
-        folder_name_to_create = cloud_path.split("/")[-1]
-        try:
-             entry = self.app.api_client.create_folder(name=folder_name_to_create, parent_id=parent_id if parent_id != ws_id else None, workspace_id=ws_id)
-             if entry and (entry.get('folder') or entry).get('id'):
-                 cloud_tree["folders"][rel_folder_path] = entry.get('folder') or entry
-        except DrimeClientError:
-                                                 
-             l_resp = self.app.api_client.list_files(params={"folderId": parent_id if parent_id != ws_id else None, "workspaceId": ws_id})
-                                      
-             data = l_resp
-             if data and 'data' in data:
-                 for i in data['data']:
-                     if i['type'] == 'folder' and i['name'] == folder_name_to_create:
-                         cloud_tree["folders"][rel_folder_path] = i
-                         return
-                 self.log_ui(f"{tr('log_folder_created', 'Dossier créé:')} {rel_folder_path}")
+        """Crée (ou simule) un dossier distant et ses parents manquants."""
+        self._folder_creator(cloud_tree, ws_id, is_dry_run).run([rel_folder_path])
 
     def rename_remote_entry(self, entry_id: str, new_name: str, api_key: str) -> Optional[str]:
         try:
-            resp = self.app.api_client.rename_entry(entry_id, new_name)
-            if resp.status_code == 200:
-                data = resp.json()
-                return (data.get('id') or data.get('fileEntry', {}).get('id'))
+            # rename_entry retourne le JSON décodé (une erreur HTTP lève une DrimeError)
+            data = self.app.api_client.rename_entry(entry_id, new_name)
+            entry = (data.get('fileEntry') or data) if isinstance(data, dict) else {}
+            return entry.get('id') or entry_id
         except: pass
         return None
 
-    def upload_worker(self, q: Queue, res_q: Queue, api_key: str, ws_id: str) -> None:
+    def upload_worker(self, q: Queue, res_q: Queue, api_key: str, ws_id: str, feeding: Optional[threading.Event] = None) -> None:
         thread_name = threading.current_thread().name
+        tuner = self.upload_tuner
         while True:
-            try: item = q.get_nowait()
-            except: break
+            if tuner and not tuner.acquire(self.stop_event.is_set): break
+            try:
+                item = next_upload_item(q, feeding)
+                if item is None: break
             
-            if self.stop_event.is_set(): 
-                q.task_done(); continue
-            while self.is_paused: time.sleep(0.5)
+                if self.stop_event.is_set(): 
+                    q.task_done(); continue
+                while self.is_paused: time.sleep(0.5)
             
-            rel_path, info = item
-            remote_path = self._calculate_remote_path(rel_path, is_folder=False)
+                rel_path, info = item
+                remote_path = self._calculate_remote_path(rel_path, is_folder=False)
                                                                                       
-            result = None
-            try:
-                result = self.upload_file_router(info, remote_path, api_key, ws_id, thread_name)
-            except Exception as e:
-                self.log_ui(f"[{thread_name}] {tr('crash_worker', 'CRASH Worker:')} {e}", "red")
-            res_q.put((rel_path, result))
-            q.task_done()
+                result = None
+                started = time.monotonic()
+                try:
+                    result = self.upload_file_router(info, remote_path, api_key, ws_id, thread_name)
+                except Exception as e:
+                    self.log_ui(f"[{thread_name}] {tr('crash_worker', 'CRASH Worker:')} {e}", "red")
+                if tuner and not self.stop_event.is_set(): tuner.record(info["size"], time.monotonic() - started, ok=bool(result) and "error" not in result)
+                res_q.put((rel_path, result))
+                q.task_done()
+            finally:
+                if tuner: tuner.release()
+
+    def _remote_name(self, rel_path: str, is_folder: bool) -> str:
+        return self._calculate_remote_path(rel_path, is_folder=is_folder).split("/")[-1]
+
+    def _apply_moves(self, paths_to_add: Set[str], paths_to_delete: Set[str], local_tree: Dict[str, Any], cloud_tree: Dict[str, Any], ws_id: str, is_dry_run: bool) -> Tuple[Set[str], Set[str], int, int]:
+        """
+        Renommages et déplacements (même contenu, même taille, n'importe quel dossier) exécutés côté serveur
+        au lieu d'un ré-upload ; un dossier déplacé en entier ne coûte qu'un seul appel.
+        Retourne (nouveaux chemins traités, anciens chemins traités, nb renommés, nb déplacés).
+        """
+        pairs = pair_moved_files(paths_to_add, paths_to_delete, local_tree["files"], cloud_tree["files"], HashIndex(cloud_tree["files"]), local_tree.get("moved_from"))
+        if not pairs: return set(), set(), 0, 0
+        plan = plan_moves(pairs, cloud_tree, local_tree["folders"])
+        creator = RemoteFolderCreator(self.app.api_client, ws_id, cloud_tree, lambda rel: self._remote_name(rel, True), stop_event=self.stop_event)
+        mover = RemoteMover(self.app.api_client, ws_id, cloud_tree, local_tree["files"], self._remote_name, creator, dry_run=is_dry_run)
+        mover.apply(plan)
+        simu = "[SIMU] " if is_dry_run else ""
+        renamed = moved = 0
+        done = list(mover.moved_files)
+        for d, dn in mover.moved_dirs:
+            covered = [(o, n) for o, n in plan.covered.items() if o.startswith(d + "/")]
+            done.extend(covered)
+            moved += len(covered)
+            self.log_ui(f"{simu}{tr('log_folder_moved', 'Dossier déplacé :')} {d} -> {dn} ({len(covered)})", "yellow")
+        for old, new in mover.moved_files:
+            if old.rpartition("/")[0] == new.rpartition("/")[0]:
+                renamed += 1
+                self.log_ui(f"{simu}{tr('log_renamed', 'Renommé:')} {old} -> {new}", "yellow")
+            else:
+                moved += 1
+                self.log_ui(f"{simu}{tr('log_moved', 'Déplacé:')} {old} -> {new}", "yellow")
+        for old, new in mover.failed: self.log_ui(f"{tr('failure_rename', 'Échec renommage')} {new}", "red")
+        return {n for _, n in done}, {o for o, _ in done}, renamed, moved
+
+    def _folder_creator(self, cloud_tree: Dict[str, Any], ws_id: str, is_dry_run: bool = False) -> RemoteFolderCreator:
+        label = tr('simu_create_folder', '[SIMU] Création dossier:') if is_dry_run else tr('log_folder_created', 'Dossier créé:')
+        # Simulation : aucune requête, le client API n'est pas nécessaire
+        return RemoteFolderCreator(
+            None if is_dry_run else self.app.api_client, ws_id, cloud_tree,
+            lambda rel: self._calculate_remote_path(rel, is_folder=True).split("/")[-1],
+            stop_event=self.stop_event, log=lambda rel: self.log_ui(f"{label} {rel}"), dry_run=is_dry_run
+        )
+
+    def _sync_remote_folders(self, folders_to_create: List[str], uploaded_paths: Set[str], cloud_tree: Dict[str, Any], ws_id: str, is_dry_run: bool = False) -> None:
+        """
+        Dossiers distants manquants, par niveaux parallèles. Ceux qui contiennent un fichier uploadé ont déjà été
+        créés par le serveur (relativePath) : leur id est seulement relu dans le listing du parent (mis en cache).
+        Les autres (dossiers vides) sont créés. En simulation, ils sont seulement journalisés.
+        """
+        if not folders_to_create: return
+        creator = self._folder_creator(cloud_tree, ws_id, is_dry_run)
+        implicit = implicit_folders(uploaded_paths)
+        creator.run([f for f in folders_to_create if f in implicit], resolve=True)
+        creator.run([f for f in folders_to_create if f not in implicit])
+        if creator.failed: self.log_ui(f"{tr('log_folders_not_created', 'Dossiers non créés :')} {len(creator.failed)}", "red")
+
+    def _add_total_size(self, info: Dict[str, Any]) -> None:
+        with self.progress_lock: self.total_size += info["size"]
+
+    def _start_upload_workers(self, nb_workers: int, q: Queue, res_q: Queue, api_key: str, ws_id: str, feeding: Optional[threading.Event]) -> List[threading.Thread]:
+        """Démarre les workers d'upload ; avec `feeding`, ils attendent les fichiers produits pendant le scan."""
+        workers = []
+        for i in range(nb_workers):
+            t = threading.Thread(target=self.upload_worker, args=(q, res_q, api_key, ws_id, feeding), daemon=True, name=f"Worker-{i+1}")
+            t.start()
+            workers.append(t)
+        return workers
 
     def parse_api_response_for_id(self, response: Any) -> Optional[Dict[str, Any]]:
         if not response: return None
@@ -567,15 +620,16 @@ class MirrorUploadManager(BaseTransferManager):
     def upload_simple(self, local_info: Dict[str, Any], cloud_relative_path: str, api_key: str, workspace_id: str, thread_name: str) -> Optional[Dict[str, Any]]:
         file_path = local_info["full_path"]
         file_name = Path(cloud_relative_path).name
+        def progress_cb(chunk_len):
+            with self.progress_lock:
+                self.total_transferred += chunk_len
+                percent = int((self.total_transferred / self.total_size) * 100) if self.total_size > 0 else 0
+                self.update_status_ui(f"Upload {format_size(self.total_transferred)}/{format_size(self.total_size)} {percent}%", COL_BLEU2)
         try:
-            resp = self.app.api_client.upload_simple(file_path, workspace_id, cloud_relative_path, custom_file_name=file_name)
+            resp = self.app.api_client.upload_simple(file_path, workspace_id, cloud_relative_path, custom_file_name=file_name, progress_callback=progress_cb)
             if resp.status_code in [200, 201]:
                 fe = self.parse_api_response_for_id(resp.json())
                 if fe and fe.get('id'):
-                    with self.progress_lock:
-                        self.total_transferred += local_info["size"]
-                        percent = int((self.total_transferred / self.total_size) * 100) if self.total_size > 0 else 0
-                        self.update_status_ui(f"Upload {format_size(self.total_transferred)}/{format_size(self.total_size)} {percent}%", COL_BLEU2)
                     return {"id": fe["id"], "size": local_info["size"], "mtime": local_info["mtime"], "partial_hash": local_info["partial_hash"]}
             if resp.status_code == 403:
                 self.log_ui(f"[red]{tr('error_403_forbidden', 'ERREUR 403 (Interdit) pour')} {file_name}. Vérifiez vos droits.[/red]")
@@ -586,86 +640,33 @@ class MirrorUploadManager(BaseTransferManager):
         return None
 
     def upload_multipart(self, local_info: Dict[str, Any], cloud_relative_path: str, api_key: str, workspace_id: str, thread_name: str) -> Optional[Dict[str, Any]]:
-        file_path = local_info["full_path"]
+        """Upload multipart via le client API, repris depuis le MultipartJournal du workspace si possible."""
         file_name = Path(cloud_relative_path).name
         file_size = local_info["size"]
-        num_parts = math.ceil(file_size / CHUNK_SIZE)
-                                                                                                 
+        identity = {"size": file_size, "mtime": local_info["mtime"], "partial_hash": local_info.get("partial_hash")}
+        
+        def check_status():
+            while self.is_paused and not self.stop_event.is_set(): time.sleep(0.5)
+            if self.app.is_mobile: time.sleep(0.005)
+            return not self.stop_event.is_set()
+        
+        def progress_cb(chunk_len):
+            with self.progress_lock:
+                self.total_transferred += chunk_len
+                percent = int((self.total_transferred / self.total_size) * 100) if self.total_size > 0 else 0
+                self.update_status_ui(f"Upload {format_size(self.total_transferred)}/{format_size(self.total_size)} {percent}%", COL_BLEU2)
+        
+        def on_resume(nb_parts):
+            self.log_ui(f"[{thread_name}] {tr('log_multipart_resume', 'Reprise upload')} {file_name} ({nb_parts} parts)", "yellow")
+        
         try:
-            init_resp = self.app.api_client.upload_multipart_init(file_name, file_size, cloud_relative_path, workspace_id)
-            if init_resp.status_code not in [200, 201]:
-                self.log_ui(f"[DEBUG] [{thread_name}] {tr('debug_multipart_init_failed', 'Multipart init failed:')} {init_resp.status_code} {init_resp.text}")
-                return None
-            init_data = init_resp.json()
-            if 'uploadId' not in init_data:
-                self.log_ui(f"[DEBUG] [{thread_name}] {tr('debug_multipart_missing_id', 'Multipart init missing uploadId:')} {init_data}")
-                return None
-            upload_id = init_data['uploadId']
-            key = init_data['key']
-            uploaded_parts = []
-            
-            with open(file_path, "rb") as f:
-                part_number = 1
-                while part_number <= num_parts:
-                    if self.stop_event.is_set(): raise Exception("Cancelled")
-                    while self.is_paused: time.sleep(0.5)
-                    
-                    if self.app.is_mobile: time.sleep(0.005)
-
-                    batch_end = min(part_number + BATCH_SIZE - 1, num_parts)
-                    batch_nums = list(range(part_number, batch_end + 1))
-                    
-                    sign_resp = self.app.api_client.upload_multipart_sign_batch(key, upload_id, batch_nums)
-                    if sign_resp.status_code not in [200, 201]:
-                        return None
-                    sign_data = sign_resp.json()
-                    if 'urls' not in sign_data:
-                        return None
-                    urls_map = {u['partNumber']: u['url'] for u in sign_data['urls']}
-                    
-                    for pn in batch_nums:
-                        if self.app.is_mobile: time.sleep(0.005)
-                        chunk = f.read(CHUNK_SIZE)
-                        if not chunk: break
-                        url = urls_map.get(pn)
-                        if not url: return None
-                        
-                        for attempt in range(PART_UPLOAD_RETRIES):
-                            try:
-                                r = self.app.api_client.upload_multipart_put_chunk(url, chunk)
-                                if r.status_code in [200, 201]:
-                                    uploaded_parts.append({"PartNumber": pn, "ETag": r.headers.get("ETag", "").strip('"')})
-                                    with self.progress_lock:
-                                        self.total_transferred += len(chunk)
-                                        percent = int((self.total_transferred / self.total_size) * 100) if self.total_size > 0 else 0
-                                        self.update_status_ui(f"Upload {format_size(self.total_transferred)}/{format_size(self.total_size)} {percent}%", COL_BLEU2)
-                                    break
-                                else:
-                                    time.sleep(1 * attempt)
-                            except Exception:
-                                time.sleep(1 * attempt)
-                        else:
-                            return None                      
-                    part_number += BATCH_SIZE
-                    
-            comp_resp = self.app.api_client.upload_multipart_complete(key, upload_id, uploaded_parts)
-            if comp_resp.status_code not in [200, 201]:
-                return None
-            
-            ext = Path(file_name).suffix.lstrip('.')
-            mime_type = mimetypes.guess_type(file_name)[0] or "application/octet-stream"
-            
-            entry_data = {
-                "clientMime": mime_type, "clientName": file_name,
-                "filename": key.split("/")[-1], "size": file_size,
-                "clientExtension": ext,
-                "relativePath": cloud_relative_path.replace("\\", "/"), "workspaceId": workspace_id
-            }
-            entry_resp = self.app.api_client.create_entry(entry_data)
-            if entry_resp.status_code in [200, 201]:
-                 fe = self.parse_api_response_for_id(entry_resp.json())
-                 if fe and fe.get('id'):
-                     return {"id": fe["id"], "size": file_size, "mtime": local_info["mtime"], "partial_hash": local_info["partial_hash"]}
+            fe = self.app.api_client.upload_multipart_file(
+                local_info["full_path"], file_size, cloud_relative_path.replace("\\", "/"), workspace_id,
+                progress_callback=progress_cb, check_status_callback=check_status, part_workers=self.part_workers,
+                journal=self.multipart_journal, identity=identity, on_resume=on_resume
+            )
+            if fe and fe.get('id'):
+                return {"id": fe["id"], "size": file_size, "mtime": local_info["mtime"], "partial_hash": local_info["partial_hash"]}
             return None
         except Exception as e:
             self.log_ui(f"[DEBUG] [{thread_name}] {tr('debug_multipart_error', 'Multipart error:')} {e}")
@@ -687,6 +688,7 @@ class MirrorUploadManager(BaseTransferManager):
         )
 
     def _thread_mirror_logic(self, local_folder: str, workspace_id: str, is_dry_run: bool, force_sync: bool) -> None:
+        feed = None
         try:
             start_str = tr("log_start_simu", "--- DÉMARRAGE SIMU ---") if is_dry_run else tr("log_start_std", "--- DÉMARRAGE STANDARD ---")
             self.log_ui(start_str, "green")
@@ -695,35 +697,75 @@ class MirrorUploadManager(BaseTransferManager):
             
             api_key = self.app.config_data.get(CONF_KEY_API_KEY, '')
             nb_workers = int(self.app.config_data.get(CONF_KEY_WORKERS, 5))
+            if not is_dry_run:
+                self.upload_tuner = self._start_concurrency_tuner(TUNING_UPLOAD, workspace_id, nb_workers, lambda: self.total_transferred)
+                nb_workers = self.upload_tuner.maximum
             sem_val = int(self.app.config_data.get(CONF_KEY_SEMAPHORES, 0))
             if sem_val == 0: sem_val = nb_workers
             
             self.simple_upload_limiter = threading.Semaphore(sem_val)
+            self.part_workers = int(self.app.config_data.get(CONF_KEY_PART_WORKERS, PART_WORKERS))
+            self.app.api_client.configure_pools(nb_workers, self.part_workers, sem_val)
             app_data_state_dir = self._get_local_state_dir(workspace_id)
             
             if force_sync and not is_dry_run:
                 if not self.delete_all_cloud_content(api_key, workspace_id): return
                 path = Path(app_data_state_dir) / CLOUD_TREE_FILE
-                if path.exists(): 
-                     path.unlink()
+                db_removed = CloudTreeStore.remove(app_data_state_dir)
+                if path.exists() or db_removed: 
+                     if path.exists(): path.unlink()
                      self.log_ui(tr("log_reset_local_state", "État local réinitialisé."), "yellow")
                      
             cloud_tree = self.load_local_cloud_tree(app_data_state_dir, api_key, workspace_id)
             use_exc = self.app.config_data.get(CONF_KEY_USE_EXCLUSIONS, True)
-            local_tree = self.get_local_tree(local_folder, app_data_state_dir, use_exc)
+            self.multipart_journal = None if is_dry_run else MultipartJournal(app_data_state_dir)
+            if self.multipart_journal and force_sync: self.multipart_journal.collect_garbage([], self.app.api_client)
+            upload_queue = SizeAwareUploadQueue(self.upload_tuner.limit if self.upload_tuner else nb_workers)
+            if self.upload_tuner: self.upload_tuner.on_change = upload_queue.set_workers
+            result_queue = Queue()
+            workers = []
+            self.total_size = 0
+            self.total_transferred = 0
+            if not is_dry_run:
+                feed = MirrorUploadFeed(cloud_tree, upload_queue, on_queued=self._add_total_size)
+                workers = self._start_upload_workers(nb_workers, upload_queue, result_queue, api_key, workspace_id, feed.feeding)
+            local_tree = self.get_local_tree(local_folder, app_data_state_dir, use_exc, on_entry=feed.on_entry if feed else None)
+            streamed = feed.streamed if feed else set()
+            if self.multipart_journal and not force_sync:
+                if not self.stop_event.is_set():
+                    purged = self.multipart_journal.collect_garbage(local_tree["files"].values(), self.app.api_client)
+                    if purged: self.log_ui(f"{tr('log_multipart_journal_gc', 'Uploads interrompus abandonnés :')} {purged}", "yellow")
             
             self.log_ui(tr("log_comparing_trees", "Comparaison des arbres..."))
             self.update_status_ui(tr("status_comparing", "Comparaison..."), COL_VERT)
             
                                  
+            self.log_ui(tr("log_analyzing_files", "Analyse des fichiers..."))
+            self.update_status_ui(tr("status_analyzing_files", "Analyse des fichiers..."), COL_VERT)
+            
+            local_paths = set(local_tree["files"].keys())
+            cloud_paths = set(cloud_tree["files"].keys())
+            files_to_upload = []
+            paths_to_upload_later = set(paths_to_add := local_paths - cloud_paths)
+            paths_to_delete_later = set(paths_to_delete := cloud_paths - local_paths)
+            paths_to_check = local_paths & cloud_paths
+            
+            if paths_to_add and paths_to_delete and not self.stop_event.is_set():
+                while self.is_paused: time.sleep(0.5)
+                done_new, done_old, renamed, moved = self._apply_moves(paths_to_add, paths_to_delete, local_tree, cloud_tree, workspace_id, is_dry_run)
+                paths_to_upload_later -= done_new
+                paths_to_delete_later -= done_old
+                files_renamed_count += renamed
+                files_moved_count += moved
+            
+            # Dossiers comparés après les déplacements : un dossier déplacé d'un bloc n'est ni créé ni supprimé
             local_folders = local_tree["folders"]
             cloud_folders = set(cloud_tree["folders"].keys())
             folders_to_create = sorted(local_folders - cloud_folders, key=lambda x: x.count("/"))
             
-            for fp in folders_to_create:
-                if self.app.is_mobile: time.sleep(0.002)
-                if self.stop_event.is_set(): break
-                self.handle_folder_creation(fp, cloud_tree, workspace_id, is_dry_run)
+            # Hors simulation, la création est différée après les uploads (voir _sync_remote_folders)
+            if is_dry_run and not self.stop_event.is_set():
+                self._sync_remote_folders(folders_to_create, set(), cloud_tree, workspace_id, is_dry_run)
                 
             folders_to_delete = sorted(cloud_folders - local_folders, key=lambda x: x.count("/"), reverse=True)
             folders_to_delete_ids = []
@@ -734,77 +776,6 @@ class MirrorUploadManager(BaseTransferManager):
                     if is_dry_run: self.log_ui(f"{tr('simu_delete_folder', '[SIMU] Suppression dossier:')} {fp}", "red")
                     else: self.log_ui(f"{tr('debug_delete_folder', '[DEBUG] Suppression dossier:')} {fp}")
 
-                                    
-            self.log_ui(tr("log_analyzing_files", "Analyse des fichiers..."))
-            self.update_status_ui(tr("status_analyzing_files", "Analyse des fichiers..."), COL_VERT)
-            
-            local_paths = set(local_tree["files"].keys())
-            cloud_paths = set(cloud_tree["files"].keys())
-            files_to_upload = []
-            renamed_in_place = []
-            paths_to_upload_later = set(paths_to_add := local_paths - cloud_paths)
-            paths_to_delete_later = set(paths_to_delete := cloud_paths - local_paths)
-            paths_to_check = local_paths & cloud_paths
-            
-                            
-            local_hashes = {info["partial_hash"]: [] for info in local_tree["files"].values()}
-            for path, info in local_tree["files"].items():
-                 h = info["partial_hash"]
-                 if h not in local_hashes: local_hashes[h] = []
-                 local_hashes[h].append(path)
-                 
-            cloud_hashes = {}
-            for path, info in cloud_tree["files"].items():
-                h = info.get("partial_hash")
-                if h:
-                    if h not in cloud_hashes: cloud_hashes[h] = []
-                    cloud_hashes[h].append(path)
-                    
-            for new_path in paths_to_add:
-                new_info = local_tree["files"][new_path]
-                new_hash = new_info["partial_hash"]
-                if new_hash in cloud_hashes:
-                    for old_path in cloud_hashes[new_hash]:
-                        if old_path in paths_to_delete_later:
-                            old_info = cloud_tree["files"][old_path]
-                            if old_info["size"] == new_info["size"]:
-                                new_name = Path(new_path).name
-                                old_parent = str(Path(old_path).parent)
-                                new_parent = str(Path(new_path).parent)
-                                if old_parent == new_parent:
-                                    if is_dry_run:
-                                         self.log_ui(f"{tr('simu_rename', '[SIMU] Renommage:')} {old_path} -> {new_path}", "yellow")
-                                         paths_to_upload_later.remove(new_path)
-                                         paths_to_delete_later.remove(old_path)
-                                         info = cloud_tree["files"].pop(old_path)
-                                         cloud_tree["files"][new_path] = info
-                                    else:
-                                         renamed_in_place.append((old_path, new_path, old_info['id'], new_name))
-                                         paths_to_upload_later.remove(new_path)
-                                         paths_to_delete_later.remove(old_path)
-                                         info = cloud_tree["files"].pop(old_path)
-                                         info['mtime'] = new_info['mtime']
-                                         info['partial_hash'] = new_info['partial_hash']
-                                         cloud_tree["files"][new_path] = info
-                                    break 
-
-                             
-            for old_p, new_p, eid, name in renamed_in_place:
-                if self.app.is_mobile: time.sleep(0.002)
-                if self.stop_event.is_set(): break
-                while self.is_paused: time.sleep(0.5)
-                if not self.rename_remote_entry(eid, name, api_key):
-                    self.log_ui(f"{tr('failure_rename', 'Échec renommage')} {new_p}", "red")
-                    paths_to_upload_later.add(new_p)
-                    paths_to_delete_later.add(old_p)
-                else:
-                    if str(Path(old_p).parent) == str(Path(new_p).parent):
-                         files_renamed_count += 1
-                         self.log_ui(f"{tr('log_renamed', 'Renommé:')} {old_p} -> {new_p}", "yellow")
-                    else:
-                         files_moved_count += 1
-                         self.log_ui(f"{tr('log_moved', 'Déplacé:')} {old_p} -> {new_p}", "yellow")
-
                                
             files_to_delete_ids = []
             for p in paths_to_delete_later:
@@ -815,13 +786,17 @@ class MirrorUploadManager(BaseTransferManager):
                     else: self.log_ui(f"{tr('debug_delete_file', '[DEBUG] Suppr:')} {p}")
 
                                    
-            for p in paths_to_check:
-                l_info = local_tree["files"][p]
-                c_info = cloud_tree["files"][p]
-                if l_info['size'] != c_info.get('size') or l_info['partial_hash'] != c_info.get('partial_hash'):
-                    self.log_ui(f"{tr('log_modified', 'Modifié:')} {p}", "yellow")
-                    files_to_upload.append(p)
-            for p in paths_to_upload_later: files_to_upload.append(p)
+            detector = ChangeDetector(get_change_detection_policy(self.app.config_data, workspace_id), app_data_state_dir, stop_event=self.stop_event)
+            for p in detector.find_changes(paths_to_check, local_tree["files"], cloud_tree["files"]):
+                self.log_ui(f"{tr('log_modified', 'Modifié:')} {p}", "yellow")
+                if p not in streamed: files_to_upload.append(p)
+            for p in detector.unchanged:
+                # Contenu identique (hash complet) : seul le mtime a bougé, inutile de revérifier au prochain passage
+                info = cloud_tree["files"][p]
+                info["mtime"] = local_tree["files"][p]["mtime"]
+                cloud_tree["files"][p] = info
+            for p in paths_to_upload_later:
+                if p not in streamed: files_to_upload.append(p)
 
                                
             if is_dry_run:
@@ -829,35 +804,18 @@ class MirrorUploadManager(BaseTransferManager):
                 self.log_ui(tr("log_end_simu", "--- FIN SIMULATION ---"), "yellow")
                 return
 
-            total = len(files_to_upload)
-            save_interval = 5
-            if total > 10000: save_interval = 1000
-            elif total > 2000: save_interval = 200
-            elif total > 200: save_interval = 50
+            total = len(files_to_upload) + len(streamed)
+            # Les points de sauvegarde n'écrivent que le delta : intervalle fixe, indépendant de la taille de l'arbre
+            save_interval = CLOUD_TREE_CHECKPOINT_INTERVAL
             
             self.log_ui(f"{tr('log_files_to_upload', 'Fichiers à uploader:')} {total} (Sauvegarde état tous les {save_interval})")
-            self.total_size = 0
-            self.total_transferred = 0
-            for p in files_to_upload:
-                self.total_size += local_tree["files"][p]["size"]
-                
             self.update_status_ui(f"{tr('status_modifications', 'Modifications:')} {total} fichier(s)", COL_VIOLET)
             
-            upload_queue = Queue()
-            result_queue = Queue()
             for p in files_to_upload:
-                upload_queue.put((p, local_tree["files"][p]))
-                
-            workers = []
-            for i in range(nb_workers):
-                t = threading.Thread(
-                    target=self.upload_worker, 
-                    args=(upload_queue, result_queue, api_key, workspace_id), 
-                    daemon=True, 
-                    name=f"Worker-{i+1}"
-                )
-                t.start()
-                workers.append(t)
+                info = local_tree["files"][p]
+                self._add_total_size(info)
+                upload_queue.put((p, info))
+            feed.close()
                 
             processed = 0
             while processed < total:
@@ -867,15 +825,19 @@ class MirrorUploadManager(BaseTransferManager):
                 processed += 1
                 
                 if res:
+                    if rel_path in detector.content_hashes: res["content_hash"] = detector.content_hashes[rel_path]
                     cloud_tree["files"][rel_path] = res
                     files_success_count += 1
                     total_bytes_uploaded += res.get("size", 0)
                     self.log_ui(f"Succès: {rel_path}")
-                    if processed % save_interval == 0: self.save_local_cloud_tree(cloud_tree, app_data_state_dir)
+                    if processed % save_interval == 0: self.checkpoint_cloud_tree(cloud_tree, app_data_state_dir)
                 else:
                     files_failed_count += 1
                     self.log_ui(f"Échec: {rel_path}", "red")
 
+            if not self.stop_event.is_set():
+                self._sync_remote_folders(folders_to_create, set(files_to_upload) | streamed, cloud_tree, workspace_id)
+
             all_del_ids = folders_to_delete_ids + files_to_delete_ids
             files_deleted_count = len(all_del_ids)
             
@@ -921,6 +883,8 @@ class MirrorUploadManager(BaseTransferManager):
                 }
                 report = self.generate_report(stats, total_time, "TERMINÉ")
                 self.log_ui(f"\n--- BILAN ---\n{report}")
+                conn = self.app.api_client.get_connection_stats()
+                self.log_debug(f"[DEBUG] Connexions API {conn['api']['connections']} / {conn['api']['requests']} req, Stockage {conn['storage']['connections']} / {conn['storage']['requests']} req")
                 
                 async def show_report():
                     await self.app.main_window.dialog(toga.InfoDialog("Rapport", report))
@@ -931,5 +895,11 @@ class MirrorUploadManager(BaseTransferManager):
             import traceback
             traceback.print_exc()
         finally:
+            if feed: feed.close()
+            self._stop_concurrency_tuner(self.upload_tuner)
+            self.upload_tuner = None
+            if self.cloud_tree_store:
+                self.cloud_tree_store.close()
+                self.cloud_tree_store = None
             def _reset(): self._set_ui_running(False)
             self.app.loop.call_soon_threadsafe(_reset)
\ No newline at end of file
@@ -11,7 +11,6 @@ import mimetypes
 import hashlib
 import threading
 import re
-import fnmatch
 import tempfile
 from io import BytesIO
 from queue import Queue
@@ -22,31 +21,43 @@ from drimesyncunofficial.constants import (
     API_BASE_URL, HTTP_TIMEOUT, MODE_NO_ENC, MODE_E2EE_STANDARD, MODE_E2EE_ADVANCED, MODE_E2EE_ZK, 
     E2EE_CRYPTO_ALGO, SYNC_STATE_FOLDER_NAME, CLOUD_TREE_FILE_NAME, EXCLUDE_FILE_NAME, 
     PARTIAL_HASH_CHUNK_SIZE, CHUNK_SIZE,
-    CONF_KEY_API_KEY, CONF_KEY_WORKERS, CONF_KEY_SEMAPHORES, CONF_KEY_USE_EXCLUSIONS,
-    CONF_KEY_ENCRYPTION_MODE, CONF_KEY_E2EE_PASSWORD, ANDROID_DOWNLOAD_PATH
+    CONF_KEY_API_KEY, CONF_KEY_WORKERS, CONF_KEY_SEMAPHORES, CONF_KEY_USE_EXCLUSIONS, CONF_KEY_PART_WORKERS,
+    CONF_KEY_ENCRYPTION_MODE, CONF_KEY_E2EE_PASSWORD, ANDROID_DOWNLOAD_PATH, PART_WORKERS
 )
-from drimesyncunofficial.api_client import DrimeClientError
+from drimesyncunofficial.api_client import DrimeClientError, MultipartUploader, iter_files
+from drimesyncunofficial.scan_index import ScanIndex
+from drimesyncunofficial.cloud_tree_store import CloudTreeStore, write_tree_snapshot
+from drimesyncunofficial.compact_tree import FileTable, HashIndex
+from drimesyncunofficial.exclusions import ExclusionMatcher
+from drimesyncunofficial.local_scanner import LocalScanner
+from drimesyncunofficial.upload_feed import MirrorUploadFeed, next_upload_item
+from drimesyncunofficial.upload_scheduler import SizeAwareUploadQueue
+from drimesyncunofficial.concurrency_tuner import AimdController, TUNING_UPLOAD
+from drimesyncunofficial.remote_folders import RemoteFolderCreator, implicit_folders
+from drimesyncunofficial.remote_moves import RemoteMover, pair_moved_files, plan_moves
+from drimesyncunofficial.change_detection import ChangeDetector, get_change_detection_policy, set_change_detection_policy
 from drimesyncunofficial.utils import (
     format_size, get_salt_path, derive_key, generate_or_load_salt,
     E2EE_encrypt_file, E2EE_decrypt_file, E2EE_encrypt_name, 
     get_remote_path_for_tree_file, load_exclusion_patterns, 
-    E2EE_encrypt_bytes, E2EE_decrypt_bytes, truncate_path_smart,
+    E2EE_decrypt_bytes, truncate_path_smart,
     sanitize_filename_for_upload, E2EE_decrypt_name
 )
-from drimesyncunofficial.ui_utils import create_back_button, create_logs_box
+from drimesyncunofficial.ui_utils import create_back_button, create_logs_box, change_detection_labels, create_change_detection_selection, selected_change_detection
 from drimesyncunofficial.browsers import AndroidFileBrowser
-from drimesyncunofficial.mixins import LoggerMixin
+from drimesyncunofficial.mixins import LoggerMixin, ConcurrencyTuningMixin
 from drimesyncunofficial.ui_thread_utils import safe_update_label, safe_log, run_in_background
 
 SYNC_STATE_FOLDER = SYNC_STATE_FOLDER_NAME
 CLOUD_TREE_FILE = CLOUD_TREE_FILE_NAME
+CLOUD_TREE_CHECKPOINT_INTERVAL = 20
 
 BATCH_SIZE = 10
 PART_UPLOAD_RETRIES = 10
 MULTIPART_THRESHOLD = 30 * 1024 * 1024
 
 simple_upload_limiter: Optional[threading.Semaphore] = None
-class MirrorUploadE2EEManager(LoggerMixin):
+class MirrorUploadE2EEManager(LoggerMixin, ConcurrencyTuningMixin):
     """
     Gestionnaire de Synchronisation Miroir avec Chiffrement E2EE.
     Synchronise un dossier local vers un workspace distant en chiffrant tout à la volée.
@@ -72,6 +83,7 @@ class MirrorUploadE2EEManager(LoggerMixin):
         self.box_secondary_btns: Optional[toga.Box] = None
         self.box_actions_container: Optional[toga.Box] = None
         self.selection_mirror_ws: Optional[toga.Selection] = None
+        self.selection_change_detection: Optional[toga.Selection] = None
         self.e2ee_mode: str = self.app.config_data.get(CONF_KEY_ENCRYPTION_MODE, MODE_NO_ENC)
         self.e2ee_password: str = self.app.config_data.get(CONF_KEY_E2EE_PASSWORD, '')
         self.e2ee_key: Optional[bytes] = None 
@@ -79,9 +91,12 @@ class MirrorUploadE2EEManager(LoggerMixin):
         self.is_paused: bool = False
         self.stop_event: threading.Event = threading.Event()
         self.simple_upload_limiter: Optional[threading.Semaphore] = None
+        self.upload_tuner: Optional[AimdController] = None
+        self.part_workers: int = PART_WORKERS
         self.total_size: int = 0
         self.total_transferred: int = 0
         self.progress_lock: threading.Lock = threading.Lock()
+        self.cloud_tree_store: Optional[CloudTreeStore] = None
         self.main_box_content = None
     async def _show_error_dialog_async(self, title: str, message: str) -> None:
         await self.app.main_window.dialog(toga.ErrorDialog(title, message))
@@ -131,6 +146,9 @@ class MirrorUploadE2EEManager(LoggerMixin):
         selected_item_str = next((item for item in items if f"(ID: {current_saved_ws_id})" in item), items[0])
         self.selection_mirror_ws.value = selected_item_str
         box.add(self.selection_mirror_ws)
+        box.add(toga.Label("Détection des changements :", style=Pack(font_weight=BOLD, margin_bottom=5)))
+        self.selection_change_detection = create_change_detection_selection(get_change_detection_policy(self.app.config_data, self._get_selected_workspace_id()), width=220, margin_bottom=10)
+        box.add(self.selection_change_detection)
         self.lbl_warning_ws = toga.Label("⚠️ Déconseillé dans l'Espace Personnel.\nCréez un workspace dédié.", style=Pack(font_size=8, color=COL_ROUGE, font_weight=BOLD, margin_bottom=10, visibility='hidden', flex=1))
         box.add(self.lbl_warning_ws)
         self.lbl_conflict_warning = toga.Label("⚠️ CONFLIT : Workspace utilisé par le\nmiroir STANDARD. Risque de désynchronisation.", style=Pack(font_size=8, color=COL_JAUNE, font_weight=BOLD, margin_bottom=20, visibility='hidden', flex=1))
@@ -223,6 +241,8 @@ class MirrorUploadE2EEManager(LoggerMixin):
                     safe_update_label(self.app, self.lbl_progress, f"{txt}   {char}")
             time.sleep(0.1)
     def update_warnings(self, widget: Any) -> None:
+        if self.selection_change_detection:
+            self.selection_change_detection.value = change_detection_labels()[get_change_detection_policy(self.app.config_data, self._get_selected_workspace_id())]
         if not self.lbl_warning_ws: return
         sel = self._get_selected_workspace_id()
         std_id = self.app.config_data.get('workspace_standard_id', '0')
@@ -266,6 +286,8 @@ class MirrorUploadE2EEManager(LoggerMixin):
         asyncio.ensure_future(_ask())
     def _save_config_file(self) -> None:
         self.app.config_data['workspace_e2ee_id'] = self._get_selected_workspace_id()
+        if self.selection_change_detection:
+            set_change_detection_policy(self.app.config_data, self._get_selected_workspace_id(), selected_change_detection(self.selection_change_detection))
         config_to_save = self.app.config_data.copy()
         is_desktop = toga.platform.current_platform not in {'android', 'iOS', 'web'}
         if is_desktop:
@@ -430,37 +452,31 @@ class MirrorUploadE2EEManager(LoggerMixin):
                     m.update(f.read(PARTIAL_HASH_CHUNK_SIZE))
             return m.hexdigest()
         except: return None
-    def get_local_tree(self, root_folder: str, app_data_state_dir: str, use_exclusions: bool = True) -> Dict[str, Any]:
+    def get_local_tree(self, root_folder: str, app_data_state_dir: str, use_exclusions: bool = True, on_entry: Optional[Callable[..., None]] = None) -> Dict[str, Any]:
         """Scanne le dossier local pour construire l'arbre de fichiers."""
         self.log_ui(f"Scan du dossier local : {root_folder}")
-        tree = {"folders": set(), "files": {}}
-        exclusions = load_exclusion_patterns(self.app.paths, use_exclusions)
-        root_path_obj = Path(root_folder)
-        for root, dirs, files in os.walk(root_folder):
-            for d in dirs[:]:
-                full_dir = Path(root) / d
-                try:
-                    rel = str(full_dir.relative_to(root_path_obj)).replace("\\", "/")
-                except ValueError: continue
-                if any(fnmatch.fnmatch(rel, p) for p in exclusions): 
-                    dirs.remove(d); continue
-                tree["folders"].add(rel)
-            for f in files:
-                full = Path(root) / f
-                try:
-                    rel = str(full.relative_to(root_path_obj)).replace("\\", "/")
-                except ValueError: continue
-                if any(fnmatch.fnmatch(rel, p) for p in exclusions): continue
-                try:
-                    st = full.stat()
-                    if st.st_size >= 0:
-                        ph = self.get_partial_hash(full, st.st_size)
-                        if ph: tree["files"][rel] = {"full_path": str(full), "size": st.st_size, "mtime": st.st_mtime, "partial_hash": ph}
-                except: pass
+        tree = {"folders": set(), "files": FileTable(str(Path(root_folder)))}
+        exclusions = ExclusionMatcher(load_exclusion_patterns(self.app.paths, use_exclusions))
+        index = ScanIndex(app_data_state_dir)
+        scanner = LocalScanner(root_folder, self.get_partial_hash, exclusions, index, self.stop_event)
+        for item in scanner.scan():
+            if item.kind == "dir":
+                tree["folders"].add(item.rel)
+                if on_entry: on_entry("dir", item.rel)
+            elif item.kind == "file" and item.partial_hash:
+                info = {"full_path": item.full_path, "size": item.stat.st_size, "mtime": item.stat.st_mtime, "partial_hash": item.partial_hash}
+                tree["files"][item.rel] = info
+                if on_entry: on_entry("file", item.rel, info)
+        tree["moved_from"] = scanner.moved_from
+        index.close()
         return tree
     def load_local_cloud_tree(self, app_data_state_dir: str, api_key: str, ws_id: str) -> Dict[str, Any]:
         """Charge l'état distant connu (depuis le disque local ou le cloud si absent)."""
         path = os.path.join(app_data_state_dir, CLOUD_TREE_FILE)
+        if self.cloud_tree_store: self.cloud_tree_store.close()
+        self.cloud_tree_store = CloudTreeStore(app_data_state_dir, self.e2ee_key)
+        tree = self.cloud_tree_store.load()
+        if tree is not None: return tree
         if not os.path.exists(path):
             self.log_ui(f"[DEBUG] État local manquant. Recherche Recovery...")
             target_filename_clear = CLOUD_TREE_FILE
@@ -478,11 +494,12 @@ class MirrorUploadE2EEManager(LoggerMixin):
                 candidates.append(target_filename_enc)
             found_file = None
             for name in candidates:
-                 data = self.app.api_client.list_files(params={"query": name, "workspaceId": ws_id})
-                 if data and 'data' in data:
-                     for f in data['data']:
-                         if f['name'] == name:
+                 try:
+                     for f in iter_files(self.app.api_client, {"query": name, "workspaceId": ws_id}):
+                         if f.get('name') == name:
                              found_file = f; break
+                 except Exception as e:
+                     self.log_ui(f"[ERROR] Recovery failed: {e}", "red")
                  if found_file: break
             if found_file:
                 self.log_ui(f"[INFO] Fichier d'état trouvé (ID: {found_file['id']}). Récupération...")
@@ -506,83 +523,125 @@ class MirrorUploadE2EEManager(LoggerMixin):
                     self.log_ui(f"[ERROR] Recovery failed: {e}", "red")
             else:
                 self.log_ui("[INFO] Pas d'état distant. Départ à zéro.", "yellow")
+        tree = {"folders": {}, "files": {}}
         if os.path.exists(path):
             try:
                 with open(path, 'rb') as f: content = f.read()
                 try:
-                    return json.loads(content)
+                    tree = json.loads(content)
                 except:
                     if self.e2ee_key:
                         decrypted = E2EE_decrypt_bytes(content, self.e2ee_key)
-                        if decrypted: return json.loads(decrypted)
+                        if decrypted: tree = json.loads(decrypted)
             except: pass
-        return {"folders": {}, "files": {}}
+        return self.cloud_tree_store.adopt(tree)
     def save_local_cloud_tree(self, tree: Dict[str, Any], app_data_state_dir: str, encrypt: bool = False) -> None:
-        """Sauvegarde l'état distant connu sur le disque local (chiffré si demandé)."""
-        path = Path(app_data_state_dir) / CLOUD_TREE_FILE
-        try:
-            data_bytes = json.dumps(tree, indent=2).encode('utf-8')
-            if encrypt and self.e2ee_key:
-                encrypted_data = E2EE_encrypt_bytes(data_bytes, self.e2ee_key)
-                with open(path, 'wb') as f: f.write(encrypted_data)
-            else:
-                with open(path, 'wb') as f: f.write(data_bytes)
-        except: pass
+        """Fin de synchro : commit des dernières modifications puis export de l'instantané JSON (chiffré si demandé)."""
+        if self.cloud_tree_store: self.cloud_tree_store.commit(tree)
+        write_tree_snapshot(tree, Path(app_data_state_dir) / CLOUD_TREE_FILE, self.e2ee_key if encrypt else None)
+    def checkpoint_cloud_tree(self, tree: Dict[str, Any], app_data_state_dir: str) -> None:
+        """Point de sauvegarde en cours de synchro : seules les entrées modifiées sont écrites (chiffrées ligne à ligne)."""
+        if not (self.cloud_tree_store and self.cloud_tree_store.commit(tree)):
+            self.save_local_cloud_tree(tree, app_data_state_dir)
     def handle_folder_creation(self, rel_folder_path: str, cloud_tree: Dict[str, Any], ws_id: str, is_dry_run: bool) -> None:
-        """Crée récursivement les dossiers manquants sur le cloud (noms chiffrés)."""
-        cloud_path_enc = self._calculate_remote_path(rel_folder_path, is_folder=True)
-        if rel_folder_path in cloud_tree["folders"]: return
-        if "/" in rel_folder_path:
-            parent_rel = rel_folder_path.rsplit('/', 1)[0]
-            if parent_rel not in cloud_tree["folders"]:
-                self.handle_folder_creation(parent_rel, cloud_tree, ws_id, is_dry_run)
-            parent_id = cloud_tree["folders"][parent_rel]["id"]
-        else: parent_id = ws_id
-        if is_dry_run:
-            self.log_ui(f"[SIMU] Création dossier: {rel_folder_path} -> {cloud_path_enc}")
-            cloud_tree["folders"][rel_folder_path] = {"id": f"SIMU_ID_{rel_folder_path}", "name": cloud_path_enc.split("/")[-1]}
-            return
-        folder_name_to_create = cloud_path_enc.split("/")[-1]
-        try:
-            entry = self.app.api_client.create_folder(name=folder_name_to_create, parent_id=parent_id if parent_id != ws_id else None, workspace_id=ws_id)
-            if entry and (entry.get('folder') or entry).get('id'):
-                cloud_tree["folders"][rel_folder_path] = entry.get('folder') or entry
-                self.log_ui(f"Dossier créé: {rel_folder_path}")
-        except DrimeClientError:
-                                                       
-             data = self.app.api_client.list_files(params={"folderId": parent_id if parent_id != ws_id else None, "workspaceId": ws_id})
-             if data and 'data' in data:
-                 for i in data['data']:
-                     if i['type'] == 'folder' and i['name'] == folder_name_to_create:
-                         cloud_tree["folders"][rel_folder_path] = i
-                         return
+        """Crée (ou simule) récursivement les dossiers manquants sur le cloud (noms chiffrés)."""
+        self._folder_creator(cloud_tree, ws_id, is_dry_run).run([rel_folder_path])
     def rename_remote_entry(self, entry_id: str, new_name: str, api_key: str) -> Optional[str]:
         try:
-            resp = self.app.api_client.rename_entry(entry_id, new_name)
-            if resp.status_code == 200:
-                data = resp.json()
-                return (data.get('id') or data.get('fileEntry', {}).get('id'))
+            # rename_entry retourne le JSON décodé (une erreur HTTP lève une DrimeError)
+            data = self.app.api_client.rename_entry(entry_id, new_name)
+            entry = (data.get('fileEntry') or data) if isinstance(data, dict) else {}
+            return entry.get('id') or entry_id
         except: pass
         return None
-    def upload_worker(self, q: Queue, res_q: Queue, api_key: str, ws_id: str) -> None:
-        """Worker thread pour l'upload E2EE."""
+    def upload_worker(self, q: Queue, res_q: Queue, api_key: str, ws_id: str, feeding: Optional[threading.Event] = None) -> None:
+        """Worker thread pour l'upload E2EE (attend les fichiers du scan tant que `feeding` est levé)."""
         thread_name = threading.current_thread().name
+        tuner = self.upload_tuner
         while True:
-            try: item = q.get_nowait()
-            except: break
-            if self.stop_event.is_set(): 
-                q.task_done(); continue
-            while self.is_paused: time.sleep(0.5)
-            rel_path, info = item
-            remote_path = self._calculate_remote_path(rel_path, is_folder=False)
-            self.log_ui(f"[DEBUG] [{thread_name}] Start: {rel_path}")
-            result = None
+            if tuner and not tuner.acquire(self.stop_event.is_set): break
             try:
-                result = self.upload_file_router_e2ee(info, remote_path, api_key, ws_id, thread_name)
-            except Exception as e:
-                self.log_ui(f"[{thread_name}] CRASH Worker: {e}", "red")
-            res_q.put((rel_path, result))
-            q.task_done()
+                item = next_upload_item(q, feeding)
+                if item is None: break
+                if self.stop_event.is_set(): 
+                    q.task_done(); continue
+                while self.is_paused: time.sleep(0.5)
+                rel_path, info = item
+                remote_path = self._calculate_remote_path(rel_path, is_folder=False)
+                self.log_ui(f"[DEBUG] [{thread_name}] Start: {rel_path}")
+                result = None
+                started = time.monotonic()
+                try:
+                    result = self.upload_file_router_e2ee(info, remote_path, api_key, ws_id, thread_name)
+                except Exception as e:
+                    self.log_ui(f"[{thread_name}] CRASH Worker: {e}", "red")
+                if tuner and not self.stop_event.is_set(): tuner.record(info["size"], time.monotonic() - started, ok=bool(result) and "error" not in result)
+                res_q.put((rel_path, result))
+                q.task_done()
+            finally:
+                if tuner: tuner.release()
+    def _remote_name(self, rel_path: str, is_folder: bool) -> str:
+        """Nom distant (chiffré selon le mode) du dernier élément de `rel_path`."""
+        return self._calculate_remote_path(rel_path, is_folder=is_folder).split("/")[-1]
+    def _apply_moves(self, paths_to_add: Set[str], paths_to_delete: Set[str], local_tree: Dict[str, Any], cloud_tree: Dict[str, Any], ws_id: str, is_dry_run: bool) -> Tuple[Set[str], Set[str], int, int]:
+        """
+        Renommages et déplacements exécutés côté serveur (noms chiffrés recalculés, contenu inchangé).
+        Retourne (nouveaux chemins traités, anciens chemins traités, nb renommés, nb déplacés).
+        """
+        pairs = pair_moved_files(paths_to_add, paths_to_delete, local_tree["files"], cloud_tree["files"], HashIndex(cloud_tree["files"]), local_tree.get("moved_from"))
+        if not pairs: return set(), set(), 0, 0
+        plan = plan_moves(pairs, cloud_tree, local_tree["folders"])
+        creator = RemoteFolderCreator(self.app.api_client, ws_id, cloud_tree, lambda rel: self._remote_name(rel, True), stop_event=self.stop_event)
+        mover = RemoteMover(self.app.api_client, ws_id, cloud_tree, local_tree["files"], self._remote_name, creator, dry_run=is_dry_run)
+        mover.apply(plan)
+        simu = "[SIMU] " if is_dry_run else ""
+        renamed = moved = 0
+        done = list(mover.moved_files)
+        for d, dn in mover.moved_dirs:
+            covered = [(o, n) for o, n in plan.covered.items() if o.startswith(d + "/")]
+            done.extend(covered)
+            moved += len(covered)
+            self.log_ui(f"{simu}Dossier déplacé: {d} -> {dn} ({len(covered)})", "yellow")
+        for old, new in mover.moved_files:
+            if old.rpartition("/")[0] == new.rpartition("/")[0]:
+                renamed += 1
+                self.log_ui(f"{simu}Renommé: {old} -> {new}", "yellow")
+            else:
+                moved += 1
+                self.log_ui(f"{simu}Déplacé: {old} -> {new}", "yellow")
+        for old, new in mover.failed: self.log_ui(f"Échec renommage {new}", "red")
+        return {n for _, n in done}, {o for o, _ in done}, renamed, moved
+    def _folder_creator(self, cloud_tree: Dict[str, Any], ws_id: str, is_dry_run: bool = False) -> RemoteFolderCreator:
+        if is_dry_run: log = lambda rel: self.log_ui(f"[SIMU] Création dossier: {rel} -> {self._calculate_remote_path(rel, is_folder=True)}")
+        else: log = lambda rel: self.log_ui(f"Dossier créé: {rel}")
+        # Simulation : aucune requête, le client API n'est pas nécessaire
+        return RemoteFolderCreator(
+            None if is_dry_run else self.app.api_client, ws_id, cloud_tree,
+            lambda rel: self._calculate_remote_path(rel, is_folder=True).split("/")[-1],
+            stop_event=self.stop_event, log=log, dry_run=is_dry_run
+        )
+    def _sync_remote_folders(self, folders_to_create: List[str], uploaded_paths: Set[str], cloud_tree: Dict[str, Any], ws_id: str, is_dry_run: bool = False) -> None:
+        """
+        Dossiers distants manquants, par niveaux parallèles. Ceux qui contiennent un fichier uploadé ont déjà été
+        créés par le serveur (relativePath) : leur id est seulement relu dans le listing du parent (mis en cache).
+        Les autres (dossiers vides) sont créés. En simulation, ils sont seulement journalisés.
+        """
+        if not folders_to_create: return
+        creator = self._folder_creator(cloud_tree, ws_id, is_dry_run)
+        implicit = implicit_folders(uploaded_paths)
+        creator.run([f for f in folders_to_create if f in implicit], resolve=True)
+        creator.run([f for f in folders_to_create if f not in implicit])
+        if creator.failed: self.log_ui(f"Dossiers non créés : {len(creator.failed)}", "red")
+    def _add_total_size(self, info: Dict[str, Any]) -> None:
+        with self.progress_lock: self.total_size += info["size"]
+    def _start_upload_workers(self, nb_workers: int, q: Queue, res_q: Queue, api_key: str, ws_id: str, feeding: Optional[threading.Event]) -> List[threading.Thread]:
+        """Démarre les workers d'upload ; avec `feeding`, ils attendent les fichiers produits pendant le scan."""
+        workers = []
+        for i in range(nb_workers):
+            t = threading.Thread(target=self.upload_worker, args=(q, res_q, api_key, ws_id, feeding), daemon=True, name=f"Worker-{i+1}")
+            t.start()
+            workers.append(t)
+        return workers
     def parse_api_response_for_id(self, response: Any) -> Optional[Dict[str, Any]]:
         if not response: return None
         if isinstance(response, dict) and 'error_code' in response: return None
@@ -641,7 +700,6 @@ class MirrorUploadE2EEManager(LoggerMixin):
                 encrypted_bytes = E2EE_encrypt_file(local_info["full_path"], self.e2ee_key)
                 tmp_file.write(encrypted_bytes)
             enc_size = Path(tmp_path).stat().st_size
-            num_parts = math.ceil(enc_size / CHUNK_SIZE)
             file_name = Path(remote_path).name
             init_resp = self.app.api_client.upload_multipart_init(file_name, enc_size, remote_path, ws_id)
             if init_resp.status_code not in [200, 201]: 
@@ -649,36 +707,22 @@ class MirrorUploadE2EEManager(LoggerMixin):
                 return None
             upload_id = init_resp.json()['uploadId']
             key = init_resp.json()['key']
-            uploaded_parts = []
+            def check_status():
+                while self.is_paused and not self.stop_event.is_set(): time.sleep(0.5)
+                if self.app.is_mobile: time.sleep(0.005)
+                return not self.stop_event.is_set()
+            def progress_cb(chunk_len):
+                with self.progress_lock:
+                    self.total_transferred += chunk_len
+                    percent = int((self.total_transferred / self.total_size) * 100) if self.total_size > 0 else 0
+                    self.update_status_ui(f"Upload {format_size(self.total_transferred)}/{format_size(self.total_size)} {percent}%", COL_BLEU2)
+            uploader = MultipartUploader(
+                self.app.api_client, key, upload_id,
+                chunk_size=CHUNK_SIZE, part_workers=self.part_workers, retries=PART_UPLOAD_RETRIES,
+                progress_callback=progress_cb, check_status_callback=check_status
+            )
             with open(tmp_path, "rb") as f:
-                part_number = 1
-                while part_number <= num_parts:
-                    if self.stop_event.is_set(): raise Exception("Cancelled")
-                    while self.is_paused: time.sleep(0.5)
-
-                    if self.app.is_mobile: time.sleep(0.005)
-
-                    batch_end = min(part_number + BATCH_SIZE - 1, num_parts)
-                    batch_nums = list(range(part_number, batch_end + 1))
-                    sign_resp = self.app.api_client.upload_multipart_sign_batch(key, upload_id, batch_nums)
-                    if sign_resp.status_code not in [200, 201]:
-                        if tmp_path: Path(tmp_path).unlink(missing_ok=True)
-                        return None
-                    urls_map = {u['partNumber']: u['url'] for u in sign_resp.json()['urls']}
-                    for pn in batch_nums:
-                        if self.app.is_mobile: time.sleep(0.005)
-                        chunk = f.read(CHUNK_SIZE)
-                        if not chunk: break
-                        r = self.app.api_client.upload_multipart_put_chunk(urls_map[pn], chunk)
-                        if r.status_code in [200, 201]:
-                            uploaded_parts.append({"PartNumber": pn, "ETag": r.headers.get("ETag", "").strip('"')})
-                            with self.progress_lock:
-                                self.total_transferred += len(chunk)
-                                percent = int((self.total_transferred / self.total_size) * 100) if self.total_size > 0 else 0
-                                self.update_status_ui(f"Upload {format_size(self.total_transferred)}/{format_size(self.total_size)} {percent}%", COL_BLEU2)
-                        else:
-                            pass
-                    part_number += BATCH_SIZE
+                uploaded_parts = uploader.upload(f, enc_size)
             comp_resp = self.app.api_client.upload_multipart_complete(key, upload_id, uploaded_parts)
             if comp_resp.status_code not in [200, 201]:
                 if tmp_path: Path(tmp_path).unlink(missing_ok=True)
@@ -716,34 +760,66 @@ class MirrorUploadE2EEManager(LoggerMixin):
         )
     def _thread_mirror_logic(self, local_folder: str, workspace_id: str, is_dry_run: bool, force_sync: bool) -> None:
         """Logique principale de synchronisation E2EE (Thread dédié)."""
+        feed = None
         try:
             self.log_ui(f"--- DÉMARRAGE {self.e2ee_mode} ({'SIMU' if is_dry_run else 'REEL'}) ---", "green")
             start_time = time.time()
             files_success_count = 0; files_failed_count = 0; files_renamed_count = 0; files_moved_count = 0; files_deleted_count = 0; total_bytes_uploaded = 0
             api_key = self.app.config_data.get(CONF_KEY_API_KEY, '')
             nb_workers = int(self.app.config_data.get(CONF_KEY_WORKERS, 5))
+            if not is_dry_run:
+                self.upload_tuner = self._start_concurrency_tuner(TUNING_UPLOAD, workspace_id, nb_workers, lambda: self.total_transferred)
+                nb_workers = self.upload_tuner.maximum
             sem_val = int(self.app.config_data.get(CONF_KEY_SEMAPHORES, 0))
             if sem_val == 0: sem_val = nb_workers
             self.simple_upload_limiter = threading.Semaphore(sem_val)
+            self.part_workers = int(self.app.config_data.get(CONF_KEY_PART_WORKERS, PART_WORKERS))
+            self.app.api_client.configure_pools(nb_workers, self.part_workers, sem_val)
             app_data_state_dir = self._get_local_state_dir(workspace_id)
             if force_sync and not is_dry_run:
                 if not self.delete_all_cloud_content(api_key, workspace_id): return
                 path = Path(app_data_state_dir) / CLOUD_TREE_FILE
-                if path.exists(): 
-                     path.unlink()
+                db_removed = CloudTreeStore.remove(app_data_state_dir)
+                if path.exists() or db_removed: 
+                     if path.exists(): path.unlink()
                      self.log_ui("État local réinitialisé.", "yellow")
             cloud_tree = self.load_local_cloud_tree(app_data_state_dir, api_key, workspace_id)
             use_exc = self.app.config_data.get(CONF_KEY_USE_EXCLUSIONS, True)
-            local_tree = self.get_local_tree(local_folder, app_data_state_dir, use_exc)
+            upload_queue = SizeAwareUploadQueue(self.upload_tuner.limit if self.upload_tuner else nb_workers)
+            if self.upload_tuner: self.upload_tuner.on_change = upload_queue.set_workers
+            result_queue = Queue()
+            workers = []
+            self.total_size = 0
+            self.total_transferred = 0
+            if not is_dry_run:
+                feed = MirrorUploadFeed(cloud_tree, upload_queue, on_queued=self._add_total_size)
+                workers = self._start_upload_workers(nb_workers, upload_queue, result_queue, api_key, workspace_id, feed.feeding)
+            local_tree = self.get_local_tree(local_folder, app_data_state_dir, use_exc, on_entry=feed.on_entry if feed else None)
+            streamed = feed.streamed if feed else set()
             self.log_ui("Comparaison des arbres...")
             self.update_status_ui("Comparaison...", COL_VERT)
+            self.log_ui("Analyse des fichiers...")
+            self.update_status_ui("Analyse des fichiers...", COL_VERT)
+            local_paths = set(local_tree["files"].keys())
+            cloud_paths = set(cloud_tree["files"].keys())
+            files_to_upload = []
+            paths_to_upload_later = set(paths_to_add := local_paths - cloud_paths)
+            paths_to_delete_later = set(paths_to_delete := cloud_paths - local_paths)
+            paths_to_check = local_paths & cloud_paths
+            if paths_to_add and paths_to_delete and not self.stop_event.is_set():
+                while self.is_paused: time.sleep(0.5)
+                done_new, done_old, renamed, moved = self._apply_moves(paths_to_add, paths_to_delete, local_tree, cloud_tree, workspace_id, is_dry_run)
+                paths_to_upload_later -= done_new
+                paths_to_delete_later -= done_old
+                files_renamed_count += renamed
+                files_moved_count += moved
+            # Dossiers comparés après les déplacements : un dossier déplacé d'un bloc n'est ni créé ni supprimé
             local_folders = local_tree["folders"]
             cloud_folders = set(cloud_tree["folders"].keys())
             folders_to_create = sorted(local_folders - cloud_folders, key=lambda x: x.count("/"))
-            for fp in folders_to_create:
-                if self.app.is_mobile: time.sleep(0.002)
-                if self.stop_event.is_set(): break
-                self.handle_folder_creation(fp, cloud_tree, workspace_id, is_dry_run)
+            # Hors simulation, la création est différée après les uploads (voir _sync_remote_folders)
+            if is_dry_run and not self.stop_event.is_set():
+                self._sync_remote_folders(folders_to_create, set(), cloud_tree, workspace_id, is_dry_run)
             folders_to_delete = sorted(cloud_folders - local_folders, key=lambda x: x.count("/"), reverse=True)
             folders_to_delete_ids = []
             for fp in folders_to_delete:
@@ -752,83 +828,6 @@ class MirrorUploadE2EEManager(LoggerMixin):
                     del cloud_tree["folders"][fp]
                     if is_dry_run: self.log_ui(f"[SIMU] Suppression dossier: {fp}", "red")
                     else: self.log_ui(f"[DEBUG] Suppression dossier: {fp}")
-            self.log_ui("Analyse des fichiers...")
-            self.update_status_ui("Analyse des fichiers...", COL_VERT)
-            local_paths = set(local_tree["files"].keys())
-            cloud_paths = set(cloud_tree["files"].keys())
-            files_to_upload = []
-            renamed_in_place = []
-            paths_to_upload_later = set(paths_to_add := local_paths - cloud_paths)
-            paths_to_delete_later = set(paths_to_delete := cloud_paths - local_paths)
-            paths_to_check = local_paths & cloud_paths
-            local_hashes = {info["partial_hash"]: [] for info in local_tree["files"].values()}
-            for path, info in local_tree["files"].items():
-                 h = info["partial_hash"]
-                 if h not in local_hashes: local_hashes[h] = []
-                 local_hashes[h].append(path)
-            cloud_hashes = {}
-            for path, info in cloud_tree["files"].items():
-                h = info.get("partial_hash")
-                if h:
-                    if h not in cloud_hashes: cloud_hashes[h] = []
-                    cloud_hashes[h].append(path)
-            for new_path in paths_to_add:
-                new_info = local_tree["files"][new_path]
-                new_hash = new_info["partial_hash"]
-                if new_hash in cloud_hashes:
-                    for old_path in cloud_hashes[new_hash]:
-                        if old_path in paths_to_delete_later:
-                            old_info = cloud_tree["files"][old_path]
-                            if old_info["size"] == new_info["size"]:
-                                new_name = sanitize_filename_for_upload(Path(new_path).name)
-                                old_parent = str(Path(old_path).parent)
-                                new_parent = str(Path(new_path).parent)
-                                if old_parent == new_parent:
-                                    if is_dry_run:
-                                         self.log_ui(f"[SIMU] Renommage: {old_path} -> {new_path}", "yellow")
-                                         paths_to_upload_later.remove(new_path)
-                                         paths_to_delete_later.remove(old_path)
-                                         info = cloud_tree["files"].pop(old_path)
-                                         cloud_tree["files"][new_path] = info
-                                    else:
-                                         renamed_in_place.append((old_path, new_path, old_info['id'], new_name))
-                                         paths_to_upload_later.remove(new_path)
-                                         paths_to_delete_later.remove(old_path)
-                                         info = cloud_tree["files"].pop(old_path)
-                                         info['mtime'] = new_info['mtime']
-                                         info['partial_hash'] = new_info['partial_hash']
-                                         cloud_tree["files"][new_path] = info
-                                    break 
-            for old_p, new_p, eid, name in renamed_in_place:
-                if self.app.is_mobile: time.sleep(0.002)
-                if self.stop_event.is_set(): break
-                while self.is_paused: time.sleep(0.5)
-                remote_target_name = name
-                parts = new_p.split("/")
-                raw_filename = parts[-1]
-                is_zk = (self.e2ee_mode == MODE_E2EE_ZK)
-                is_adv = (self.e2ee_mode == MODE_E2EE_ADVANCED)
-                if is_zk:
-                     enc_full_name = E2EE_encrypt_name(raw_filename, self.e2ee_key)
-                     remote_target_name = f"{enc_full_name}.enc"
-                elif is_adv:
-                     p_raw = Path(raw_filename)
-                     base, ext = p_raw.stem, p_raw.suffix
-                     enc = E2EE_encrypt_name(base, self.e2ee_key)
-                     remote_target_name = f"{enc}{ext}"
-                else: 
-                     remote_target_name = sanitize_filename_for_upload(name)
-                if not self.rename_remote_entry(eid, remote_target_name, api_key):
-                    self.log_ui(f"Échec renommage {new_p}", "red")
-                    paths_to_upload_later.add(new_p)
-                    paths_to_delete_later.add(old_p)
-                else:
-                    if str(Path(old_p).parent) == str(Path(new_p).parent):
-                         files_renamed_count += 1
-                         self.log_ui(f"Renommé: {old_p} -> {new_p}", "yellow")
-                    else:
-                         files_moved_count += 1
-                         self.log_ui(f"Déplacé: {old_p} -> {new_p}", "yellow")
             files_to_delete_ids = []
             for p in paths_to_delete_later:
                 if p in cloud_tree["files"]:
@@ -836,60 +835,53 @@ class MirrorUploadE2EEManager(LoggerMixin):
                     del cloud_tree["files"][p]
                     if is_dry_run: self.log_ui(f"[SIMU] Suppression fichier: {p}", "red")
                     else: self.log_ui(f"[DEBUG] Suppr: {p}")
-            for p in paths_to_check:
-                l_info = local_tree["files"][p]
-                c_info = cloud_tree["files"][p]
-                if l_info['size'] != c_info.get('size') or l_info['partial_hash'] != c_info.get('partial_hash'):
-                    self.log_ui(f"Modifié: {p}", "yellow")
-                    files_to_upload.append(p)
-            for p in paths_to_upload_later: files_to_upload.append(p)
+            detector = ChangeDetector(get_change_detection_policy(self.app.config_data, workspace_id), app_data_state_dir, stop_event=self.stop_event)
+            for p in detector.find_changes(paths_to_check, local_tree["files"], cloud_tree["files"]):
+                self.log_ui(f"Modifié: {p}", "yellow")
+                if p not in streamed: files_to_upload.append(p)
+            for p in detector.unchanged:
+                # Contenu identique (hash complet) : seul le mtime a bougé, inutile de revérifier au prochain passage
+                info = cloud_tree["files"][p]
+                info["mtime"] = local_tree["files"][p]["mtime"]
+                cloud_tree["files"][p] = info
+            for p in paths_to_upload_later:
+                if p not in streamed: files_to_upload.append(p)
             if is_dry_run:
                 for p in files_to_upload: self.log_ui(f"[SIMU] Upload: {p}")
                 self.log_ui("--- FIN SIMULATION ---", "yellow")
                 return
-            total = len(files_to_upload)
+            total = len(files_to_upload) + len(streamed)
             
-            save_interval = 5
-            if total > 10000: save_interval = 1000
-            elif total > 2000: save_interval = 200
-            elif total > 200: save_interval = 50
+            # Les points de sauvegarde n'écrivent que le delta : intervalle fixe, indépendant de la taille de l'arbre
+            save_interval = CLOUD_TREE_CHECKPOINT_INTERVAL
             
             self.log_ui(f"Fichiers à uploader: {total} (Sauvegarde état tous les {save_interval})")
-            self.total_size = 0
-            self.total_transferred = 0
-            for p in files_to_upload:
-                self.total_size += local_tree["files"][p]["size"]
             self.update_status_ui(f"Modifications: {total} fichier(s)", COL_VIOLET)
-            upload_queue = Queue()
-            result_queue = Queue()
             for p in files_to_upload:
-                upload_queue.put((p, local_tree["files"][p]))
-            workers = []
-            for i in range(nb_workers):
-                t = threading.Thread(
-                    target=self.upload_worker, 
-                    args=(upload_queue, result_queue, api_key, workspace_id), 
-                    daemon=True, 
-                    name=f"Worker-{i+1}"
-                )
-                t.start()
-                workers.append(t)
+                info = local_tree["files"][p]
+                self._add_total_size(info)
+                upload_queue.put((p, info))
+            feed.close()
             processed = 0
             while processed < total:
                 if self.stop_event.is_set(): break
                 rel_path, res = result_queue.get()
                 processed += 1
                 if res:
+                    if rel_path in detector.content_hashes: res["content_hash"] = detector.content_hashes[rel_path]
                     cloud_tree["files"][rel_path] = res
                     files_success_count += 1
                     total_bytes_uploaded += res.get("size", 0)
                     
                     self.log_ui(f"Succès: {rel_path}")
                     
-                    if processed % save_interval == 0: self.save_local_cloud_tree(cloud_tree, app_data_state_dir)
+                    if processed % save_interval == 0: self.checkpoint_cloud_tree(cloud_tree, app_data_state_dir)
                 else:
                     files_failed_count += 1
                     self.log_ui(f"Échec: {rel_path}", "red")
+            if not self.stop_event.is_set():
+                self._sync_remote_folders(folders_to_create, set(files_to_upload) | streamed, cloud_tree, workspace_id)
+
             all_del_ids = folders_to_delete_ids + files_to_delete_ids
             files_deleted_count = len(all_del_ids)
             if all_del_ids and not self.stop_event.is_set():
@@ -932,6 +924,8 @@ class MirrorUploadE2EEManager(LoggerMixin):
                 }
                 report = self.generate_report(stats, total_time, "TERMINÉ")
                 self.log_ui(f"\n--- BILAN ---\n{report}")
+                conn = self.app.api_client.get_connection_stats()
+                self.log_debug(f"[DEBUG] Connexions API {conn['api']['connections']} / {conn['api']['requests']} req, Stockage {conn['storage']['connections']} / {conn['storage']['requests']} req")
                 async def show_report():
                     await self.app.main_window.dialog(toga.InfoDialog("Rapport", report))
                 asyncio.run_coroutine_threadsafe(show_report(), self.app.loop)
@@ -940,5 +934,11 @@ class MirrorUploadE2EEManager(LoggerMixin):
             import traceback
             traceback.print_exc()
         finally:
+            if feed: feed.close()
+            self._stop_concurrency_tuner(self.upload_tuner)
+            self.upload_tuner = None
+            if self.cloud_tree_store:
+                self.cloud_tree_store.close()
+                self.cloud_tree_store = None
             def _reset(): self._set_ui_running(False)
             self.app.loop.call_soon_threadsafe(_reset)
\ No newline at end of file
@@ -2,9 +2,7 @@
 import json
 import re
 import os
-import fnmatch
 import hashlib
-import concurrent.futures
 from pathlib import Path
 from datetime import datetime
 from typing import Optional, List, Dict, Any, Tuple, Set, Union
@@ -19,8 +17,10 @@ from drimesyncunofficial.constants import (
 
 from drimesyncunofficial.ui_utils import update_logs_threadsafe
 
+from drimesyncunofficial.exclusions import ExclusionMatcher
+from drimesyncunofficial.local_scanner import LocalScanner
 from drimesyncunofficial.format_utils import (
-    truncate_path_smart, format_size, format_display_date,
+    truncate_path_smart, format_size, format_display_date, format_duration,
     sanitize_filename_for_upload, restore_filename_from_download
 )
 import platform
@@ -120,55 +120,18 @@ def get_partial_hash(file_path: Union[str, Path], file_size: int) -> Optional[st
         return m.hexdigest()
     except: return None
 
-def _process_file_worker(file_tuple: Tuple[str, str]) -> Tuple[str, Optional[Dict[str, Any]]]:
-    """Fonction worker exécutée dans un thread séparé pour scanner un fichier."""
-    full_path, rel_path = file_tuple
-    try:
-        p = Path(full_path)
-        st = p.stat()
-        ph = get_partial_hash(p, st.st_size)
-        if ph:
-            return rel_path, {
-                "full_path": str(p), 
-                "size": st.st_size, 
-                "mtime": st.st_mtime, 
-                "partial_hash": ph
-            }
-    except: pass
-    return rel_path, None
-
-def scan_local_tree_parallel(root_folder: str, app_paths: Any, use_exclusions: bool = True, nb_workers: int = 5) -> Dict[str, Any]:
+def scan_local_tree_parallel(root_folder: str, app_paths: Any, use_exclusions: bool = True, nb_workers: int = 5, stop_event: Any = None) -> Dict[str, Any]:
     """
     Scanne récursivement un dossier local pour construire l'arbre de synchronisation.
-    Utilise un ThreadPoolExecutor pour paralléliser le calcul des hashs.
+    S'appuie sur LocalScanner (os.scandir, lectures de dossiers et hashs en parallèle).
     """
     tree = {"folders": set(), "files": {}}
-    exclusions = load_exclusion_patterns(app_paths, use_exclusions)
-    files_to_process = []
-    root_path = Path(root_folder)
-    for root, dirs, files in os.walk(root_folder):
-        for d in dirs[:]:
-            full_dir = Path(root) / d
-            try:
-                rel = str(full_dir.relative_to(root_path)).replace("\\", "/")
-            except ValueError: continue
-            if any(fnmatch.fnmatch(rel, p) for p in exclusions):
-                dirs.remove(d); continue
-            tree["folders"].add(rel)
-        for f in files:
-            full = Path(root) / f
-            try:
-                rel = str(full.relative_to(root_path)).replace("\\", "/")
-            except ValueError: continue
-            if any(fnmatch.fnmatch(rel, p) for p in exclusions): continue
-            files_to_process.append((str(full), rel))
-    actual_workers = max(2, min(nb_workers * 2, 50)) 
-    with concurrent.futures.ThreadPoolExecutor(max_workers=actual_workers) as executor:
-        futures = {executor.submit(_process_file_worker, ft): ft for ft in files_to_process}
-        for future in concurrent.futures.as_completed(futures):
-            res = future.result()
-            if res and res[1]:
-                tree["files"][res[0]] = res[1]
+    exclusions = ExclusionMatcher(load_exclusion_patterns(app_paths, use_exclusions))
+    actual_workers = max(2, min(nb_workers * 2, 50))
+    for item in LocalScanner(root_folder, get_partial_hash, exclusions, stop_event=stop_event, workers=actual_workers).scan():
+        if item.kind == "dir": tree["folders"].add(item.rel)
+        elif item.kind == "file" and item.partial_hash:
+            tree["files"][item.rel] = {"full_path": item.full_path, "size": item.stat.st_size, "mtime": item.stat.st_mtime, "partial_hash": item.partial_hash}
     return tree
 
 def prevent_windows_sleep() -> None:
@@ -1,6 +1,12 @@
 import unittest
 from unittest.mock import MagicMock, patch
-from drimesyncunofficial.api_client import DrimeAPIClient
+import io
+import http.server
+import threading
+import time
+import os
+import tempfile
+from drimesyncunofficial.api_client import DrimeAPIClient, MultipartUploader, BufferPool, MultipartFormStream, RetryPolicy, ThrottleCoordinator, iter_files, EntryMetadataCache, resolve_entries, SegmentedDownloader
 
 class TestDrimeAPIClient(unittest.TestCase):
     def setUp(self):
@@ -32,7 +38,7 @@ class TestDrimeAPIClient(unittest.TestCase):
         # Assuming it exists or the test is ignored if the method is missing.
         if hasattr(self.client, 'create_entry'):
             self.client.create_entry({"name": "test"})
-            self.client.session.post.assert_called_once()
+            self.client.session.request.assert_called_once()
         else:
             pass
 
@@ -81,5 +87,406 @@ class TestDrimeAPIClient(unittest.TestCase):
         self.client.upload_multipart_init.assert_called_once()
         self.client.upload_multipart_complete.assert_called_once()
 
+class TestRetryPolicy(unittest.TestCase):
+    def test_full_jitter_bounds(self):
+        policy = RetryPolicy(base_delay=1.0, max_delay=8.0)
+        for attempt in range(6):
+            for _ in range(50):
+                delay = policy.backoff(attempt)
+                self.assertGreaterEqual(delay, 0)
+                self.assertLessEqual(delay, min(8.0, 2 ** attempt))
+
+    def test_retry_after_header(self):
+        policy = RetryPolicy(max_delay=60.0)
+        self.assertEqual(policy.delay_for(0, MagicMock(headers={"Retry-After": "7"})), 7.0)
+        self.assertEqual(policy.delay_for(0, MagicMock(headers={"Retry-After": "600"})), 60.0)
+        self.assertIsNone(policy.parse_retry_after(MagicMock(headers={})))
+        http_date = policy.parse_retry_after(MagicMock(headers={"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"}))
+        self.assertEqual(http_date, 0.0)
+
+    @patch('drimesyncunofficial.api_client.time.sleep')
+    def test_throttle_is_shared(self, mock_sleep):
+        coordinator = ThrottleCoordinator()
+        policy = RetryPolicy(coordinator=coordinator)
+        policy.sleep(0, MagicMock(status_code=429, headers={"Retry-After": "3"}))
+        # Un autre worker voit la pause globale
+        self.assertGreater(coordinator.remaining(), 2)
+        self.assertEqual(coordinator.events, 1)
+        policy.sleep(0, MagicMock(status_code=500, headers={}))
+        self.assertEqual(coordinator.events, 1)
+
+    @patch('drimesyncunofficial.api_client.time.sleep')
+    def test_request_retries_on_429(self, mock_sleep):
+        client = DrimeAPIClient("fake_key", "http://fake.url")
+        client.retry_policy = RetryPolicy(coordinator=ThrottleCoordinator())
+        client.session = MagicMock()
+        throttled = MagicMock(status_code=429, headers={"Retry-After": "2"})
+        ok = MagicMock(status_code=200)
+        ok.json.return_value = [{"id": "1"}]
+        client.session.request.side_effect = [throttled, throttled, ok]
+        self.assertEqual(client.request_json("GET", "/workspaces"), [{"id": "1"}])
+        self.assertEqual(client.session.request.call_count, 3)
+        self.assertGreaterEqual(sum(c.args[0] for c in mock_sleep.call_args_list), 4)
+
+class TestIterFiles(unittest.TestCase):
+    def test_walks_all_pages_with_metadata(self):
+        client = MagicMock(list_per_page=2)
+        pages = {
+            1: {"data": [{"id": 1}, {"id": 2}], "current_page": 1, "last_page": 3},
+            2: {"data": [{"id": 3}, {"id": 4}], "current_page": 2, "last_page": 3},
+            3: {"data": [{"id": 5}], "current_page": 3, "last_page": 3},
+        }
+        client.list_files.side_effect = lambda params: pages[params.get("page", 1)]
+        ids = [e["id"] for e in iter_files(client, {"workspaceId": "0"})]
+        self.assertEqual(ids, [1, 2, 3, 4, 5])
+        first_params = client.list_files.call_args_list[0].args[0]
+        self.assertEqual(first_params, {"workspaceId": "0", "perPage": 2})
+        self.assertEqual(client.list_files.call_args_list[2].args[0]["page"], 3)
+
+    def test_next_page_key_and_short_page(self):
+        client = MagicMock(list_per_page=None)
+        client.list_files.side_effect = [
+            {"data": [{"id": 1}], "next_page": 2},
+            {"data": [{"id": 2}], "next_page": None},
+        ]
+        self.assertEqual([e["id"] for e in iter_files(client, {})], [1, 2])
+        # Sans métadonnées : une page incomplète est la dernière
+        client = MagicMock()
+        client.list_files.side_effect = [{"data": [{"id": i} for i in range(3)]}, {"data": [{"id": 9}]}]
+        self.assertEqual(len(list(iter_files(client, {}, per_page=3))), 4)
+
+    def test_next_page_is_prefetched(self):
+        client = MagicMock(list_per_page=None)
+        page2_requested = threading.Event()
+        def list_files(params):
+            if params.get("page") == 2:
+                page2_requested.set()
+                return {"data": [{"id": 2}], "next_page": None}
+            return {"data": [{"id": 1}], "next_page": 2}
+        client.list_files.side_effect = list_files
+        it = iter_files(client, {})
+        self.assertEqual(next(it)["id"], 1)
+        # La page 2 est demandée pendant que l'appelant traite encore la page 1
+        self.assertTrue(page2_requested.wait(2))
+        self.assertEqual(next(it)["id"], 2)
+
+class TestConnectionPools(unittest.TestCase):
+    def test_pools_sized_from_workers(self):
+        client = DrimeAPIClient("fake_key", "http://fake.url")
+        client.configure_pools(workers=20, part_workers=4)
+        self.assertEqual(client.session.get_adapter("https://app.drime.cloud")._pool_maxsize, 24)
+        self.assertEqual(client.storage_session.get_adapter("https://s3.example")._pool_maxsize, 80)
+        self.assertNotIn("Authorization", client.storage_session.headers)
+        self.assertIn("Authorization", client.session.headers)
+
+    def test_put_chunk_uses_storage_session(self):
+        client = DrimeAPIClient("fake_key", "http://fake.url")
+        client.session = MagicMock()
+        client.storage_session = MagicMock()
+        client.upload_multipart_put_chunk("https://s3/1", b"data")
+        client.storage_session.put.assert_called_once()
+        client.session.put.assert_not_called()
+
+    def test_connection_stats_show_keep_alive_reuse(self):
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            def do_GET(self):
+                self.send_response(200)
+                self.send_header("Content-Length", "2")
+                self.end_headers()
+                self.wfile.write(b"{}")
+            def log_message(self, *args): pass
+        server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            client = DrimeAPIClient("fake_key", f"http://127.0.0.1:{server.server_port}")
+            for _ in range(3): client.request_json("GET", "/ping")
+            stats = client.get_connection_stats()
+        finally:
+            server.shutdown()
+        self.assertEqual(stats["api"], {"connections": 1, "requests": 3})
+        self.assertEqual(stats["storage"], {"connections": 0, "requests": 0})
+
+class TestMultipartFormStream(unittest.TestCase):
+    def test_body_is_streamed_with_exact_length(self):
+        content = b"0123456789" * 300000
+        progress = []
+        body = MultipartFormStream({"relativePath": "a/b.bin", "workspaceId": "0"}, "file", "b.bin", io.BytesIO(content), len(content), "application/octet-stream", progress.append)
+        chunks = []
+        while True:
+            block = body.read(8192)
+            if not block: break
+            self.assertLessEqual(len(block), 8192)
+            chunks.append(block)
+        raw = b"".join(chunks)
+        self.assertEqual(len(raw), len(body))
+        self.assertIn(b'name="relativePath"\r\n\r\na/b.bin\r\n', raw)
+        self.assertIn(b'filename="b.bin"', raw)
+        self.assertIn(content, raw)
+        self.assertTrue(raw.endswith(f"--{body.boundary}--\r\n".encode()))
+        self.assertEqual(sum(progress), len(content))
+        self.assertLess(len(progress), len(chunks))
+
+    @patch('drimesyncunofficial.api_client.time.sleep')
+    def test_upload_simple_is_resent_after_429_without_double_progress(self, mock_sleep):
+        client = DrimeAPIClient("fake_key", "http://fake.url")
+        client.retry_policy = RetryPolicy(coordinator=ThrottleCoordinator())
+        client.session = MagicMock()
+        bodies = []
+        def request(method, url, **kwargs):
+            bodies.append(kwargs["data"].read())
+            return MagicMock(status_code=429 if len(bodies) == 1 else 200, headers={"Retry-After": "1"})
+        client.session.request.side_effect = request
+        progress = []
+        resp = client.upload_simple_bytes(b"x" * 100, "a.bin", "0", "a.bin", progress_callback=progress.append)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(len(bodies), 2)
+        self.assertEqual(bodies[0], bodies[1])
+        self.assertEqual(sum(progress), 100)
+        self.assertEqual(client.retry_policy.coordinator.events, 1)
+
+    def test_upload_simple_posts_stream(self):
+        client = DrimeAPIClient("fake_key", "http://fake.url")
+        client.session = MagicMock()
+        with patch('builtins.open', unittest.mock.mock_open(read_data=b'data')), patch('os.fstat') as mock_fstat:
+            mock_fstat.return_value.st_size = 4
+            client.upload_simple("/tmp/x.txt", "0", "x.txt")
+        kwargs = client.session.request.call_args.kwargs
+        self.assertNotIn('files', kwargs)
+        self.assertIsInstance(kwargs['data'], MultipartFormStream)
+        self.assertTrue(kwargs['headers']['Content-Type'].startswith("multipart/form-data; boundary="))
+
+class TestMultipartUploader(unittest.TestCase):
+    def _make_client(self, num_parts):
+        client = MagicMock()
+        client.upload_multipart_sign_batch.side_effect = lambda key, uid, nums: MagicMock(
+            status_code=200, json=MagicMock(return_value={"urls": [{"partNumber": n, "url": f"http://s3/{n}"} for n in nums]})
+        )
+        return client
+
+    def test_parts_uploaded_concurrently_and_sorted(self):
+        client = self._make_client(6)
+        active = []
+        peak = []
+        lock = threading.Lock()
+        def put_chunk(url, chunk):
+            with lock:
+                active.append(url)
+                peak.append(len(active))
+            # Les premières parts finissent en dernier
+            time.sleep(0.05 if url.endswith("/1") else 0.01)
+            with lock:
+                active.remove(url)
+            return MagicMock(status_code=200, headers={"ETag": f'"etag-{url[-1]}"'})
+        client.upload_multipart_put_chunk.side_effect = put_chunk
+        uploader = MultipartUploader(client, "key", "uid", chunk_size=4, part_workers=3)
+        parts = uploader.upload(io.BytesIO(b"x" * 22), 22)
+        self.assertEqual([p["PartNumber"] for p in parts], [1, 2, 3, 4, 5, 6])
+        self.assertEqual(parts[0]["ETag"], "etag-1")
+        self.assertGreater(max(peak), 1)
+        self.assertLessEqual(max(peak), 3)
+
+    @patch('drimesyncunofficial.api_client.time.sleep')
+    def test_sign_batch_retries_throttling_and_rejects_unknown_upload(self, mock_sleep):
+        client = self._make_client(2)
+        sign_ok = client.upload_multipart_sign_batch.side_effect
+        responses = [MagicMock(status_code=429, headers={"Retry-After": "1"}), MagicMock(status_code=503, headers={})]
+        client.upload_multipart_sign_batch.side_effect = lambda key, uid, nums: responses.pop(0) if responses else sign_ok(key, uid, nums)
+        client.upload_multipart_put_chunk.return_value = MagicMock(status_code=200, headers={"ETag": "e"})
+        policy = RetryPolicy(coordinator=ThrottleCoordinator())
+        parts = MultipartUploader(client, "key", "uid", chunk_size=4, part_workers=1, retry_policy=policy).upload(io.BytesIO(b"aaaabb"), 6)
+        self.assertEqual(len(parts), 2)
+        self.assertEqual(policy.coordinator.events, 2)
+
+        from drimesyncunofficial.api_client import MultipartSessionError
+        client.upload_multipart_sign_batch.side_effect = None
+        client.upload_multipart_sign_batch.return_value = MagicMock(status_code=404, headers={})
+        with self.assertRaises(MultipartSessionError):
+            MultipartUploader(client, "key", "gone", chunk_size=4, part_workers=1, retry_policy=policy).upload(io.BytesIO(b"aaaa"), 4)
+
+    def test_cancel_stops_submission(self):
+        client = self._make_client(4)
+        client.upload_multipart_put_chunk.return_value = MagicMock(status_code=200, headers={"ETag": "e"})
+        uploader = MultipartUploader(client, "key", "uid", chunk_size=4, part_workers=2, check_status_callback=lambda: False)
+        with self.assertRaises(Exception):
+            uploader.upload(io.BytesIO(b"x" * 16), 16)
+        client.upload_multipart_put_chunk.assert_not_called()
+
+    def test_next_batch_signed_while_uploading(self):
+        client = self._make_client(12)
+        signed = []
+        sign = client.upload_multipart_sign_batch.side_effect
+        def sign_batch(key, uid, nums):
+            signed.append(list(nums))
+            return sign(key, uid, nums)
+        client.upload_multipart_sign_batch.side_effect = sign_batch
+        client.upload_multipart_put_chunk.return_value = MagicMock(status_code=200, headers={"ETag": "e"})
+        uploader = MultipartUploader(client, "key", "uid", chunk_size=1, part_workers=1)
+        parts = uploader.upload(io.BytesIO(b"x" * 12), 12)
+        self.assertEqual(len(parts), 12)
+        self.assertEqual(signed, [list(range(1, 11)), [11, 12]])
+
+    def test_expired_urls_are_resigned(self):
+        client = self._make_client(2)
+        client.upload_multipart_put_chunk.return_value = MagicMock(status_code=200, headers={"ETag": "e"})
+        uploader = MultipartUploader(client, "key", "uid", chunk_size=4, part_workers=1, url_max_age=0)
+        uploader.upload(io.BytesIO(b"x" * 8), 8)
+        # Signature initiale + re-signature de chaque part avant envoi
+        calls = [c.args[2] for c in client.upload_multipart_sign_batch.call_args_list]
+        self.assertEqual(calls, [[1, 2], [1, 2], [2]])
+
+    def test_forbidden_part_is_resigned(self):
+        client = self._make_client(1)
+        client.upload_multipart_put_chunk.side_effect = [
+            MagicMock(status_code=403, headers={}),
+            MagicMock(status_code=200, headers={"ETag": "e"}),
+        ]
+        uploader = MultipartUploader(client, "key", "uid", chunk_size=4, part_workers=1)
+        parts = uploader.upload(io.BytesIO(b"x" * 4), 4)
+        self.assertEqual(parts, [{"PartNumber": 1, "ETag": "e"}])
+        self.assertEqual(client.upload_multipart_sign_batch.call_count, 2)
+
+    def test_part_buffers_are_recycled(self):
+        client = self._make_client(6)
+        seen = []
+        def put_chunk(url, chunk):
+            self.assertIsInstance(chunk, memoryview)
+            seen.append((id(chunk.obj), bytes(chunk)))
+            return MagicMock(status_code=200, headers={"ETag": "e"})
+        client.upload_multipart_put_chunk.side_effect = put_chunk
+        pool = BufferPool()
+        uploader = MultipartUploader(client, "key", "uid", chunk_size=4, part_workers=2, buffer_pool=pool)
+        uploader.upload(io.BytesIO(b"aaaabbbbccccddddeeeeff"), 22)
+        self.assertEqual(sorted(data for _, data in seen), [b"aaaa", b"bbbb", b"cccc", b"dddd", b"eeee", b"ff"])
+        # Au plus part_workers buffers alloués pour tout le fichier
+        self.assertLessEqual(len({buf_id for buf_id, _ in seen}), 2)
+        self.assertEqual(pool.idle_bytes, 4 * len({buf_id for buf_id, _ in seen}))
+
+    def test_buffer_pool_idle_memory_is_capped_in_bytes(self):
+        pool = BufferPool(max_idle_bytes=10)
+        bufs = [pool.acquire(4) for _ in range(3)]
+        for buf in bufs: pool.release(buf)
+        # 2 buffers de 4 octets conservés, le troisième dépasserait le plafond
+        self.assertEqual(pool.idle_bytes, 8)
+        self.assertIs(pool.acquire(4), bufs[1])
+        self.assertEqual(pool.idle_bytes, 4)
+
+class TestEntryMetadataCache(unittest.TestCase):
+    def test_lru_eviction_and_ttl(self):
+        cache = EntryMetadataCache(max_size=2, ttl=60)
+        cache.remember([{"id": 1, "hash": "h1", "size": 1}, {"id": 2, "hash": "h2"}, {"id": 3, "type": "folder"}])
+        self.assertEqual(cache.get("1")["hash"], "h1")
+        cache.put("4", {"hash": "h4"})
+        self.assertIsNone(cache.get("2"))  # le moins récemment utilisé est évincé
+        self.assertEqual(cache.get(1)["hash"], "h1")
+        cache.ttl = -1
+        self.assertIsNone(cache.get("1"))
+
+    def test_resolve_entries_batches_and_caches(self):
+        cache = EntryMetadataCache()
+        cache.put("cached", {"hash": "hc", "size": 0, "updated_at": None})
+        client = MagicMock()
+        lock = threading.Lock()
+        state = {"active": 0, "peak": 0}
+        def get_file_entry(entry_id):
+            with lock:
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+            threading.Event().wait(0.05)
+            with lock: state["active"] -= 1
+            if entry_id == "missing": return MagicMock(status_code=404)
+            return MagicMock(status_code=200, json=MagicMock(return_value={"fileEntry": {"hash": f"h-{entry_id}", "file_size": 3}}))
+        client.get_file_entry.side_effect = get_file_entry
+
+        ids = ["cached", "a", "b", "c", "a", "missing"]
+        res = resolve_entries(client, ids, cache=cache, workers=4)
+        self.assertEqual({k: v["hash"] for k, v in res.items()}, {"cached": "hc", "a": "h-a", "b": "h-b", "c": "h-c"})
+        self.assertEqual(client.get_file_entry.call_count, 4)
+        self.assertGreater(state["peak"], 1)
+
+        client.get_file_entry.reset_mock()
+        resolve_entries(client, ["a", "b"], cache=cache)
+        client.get_file_entry.assert_not_called()
+
+class TestSegmentedDownloader(unittest.TestCase):
+    BLOB = bytes(range(256)) * 4000
+
+    def _serve(self, honour_range):
+        blob = self.BLOB
+        ranges = []
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            def do_GET(self):
+                if self.path == "/dl":
+                    self.send_response(302)
+                    self.send_header("Location", f"http://127.0.0.1:{self.server.server_port}/blob")
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                rng = self.headers.get("Range")
+                if rng and honour_range:
+                    start, end = rng.split("=")[1].split("-")
+                    start, end = int(start), int(end or len(blob) - 1)
+                    ranges.append((start, end))
+                    body = blob[start:end + 1]
+                    self.send_response(206)
+                    self.send_header("Content-Range", f"bytes {start}-{end}/{len(blob)}")
+                else:
+                    body = blob
+                    self.send_response(200)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            def log_message(self, *args): pass
+        server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.shutdown)
+        return DrimeAPIClient("fake_key", f"http://127.0.0.1:{server.server_port}"), f"http://127.0.0.1:{server.server_port}/dl", ranges
+
+    def _download(self, client, url, **kwargs):
+        fd, path = tempfile.mkstemp()
+        os.close(fd)
+        self.addCleanup(os.remove, path)
+        progress = []
+        downloader = SegmentedDownloader(client, url, len(self.BLOB), segment_size=100000, workers=4, progress_callback=progress.append, **kwargs)
+        written = downloader.download(path)
+        with open(path, "rb") as f: content = f.read()
+        return downloader, written, content, sum(progress)
+
+    def test_ranges_fetched_concurrently_into_preallocated_file(self):
+        client, url, ranges = self._serve(honour_range=True)
+        downloader, written, content, progress = self._download(client, url)
+        self.assertTrue(downloader.segmented)
+        self.assertEqual(content, self.BLOB)
+        self.assertEqual(written, progress)
+        self.assertEqual(sorted(ranges), downloader.segments())
+
+    def test_falls_back_to_single_stream_without_range_support(self):
+        client, url, ranges = self._serve(honour_range=False)
+        downloader, written, content, progress = self._download(client, url)
+        self.assertFalse(downloader.segmented)
+        self.assertEqual(content, self.BLOB)
+        self.assertEqual(written, len(self.BLOB))
+
+    def test_completed_segments_are_skipped(self):
+        client, url, ranges = self._serve(honour_range=True)
+        fd, path = tempfile.mkstemp()
+        os.close(fd)
+        self.addCleanup(os.remove, path)
+        with open(path, "wb") as f: f.write(self.BLOB[:200000] + b"\0" * (len(self.BLOB) - 200000))
+        done = []
+        downloader = SegmentedDownloader(client, url, len(self.BLOB), segment_size=100000, workers=4,
+                                         completed_segments=[0, 100000], segment_done_callback=done.append)
+        downloader.download(path)
+        with open(path, "rb") as f: self.assertEqual(f.read(), self.BLOB)
+        self.assertNotIn(0, [r[0] for r in ranges])
+        self.assertEqual(sorted(done), [start for start, _ in downloader.segments()][2:])
+
+    def test_cancel_aborts(self):
+        client, url, _ = self._serve(honour_range=True)
+        from drimesyncunofficial.api_client import DrimeClientError
+        with self.assertRaises(DrimeClientError):
+            self._download(client, url, check_status_callback=lambda: False)
+
 if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+    unittest.main()
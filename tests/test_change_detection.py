@@ -0,0 +1,68 @@
+import os
+import sqlite3
+import sys
+from unittest.mock import MagicMock
+if 'toga' not in sys.modules: sys.modules['toga'] = MagicMock()
+
+from drimesyncunofficial.change_detection import (
+    ChangeDetector, full_content_hash, get_change_detection_policy, set_change_detection_policy
+)
+from drimesyncunofficial.constants import SCAN_INDEX_FILE_NAME
+from drimesyncunofficial.scan_index import ScanIndex
+
+
+def _setup(tmp_path, content=b"A" * 20000):
+    f = tmp_path / "big.bin"
+    f.write_bytes(content)
+    ref = full_content_hash(str(f))
+    # Modification au milieu du fichier : taille et hash partiel (début/fin) inchangés
+    f.write_bytes(content[:10000] + b"B" + content[10001:])
+    st = os.stat(f)
+    local = {"big.bin": {"full_path": str(f), "size": st.st_size, "mtime": st.st_mtime, "partial_hash": "p"}}
+    cloud = {"big.bin": {"size": st.st_size, "mtime": st.st_mtime - 10, "partial_hash": "p", "content_hash": ref}}
+    return f, st, local, cloud
+
+
+def test_policies_decide_mtime_only_changes(tmp_path):
+    f, st, local, cloud = _setup(tmp_path)
+    assert ChangeDetector("partial").find_changes(["big.bin"], local, cloud) == []
+    assert ChangeDetector("stat").find_changes(["big.bin"], local, cloud) == ["big.bin"]
+    detector = ChangeDetector("full", str(tmp_path))
+    assert detector.find_changes(["big.bin"], local, cloud) == ["big.bin"]
+    assert detector.content_hashes["big.bin"] == full_content_hash(str(f)) != cloud["big.bin"]["content_hash"]
+    cloud["big.bin"]["content_hash"] = detector.content_hashes["big.bin"]
+    same = ChangeDetector("full", str(tmp_path))
+    assert same.find_changes(["big.bin"], local, cloud) == [] and same.unchanged == ["big.bin"]
+
+
+def test_full_hash_is_cached_in_scan_index(tmp_path):
+    f, st, local, cloud = _setup(tmp_path)
+    index = ScanIndex(str(tmp_path))
+    index.update(str(f), st, "p")
+    index.close()
+    first = ChangeDetector("full", str(tmp_path))
+    first.find_changes(["big.bin"], local, cloud)
+    second = ChangeDetector("full", str(tmp_path))
+    second.find_changes(["big.bin"], local, cloud)
+    assert (first.full_hashed, second.full_hashed) == (1, 0)
+    assert second.content_hashes == first.content_hashes
+
+
+def test_scan_index_adds_full_hash_column_to_old_databases(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / SCAN_INDEX_FILE_NAME))
+    conn.execute("CREATE TABLE files (path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, ino INTEGER, dev INTEGER, partial_hash TEXT)")
+    conn.commit(); conn.close()
+    f = tmp_path / "a.txt"; f.write_text("x")
+    index = ScanIndex(str(tmp_path))
+    index.update(str(f), os.stat(f), "p")
+    index.update_full(str(f), os.stat(f), "b2:ff")
+    assert index.lookup(str(f), os.stat(f)) == "p" and index.lookup_full(str(f), os.stat(f)) == "b2:ff"
+    index.close()
+
+
+def test_policy_is_stored_per_workspace():
+    config = {}
+    assert get_change_detection_policy(config, "12") == "partial"
+    set_change_detection_policy(config, 12, "full")
+    set_change_detection_policy(config, "12", "bogus")
+    assert get_change_detection_policy(config, "12") == "full" and get_change_detection_policy(config, "0") == "partial"
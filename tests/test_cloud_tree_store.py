@@ -0,0 +1,73 @@
+import os
+import json
+import sqlite3
+import sys
+from unittest.mock import MagicMock
+
+if 'toga' not in sys.modules: sys.modules['toga'] = MagicMock()
+
+from drimesyncunofficial.cloud_tree_store import CloudTreeStore, TrackedDict
+from drimesyncunofficial.uploads_mirror import MirrorUploadManager
+
+
+def _rows(state_dir):
+    conn = sqlite3.connect(str(state_dir / "00_drime_cloud_tree.sqlite"))
+    rows = conn.execute("SELECT kind, rkey FROM entries ORDER BY kind, rkey").fetchall()
+    conn.close()
+    return rows
+
+
+def test_commit_writes_only_delta(tmp_path):
+    store = CloudTreeStore(str(tmp_path))
+    tree = store.adopt({"folders": {"A": {"id": 1}}, "files": {"A/x": {"id": 2}, "A/y": {"id": 3}}})
+    assert isinstance(tree["folders"], TrackedDict) and not tree["files"].dirty
+
+    tree["files"]["A/z"] = {"id": 4}
+    del tree["files"]["A/x"]
+    tree["files"]["A/w"] = tree["files"].pop("A/y")
+    assert tree["files"].dirty == {"A/z", "A/x", "A/y", "A/w"}
+    assert store.commit(tree)
+    assert not tree["files"].dirty
+    store.close()
+
+    reloaded = CloudTreeStore(str(tmp_path)).load()
+    assert reloaded == {"folders": {"A": {"id": 1}}, "files": {"A/z": {"id": 4}, "A/w": {"id": 3}}}
+
+
+def test_encrypted_store_hides_names_and_rejects_wrong_key(tmp_path):
+    key = os.urandom(32)
+    store = CloudTreeStore(str(tmp_path), key)
+    store.adopt({"folders": {}, "files": {"secret/report.pdf": {"id": 1}}})
+    store.close()
+    raw = (tmp_path / "00_drime_cloud_tree.sqlite").read_bytes()
+    assert b"report.pdf" not in raw
+
+    assert CloudTreeStore(str(tmp_path), key).load()["files"] == {"secret/report.pdf": {"id": 1}}
+    assert CloudTreeStore(str(tmp_path), os.urandom(32)).load() is None
+
+
+def test_manager_migrates_json_and_checkpoints(tmp_path):
+    legacy = {"folders": {"A": {"id": "f1"}}, "files": {"A/a.txt": {"id": "1", "size": 3}}}
+    (tmp_path / "00_drime_cloud_tree.json").write_text(json.dumps(legacy))
+    manager = MirrorUploadManager(MagicMock())
+    manager.log_ui = MagicMock()
+
+    tree = manager.load_local_cloud_tree(str(tmp_path), "key", "0")
+    assert tree == legacy
+    assert len(_rows(tmp_path)) == 2
+
+    tree["files"]["A/b.txt"] = {"id": "2", "size": 4}
+    manager.checkpoint_cloud_tree(tree, str(tmp_path))
+    # Le point de sauvegarde ne réécrit pas l'instantané JSON
+    assert json.loads((tmp_path / "00_drime_cloud_tree.json").read_text()) == legacy
+    manager.cloud_tree_store.close()
+
+    (tmp_path / "00_drime_cloud_tree.json").unlink()
+    tree = manager.load_local_cloud_tree(str(tmp_path), "key", "0")
+    assert set(tree["files"]) == {"A/a.txt", "A/b.txt"}
+    manager.save_local_cloud_tree(tree, str(tmp_path))
+    assert set(json.loads((tmp_path / "00_drime_cloud_tree.json").read_text())["files"]) == {"A/a.txt", "A/b.txt"}
+    manager.cloud_tree_store.close()
+
+    assert CloudTreeStore.remove(str(tmp_path))
+    assert not (tmp_path / "00_drime_cloud_tree.sqlite").exists()
@@ -0,0 +1,60 @@
+import os
+import hashlib
+import tracemalloc
+
+from drimesyncunofficial.compact_tree import FileTable, HashIndex
+
+
+def _h(i):
+    return hashlib.md5(str(i).encode()).hexdigest()
+
+
+def test_file_table_behaves_like_dict(tmp_path):
+    table = FileTable(str(tmp_path))
+    table["a.txt"] = {"full_path": os.path.join(str(tmp_path), "a.txt"), "size": 3, "mtime": 1.5, "partial_hash": _h(1)}
+    table["sub/b.txt"] = {"id": 7, "size": 0, "partial_hash": None, "extra": "x"}
+
+    assert len(table) == 2 and "sub/b.txt" in table and "sub" not in table
+    assert table["a.txt"] == {"full_path": os.path.join(str(tmp_path), "a.txt"), "size": 3, "mtime": 1.5, "partial_hash": _h(1)}
+    assert table["sub/b.txt"] == {"full_path": os.path.join(str(tmp_path), "sub", "b.txt"), "size": 0, "partial_hash": None, "id": 7, "extra": "x"}
+
+    table["sub/c.txt"] = table.pop("sub/b.txt")
+    assert sorted(table) == ["a.txt", "sub/c.txt"]
+    assert table["sub/c.txt"]["id"] == 7
+    del table["a.txt"]
+    assert list(table.keys()) == ["sub/c.txt"]
+
+
+def test_hash_lookup_follows_mutations():
+    table = FileTable(track=True)
+    table["x/1.bin"] = {"partial_hash": _h(1), "size": 1}
+    table["y/2.bin"] = {"partial_hash": _h(1), "size": 1}
+    index = HashIndex(table)
+    assert sorted(index[_h(1)]) == ["x/1.bin", "y/2.bin"]
+
+    table["z/3.bin"] = table.pop("x/1.bin")
+    assert sorted(index[_h(1)]) == ["y/2.bin", "z/3.bin"]
+    assert _h(2) not in index
+    assert table.dirty == {"x/1.bin", "y/2.bin", "z/3.bin"}
+
+    legacy = HashIndex({"p": {"partial_hash": "abc"}})
+    assert legacy["abc"] == ["p"] and "zzz" not in legacy
+
+
+def test_file_table_memory_is_smaller_than_dicts():
+    def entries():
+        for i in range(20000):
+            rel = f"photos/{2000 + i % 20}/album_{i % 300:03d}/IMG_{i:07d}.jpg"
+            yield rel, {"full_path": "/home/user/Sync/" + rel, "size": i * 1000, "mtime": 1.7e9 + i, "partial_hash": _h(i)}
+
+    tracemalloc.start()
+    plain = dict(entries())
+    plain_size = tracemalloc.get_traced_memory()[0]
+    del plain
+    tracemalloc.stop()
+    tracemalloc.start()
+    table = FileTable("/home/user/Sync")
+    for k, v in entries(): table[k] = v
+    table_size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    assert table_size * 2.5 < plain_size
@@ -0,0 +1,112 @@
+import sys
+from unittest.mock import MagicMock, patch
+if 'toga' not in sys.modules: sys.modules['toga'] = MagicMock()
+
+from drimesyncunofficial.concurrency_tuner import AimdController, ConcurrencyTuningStore, TUNING_UPLOAD, network_id
+from drimesyncunofficial.constants import CONF_KEY_AUTOTUNE
+from drimesyncunofficial.mixins import ConcurrencyTuningMixin, LoggerMixin
+
+
+class _Clock:
+    def __init__(self): self.now = 0.0
+    def __call__(self): return self.now
+
+
+def _controller(initial=2, maximum=8, **kwargs):
+    clock, sent, events = _Clock(), [0], [0]
+    tuner = AimdController(initial, maximum=maximum, progress=lambda: sent[0], throttle_events=lambda: events[0],
+                           window=1.0, clock=clock, **kwargs)
+    def window(throughput, completed=0, errors=0, latency=1.0):
+        while tuner.try_acquire(): pass   # pool saturé
+        for _ in range(completed): tuner.record(1024 * 1024, latency)
+        for _ in range(errors): tuner.record(0, 1.0, ok=False)
+        sent[0] += throughput; clock.now += 1.0
+        limit = tuner.evaluate()
+        for _ in range(tuner.active): tuner.release()
+        return limit
+    return tuner, window, events
+
+
+def test_ramps_up_while_throughput_improves_then_holds():
+    tuner, window, _ = _controller()
+    assert [window(t) for t in (100, 200, 300, 305, 306)] == [3, 4, 5, 5, 5]
+    assert tuner.best_limit == 5 and [r for _, _, r in tuner.history] == ["increase"] * 3 + ["hold"] * 2
+
+
+def test_backs_off_on_throttling_errors_and_latency_spikes():
+    tuner, window, events = _controller(initial=8)
+    events[0] += 1
+    assert window(500) == 4
+    assert window(400, completed=10, errors=2) == 2
+    window(300, completed=5, latency=1.0)
+    assert window(300, completed=5, latency=5.0) == 1
+    assert [r for _, _, r in tuner.history] == ["throttled", "errors", "increase", "latency"]
+
+
+def test_unsaturated_pool_does_not_grow_and_stop_persists_best_level():
+    saved = []
+    tuner, window, _ = _controller(initial=3, persist=saved.append)
+    window(100); window(200)
+    assert tuner.limit == 5
+    tuner.clock.now += 1.0
+    tuner.progress = lambda: 10 ** 6
+    assert tuner.evaluate() == 5   # débit en hausse mais aucune place occupée : palier
+    assert tuner.stop() == 5 and saved == [5]
+
+
+def test_level_is_stored_per_workspace_and_network(tmp_path):
+    class Manager(LoggerMixin, ConcurrencyTuningMixin):
+        def __init__(self):
+            self.app = MagicMock()
+            self.app.config_data = {}
+            self.app.paths.data = str(tmp_path)
+    manager = Manager()
+    # Sans option explicite, le réglage de l'utilisateur reste le plafond
+    fixed = manager._start_concurrency_tuner(TUNING_UPLOAD, "42", 3, lambda: 0)
+    assert fixed.minimum == fixed.maximum == fixed.limit == 3
+    manager.app.config_data[CONF_KEY_AUTOTUNE] = True
+    ConcurrencyTuningStore(tmp_path).set(ConcurrencyTuningStore.key("42", "10.0.0.0/24"), TUNING_UPLOAD, 7)
+    with patch("drimesyncunofficial.mixins.network_id", return_value="10.0.0.0/24"):
+        tuner = manager._start_concurrency_tuner(TUNING_UPLOAD, "42", 3, lambda: 0)
+        other = manager._start_concurrency_tuner(TUNING_UPLOAD, "43", 3, lambda: 0)
+    assert (tuner.limit, other.limit) == (7, 3)
+    tuner.stop(); other.stop()
+
+
+def test_network_id_is_cached():
+    with patch("drimesyncunofficial.concurrency_tuner.socket.getaddrinfo", side_effect=OSError) as lookup:
+        assert network_id("https://cache-test.invalid") == network_id("https://cache-test.invalid") == "default"
+    assert lookup.call_count == 1
+
+
+def test_async_waiters_sleep_until_a_slot_is_released_or_the_limit_grows():
+    import asyncio
+    import threading
+    tuner, window, _ = _controller(initial=1)
+    assert tuner.try_acquire()
+    entered = []
+
+    async def consumer(name, gate):
+        async with tuner:
+            entered.append(name)
+            await gate.wait()
+
+    async def scenario():
+        gate = asyncio.Event()
+        tasks = [asyncio.create_task(consumer(n, gate)) for n in ("a", "b", "c")]
+        await asyncio.sleep(0.05)
+        assert entered == [] and len(tuner._async_waiters) == 3   # en attente, sans polling
+        threading.Thread(target=tuner.release).start()             # place rendue par un worker
+        await asyncio.sleep(0.05)
+        assert entered == ["a"] and len(tuner._async_waiters) == 2
+        tasks[2].cancel()
+        await asyncio.sleep(0.05)
+        assert len(tuner._async_waiters) == 1
+        with tuner._cond: tuner.limit = 2; tuner._wake_async(1)     # hausse de la limite
+        await asyncio.sleep(0.05)
+        assert entered == ["a", "b"] and tuner.active == 2
+        gate.set()
+        await asyncio.gather(*tasks[:2])
+        assert tuner.active == 0
+
+    asyncio.run(scenario())
@@ -0,0 +1,74 @@
+import os
+import sys
+from unittest.mock import MagicMock
+
+if 'toga' not in sys.modules:
+    sys.modules['toga'] = MagicMock()
+
+from drimesyncunofficial.download_resume import PartialDownload
+from drimesyncunofficial.downloads_workspace import WorkspaceDownloadManager
+
+BLOB = b"0123456789" * 1000
+
+
+def _manager():
+    app = MagicMock()
+    app.config_data = {'workers': 2}
+    app.is_mobile = False
+    manager = WorkspaceDownloadManager(app)
+    manager.is_cancelled = False
+    manager.is_paused = False
+    manager.total_downloaded_bytes = 0
+    return manager
+
+
+def _range_stream(url, start=0):
+    body = BLOB[start:]
+    r = MagicMock(status_code=206 if start else 200)
+    r.headers = {"content-length": str(len(body))}
+    if start: r.headers["Content-Range"] = f"bytes {start}-{len(BLOB) - 1}/{len(BLOB)}"
+    r.iter_content.return_value = [body[i:i + 1000] for i in range(0, len(body), 1000)]
+    r.__enter__.return_value = r
+    return r
+
+
+def test_record_ignored_when_source_changes(tmp_path):
+    save = str(tmp_path / "a.bin")
+    partial = PartialDownload(save, "http://api/dl/h1", 10)
+    partial.begin("stream")
+    assert PartialDownload(save, "http://api/dl/h1", 10).record["mode"] == "stream"
+    assert PartialDownload(save, "http://api/dl/h2", 10).record is None
+    assert PartialDownload(save, "http://api/dl/h1", 11).record is None
+
+
+def test_worker_resumes_part_file_with_range(tmp_path):
+    save = str(tmp_path / "big.bin")
+    partial = PartialDownload(save, "http://api/dl/h", len(BLOB))
+    partial.begin("stream")
+    with open(partial.part_path, "wb") as f: f.write(BLOB[:4000])
+
+    manager = _manager()
+    manager.app.api_client.get_download_stream.side_effect = _range_stream
+    ok, msg, _ = manager._download_file_worker("http://api/dl/h", save, "big.bin", len(BLOB))
+
+    assert ok, msg
+    manager.app.api_client.get_download_stream.assert_called_once_with("http://api/dl/h", start=4000)
+    with open(save, "rb") as f: assert f.read() == BLOB
+    assert not os.path.exists(partial.part_path) and not os.path.exists(partial.record_path)
+    assert manager.total_downloaded_bytes == len(BLOB)
+
+
+def test_truncated_download_is_not_renamed(tmp_path):
+    save = str(tmp_path / "short.bin")
+    def short_stream(url, start=0):
+        r = _range_stream(url, start)
+        r.iter_content.return_value = r.iter_content.return_value[:3]
+        return r
+    manager = _manager()
+    manager.app.api_client.get_download_stream.side_effect = short_stream
+    manager._stream_to_part("http://api/dl/h", PartialDownload(save, "http://api/dl/h", len(BLOB)), [0])
+
+    # Tentative interrompue : le .part reste disponible pour la reprise, la destination n'existe pas
+    assert not os.path.exists(save)
+    assert os.path.getsize(save + ".part") == 3000
+    assert PartialDownload(save, "http://api/dl/h", len(BLOB)).stream_offset() == 3000
@@ -49,7 +49,7 @@ class TestDownloadsE2EEMock:
         # Mock Response Context Manager
         mock_response = MagicMock()
         mock_response.status_code = 200
-        mock_response.iter_content.return_value = [b"encrypted_chunk"]
+        mock_response.iter_content.return_value = [b"encrypted_chunk".ljust(100, b"\0")]
         mock_response.headers = {'content-length': '100'}
         
         manager.app.api_client.get_download_stream.return_value.__enter__.return_value = mock_response
@@ -90,7 +90,7 @@ class TestDownloadsE2EEMock:
         # Mock Response
         mock_response = MagicMock()
         mock_response.status_code = 200
-        mock_response.iter_content.return_value = [b"bad_chunk"]
+        mock_response.iter_content.return_value = [b"bad_chunk".ljust(100, b"\0")]
         mock_response.headers = {'content-length': '100'}
         manager.app.api_client.get_download_stream.return_value.__enter__.return_value = mock_response
 
@@ -76,17 +76,19 @@ class TestDownloadsManual:
     def test_download_file_worker(self, manager):
         mock_resp = MagicMock()
         mock_resp.status_code = 200
-        mock_resp.headers = {'content-length': '1024'}
+        mock_resp.headers = {'content-length': '12'}
         mock_resp.iter_content.return_value = [b'chunk1', b'chunk2']
         mock_resp.__enter__.return_value = mock_resp
         async def run_test():
             manager.app.api_client.get_download_stream.return_value = mock_resp
             # Patch ensure_long_path_aware to return path as-is to avoid Windows \\?\ prefix issues in tests
             with patch('drimesyncunofficial.base_download_manager.ensure_long_path_aware', side_effect=lambda x: x):
-                with patch('builtins.open', mock_open()) as mock_file:
+                with patch('builtins.open', mock_open()) as mock_file, patch('os.replace') as mock_replace:
                      # os.stat not used in new implementation, can remove patch or keep ignored
-                     manager._download_file_worker("http://test/download", "/tmp/file", "file.txt", 1024)
-                     mock_file.assert_called_with("/tmp/file", "wb")
+                     manager._download_file_worker("http://test/download", "/tmp/file", "file.txt", 12)
+                     # Écriture dans le .part, renommé après validation de la taille
+                     mock_file.assert_called_with("/tmp/file.part", "wb")
+                     mock_replace.assert_called_with("/tmp/file.part", "/tmp/file")
                      mock_file().write.assert_called()
         asyncio.run(run_test())
 if __name__ == "__main__":
@@ -55,7 +55,7 @@ class TestDownloadsManualE2EE:
     def test_download_file_worker(self, manager):
         mock_resp = MagicMock()
         mock_resp.status_code = 200
-        mock_resp.iter_content.return_value = [b"encrypted_content"]
+        mock_resp.iter_content.return_value = [b"encrypted_content".ljust(100, b"\0")]
         mock_resp.headers = {'content-length': '100'}
         mock_resp.headers = {'content-length': '100'}
         mock_resp.__enter__.return_value = mock_resp
@@ -55,22 +55,86 @@ def test_collect_tasks_recursive(mock_app):
             assert mock_app.api_client.list_files.call_count == 2
     asyncio.run(run_test())
 
+def test_crawl_is_breadth_first_concurrent_and_lazy(mock_app, tmp_path):
+    import threading
+    tree = {
+        "0": [{"id": f"d{i}", "name": f"dir{i}", "type": "folder"} for i in range(6)],
+        **{f"d{i}": [{"id": f"f{i}", "name": f"file{i}.txt", "type": "file", "size": 1, "hash": f"h{i}"}] for i in range(5)},
+        "d5": [],
+    }
+    state = {"active": 0, "peak": 0}
+    lock = threading.Lock()
+    pause = threading.Event()
+    def list_files(params):
+        with lock:
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+        pause.wait(0.05)
+        with lock: state["active"] -= 1
+        return {"data": tree[params["folderId"]]}
+    mock_app.api_client.list_files.side_effect = list_files
+    mock_app.api_client.list_per_page = 100
+    mock_app.api_client.api_base_url = "http://api"
+
+    async def run_test():
+        manager = WorkspaceDownloadManager(mock_app)
+        manager.is_cancelled = False
+        tasks = []
+        await manager.collect_tasks_recursive("0", "root", str(tmp_path), "1", tasks)
+        return tasks
+
+    # D'autres modules de test remplacent asyncio.get_running_loop sans le restaurer
+    with patch('asyncio.get_running_loop', asyncio.events.get_running_loop):
+        tasks = asyncio.run(run_test())
+    assert sorted(t["name"] for t in tasks) == [f"file{i}.txt" for i in range(5)]
+    assert state["peak"] > 1
+    # Création paresseuse : seuls les dossiers distants vides sont créés pendant le parcours
+    assert not (tmp_path / "root" / "dir0").exists()
+    assert (tmp_path / "root" / "dir5").is_dir()
+
+def test_pipeline_is_bounded_with_fixed_workers():
+    from drimesyncunofficial.base_download_manager import _DownloadPipeline
+    state = {"active": 0, "peak": 0, "max_queue": 0}
+
+    async def worker(task):
+        state["active"] += 1
+        state["peak"] = max(state["peak"], state["active"])
+        await asyncio.sleep(0.001)
+        state["active"] -= 1
+        return {"status": "success" if task % 7 else "failed"}
+
+    async def run_test():
+        pipeline = _DownloadPipeline(worker, 3, 4, accept=lambda t: t != 0)
+        for i in range(60):
+            await pipeline.put(i)
+            state["max_queue"] = max(state["max_queue"], pipeline.queue.qsize())
+        await pipeline.close()
+        return pipeline
+
+    with patch('asyncio.get_running_loop', asyncio.events.get_running_loop):
+        pipeline = asyncio.run(run_test())
+    assert pipeline.discovered == 60 and pipeline.queued == 59
+    assert pipeline.success + pipeline.failed == 59 and pipeline.failed == 8
+    assert state["peak"] == 3
+    assert state["max_queue"] <= 4
+
 def test_download_file_worker(mock_app):
     manager = WorkspaceDownloadManager(mock_app)
     manager.lbl_progress = MagicMock()
     mock_resp = MagicMock()
     mock_resp.status_code = 200
-    mock_resp.headers = {'content-length': '1024'}
+    mock_resp.headers = {'content-length': '12'}
     mock_resp.iter_content.return_value = [b'chunk1', b'chunk2']
     mock_resp.__enter__.return_value = mock_resp
     mock_resp.__exit__.return_value = None
     mock_app.api_client.get_download_stream.return_value = mock_resp
     with patch('builtins.open', mock_open()) as mock_file, \
+         patch('os.replace'), \
          patch('pathlib.Path.unlink'):
         success, msg, size = manager._download_file_worker("http://url", "/tmp/file.txt", "file.txt", 0)
         assert success is True
         assert size == 0 # passed 0, returns 0
-        mock_app.api_client.get_download_stream.assert_called_once_with("http://url")
+        mock_app.api_client.get_download_stream.assert_called_once_with("http://url", start=0)
         mock_file().write.assert_called()
 
 if __name__ == "__main__":
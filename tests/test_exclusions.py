@@ -0,0 +1,25 @@
+import fnmatch
+
+from drimesyncunofficial.exclusions import ExclusionMatcher
+
+DEFAULTS = ["Thumbs.db", "desktop.ini", ".DS_Store", "._*", "*.tmp", "*.temp", "*.bak", "*.log", "*.swp", "~$*",
+            "*.trashed*", "*.thumbnail*", "__pycache__/", ".git/", "node_modules/", ".env"]
+EXTRA = ["excluded_dir", "excluded_dir/*", "*.tar.gz", "*~", "build/*/cache", "img_??.jpg", "[ab]*.txt", "*"]
+PATHS = ["Thumbs.db", "sub/Thumbs.db", "a.tmp", "sub/x.tmp", ".tmp", "x.tmp/y", "._foo", "sub/._foo", "~$doc.docx",
+         "notes.trashed-1", "a/b.thumbnail.png", ".git", ".git/config", ".env", "excluded_dir", "excluded_dir/a/b.txt",
+         "archive.tar.gz", "file~", "build/x/cache", "build/x/y/cache", "img_01.jpg", "img_1.jpg", "a.txt", "c.txt",
+         "photo.jpg", "doc/report.pdf"]
+
+
+def test_matcher_is_equivalent_to_fnmatch():
+    for patterns in (DEFAULTS, DEFAULTS + EXTRA[:-1], EXTRA, []):
+        matcher = ExclusionMatcher(patterns)
+        for rel in PATHS:
+            assert matcher.matches(rel) == any(fnmatch.fnmatch(rel, p) for p in patterns), (rel, patterns)
+
+
+def test_matcher_fast_paths_and_pruning():
+    matcher = ExclusionMatcher(DEFAULTS + ["excluded_dir/*", "build/*/cache"])
+    assert "Thumbs.db" in matcher.literals and "tmp" in matcher.extensions
+    assert matcher.prunes("excluded_dir") and not matcher.prunes("build")
+    assert not ExclusionMatcher([])
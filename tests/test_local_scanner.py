@@ -0,0 +1,58 @@
+import os
+import threading
+from unittest.mock import MagicMock
+
+from drimesyncunofficial.local_scanner import LocalScanner
+from drimesyncunofficial.exclusions import ExclusionMatcher
+from drimesyncunofficial.scan_index import ScanIndex
+
+
+def _tree(root):
+    for d in ("a/b", "a/c", "skip", "node"):
+        (root / d).mkdir(parents=True)
+    for f in ("top.txt", "a/one.txt", "a/b/two.txt", "a/c/three.tmp", "skip/x.txt", "node/y.txt"):
+        (root / f).write_text(f)
+
+
+def test_scan_yields_dirs_and_hashed_files(tmp_path):
+    _tree(tmp_path)
+    hasher = MagicMock(side_effect=lambda path, size: f"h{size}")
+    exclusions = ExclusionMatcher(["skip", "*.tmp", "node/*"])
+    items = list(LocalScanner(str(tmp_path), hasher, exclusions, workers=3).scan())
+
+    dirs = sorted(i.rel for i in items if i.kind == "dir")
+    files = {i.rel: i for i in items if i.kind == "file"}
+    assert dirs == ["a", "a/b", "a/c", "node"]
+    assert sorted(files) == ["a/b/two.txt", "a/one.txt", "top.txt"]
+    assert files["a/b/two.txt"].full_path == os.path.join(str(tmp_path), "a", "b", "two.txt")
+    assert files["top.txt"].partial_hash == "h7" and files["top.txt"].stat.st_size == 7
+    assert hasher.call_count == 3
+
+
+def test_scan_reuses_index_and_prefix(tmp_path):
+    _tree(tmp_path)
+    state = tmp_path / "state"; state.mkdir()
+    hasher = MagicMock(return_value="ph")
+    root = tmp_path / "a"
+    index = ScanIndex(str(state))
+    first = list(LocalScanner(str(root), hasher, index=index, rel_prefix="a/").scan())
+    assert sorted(i.rel for i in first if i.kind == "file") == ["a/b/two.txt", "a/c/three.tmp", "a/one.txt"]
+    hasher.reset_mock()
+    scanner = LocalScanner(str(root), hasher, index=index)
+    list(scanner.scan())
+    index.close()
+    assert hasher.call_count == 0 and scanner.index_hits == 3
+
+
+def test_scan_stops_on_event(tmp_path):
+    for i in range(30):
+        (tmp_path / f"d{i}").mkdir()
+        (tmp_path / f"d{i}" / "f.txt").write_text("x")
+    stop = threading.Event()
+    scanner = LocalScanner(str(tmp_path), lambda p, s: "h", stop_event=stop, workers=2)
+    produced = 0
+    for item in scanner.scan():
+        produced += 1
+        if produced == 5: stop.set()
+    assert scanner.interrupted
+    assert produced < 60
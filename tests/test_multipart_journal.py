@@ -0,0 +1,110 @@
+import io
+import time
+from unittest.mock import MagicMock
+
+from drimesyncunofficial.multipart_journal import MultipartJournal
+from drimesyncunofficial.api_client import MultipartUploader
+
+
+def _sign(key, uid, nums):
+    return MagicMock(status_code=200, json=MagicMock(return_value={"urls": [{"partNumber": n, "url": f"http://s3/{n}"} for n in nums]}))
+
+
+def test_journal_roundtrip_and_identity(tmp_path):
+    journal = MultipartJournal(str(tmp_path))
+    journal.start("/data/big.iso", "big.iso", "uid", "key", 100, 1.5, "ph", 10)
+    journal.add_part("/data/big.iso", {"PartNumber": 1, "ETag": "e1"})
+    journal.add_part("/data/big.iso", {"PartNumber": 2, "ETag": "e2"})
+
+    reloaded = MultipartJournal(str(tmp_path))
+    entry = reloaded.get("/data/big.iso", "big.iso", 100, 1.5, "ph", 10)
+    assert entry["upload_id"] == "uid"
+    assert [p["PartNumber"] for p in entry["parts"]] == [1, 2]
+    # Fichier modifié ou destination différente : pas de reprise
+    assert reloaded.get("/data/big.iso", "big.iso", 100, 2.0, "ph", 10) is None
+    assert reloaded.get("/data/big.iso", "other.iso", 100, 1.5, "ph", 10) is None
+    assert reloaded.get("/data/big.iso", "big.iso", 100, 1.5, "ph", 20) is None
+
+
+def test_journal_garbage_collection_aborts_stale(tmp_path):
+    journal = MultipartJournal(str(tmp_path))
+    journal.start("/data/kept.bin", "kept.bin", "u1", "k1", 10, 1.0, "a", 5)
+    journal.start("/data/changed.bin", "changed.bin", "u2", "k2", 10, 1.0, "b", 5)
+    journal.start("/data/gone.bin", "gone.bin", "u3", "k3", 10, 1.0, "c", 5)
+    journal.start("/data/old.bin", "old.bin", "u4", "k4", 10, 1.0, "d", 5)
+    journal.entries["/data/old.bin"]["updated"] = time.time() - journal.max_age - 1
+
+    client = MagicMock()
+    local_files = [
+        {"full_path": "/data/kept.bin", "size": 10, "mtime": 1.0, "partial_hash": "a"},
+        {"full_path": "/data/changed.bin", "size": 12, "mtime": 2.0, "partial_hash": "x"},
+        {"full_path": "/data/old.bin", "size": 10, "mtime": 1.0, "partial_hash": "d"},
+    ]
+    assert journal.collect_garbage(local_files, client) == 3
+    assert list(MultipartJournal(str(tmp_path)).entries) == ["/data/kept.bin"]
+    aborted = sorted(c.args[1] for c in client.upload_multipart_abort.call_args_list)
+    assert aborted == ["u2", "u3", "u4"]
+
+
+def test_uploader_resumes_from_first_missing_part():
+    client = MagicMock()
+    client.upload_multipart_sign_batch.side_effect = _sign
+    client.upload_multipart_put_chunk.side_effect = lambda url, chunk: MagicMock(status_code=200, headers={"ETag": bytes(chunk).decode()})
+    journaled = []
+    progress = []
+    uploader = MultipartUploader(
+        client, "key", "uid", chunk_size=2, part_workers=1,
+        completed_parts=[{"PartNumber": 1, "ETag": "aa"}, {"PartNumber": 2, "ETag": "bb"}],
+        part_done_callback=journaled.append, progress_callback=progress.append
+    )
+    parts = uploader.upload(io.BytesIO(b"aabbccd"), 7)
+
+    assert [p["ETag"] for p in parts] == ["aa", "bb", "cc", "d"]
+    assert client.upload_multipart_sign_batch.call_args.args[2] == [3, 4]
+    assert [p["PartNumber"] for p in journaled] == [3, 4]
+    assert sum(progress) == 7
+
+
+
+def _resume_client(tmp_path, old_status):
+    from drimesyncunofficial.api_client import CHUNK_SIZE, DrimeAPIClient, RetryPolicy, ThrottleCoordinator
+    data = tmp_path / "big.iso"
+    data.write_bytes(b"abc")
+    identity = {"size": 3, "mtime": 1.0, "partial_hash": "ph"}
+    journal = MultipartJournal(str(tmp_path))
+    journal.start(str(data), "big.iso", "old_uid", "old_key", chunk_size=CHUNK_SIZE, **identity)
+    journal.add_part(str(data), {"PartNumber": 1, "ETag": "old"})
+
+    client = DrimeAPIClient("fake_key", "http://fake.url")
+    client.retry_policy = RetryPolicy(coordinator=ThrottleCoordinator())
+    client.upload_multipart_abort = MagicMock(side_effect=RuntimeError("déjà expiré"))
+    client.upload_multipart_init = MagicMock(return_value=MagicMock(status_code=200, json=MagicMock(return_value={"uploadId": "new_uid", "key": "new_key"})))
+    client.upload_multipart_sign_batch = MagicMock(side_effect=_sign)
+    client.upload_multipart_put_chunk = MagicMock(return_value=MagicMock(status_code=200, headers={"ETag": "e1"}))
+    client.upload_multipart_complete = MagicMock(side_effect=lambda key, uid, parts: MagicMock(
+        status_code=old_status if uid == "old_uid" else 200, json=MagicMock(return_value={"fileEntry": {"id": 1}})))
+    return client, str(data), journal, identity
+
+
+def test_rejected_resume_aborts_stale_upload_and_restarts(tmp_path):
+    client, path, journal, identity = _resume_client(tmp_path, 404)
+    progress = []
+    res = client.upload_multipart_file(path, 3, "big.iso", "0", progress_callback=progress.append, journal=journal, identity=identity)
+
+    assert res["id"] == 1
+    client.upload_multipart_abort.assert_called_once_with("old_key", "old_uid")
+    assert client.upload_multipart_init.call_count == 1
+    assert journal.entries == {}
+    # Part reprise créditée, retirée au redémarrage, puis renvoyée : 100 % exactement
+    assert progress == [3, -3, 3]
+
+
+def test_server_error_on_resume_keeps_journal(tmp_path):
+    import pytest
+    from drimesyncunofficial.api_client import DrimeServerError
+    client, path, journal, identity = _resume_client(tmp_path, 500)
+    with pytest.raises(DrimeServerError):
+        client.upload_multipart_file(path, 3, "big.iso", "0", journal=journal, identity=identity)
+    client.upload_multipart_abort.assert_not_called()
+    client.upload_multipart_init.assert_not_called()
+    assert journal.entries[path]["upload_id"] == "old_uid"
@@ -0,0 +1,65 @@
+import asyncio
+import json
+import os
+import sys
+from unittest.mock import MagicMock, AsyncMock, patch
+
+if 'toga' not in sys.modules:
+    sys.modules['toga'] = MagicMock()
+
+from drimesyncunofficial.pull_manifest import PullManifest
+from drimesyncunofficial.downloads_workspace import WorkspaceDownloadManager
+from drimesyncunofficial.constants import PULL_SUMMARY_FILE_NAME
+
+
+def _task(root, name, h="h1", size=3):
+    return {"path": str(root / name), "name": name, "size": size, "id": name, "hash": h, "updated_at": "2024-01-01", "url": f"http://api/{h}"}
+
+
+def test_unchanged_requires_same_remote_meta_and_intact_local_file(tmp_path):
+    task = _task(tmp_path, "a.txt")
+    (tmp_path / "a.txt").write_bytes(b"abc")
+    manifest = PullManifest(str(tmp_path))
+    manifest.record(task)
+    manifest.save()
+
+    reloaded = PullManifest(str(tmp_path))
+    assert reloaded.is_unchanged(task)
+    assert not reloaded.is_unchanged({**task, "hash": "h2"})
+    assert not reloaded.is_unchanged({**task, "updated_at": "2024-02-02"})
+    (tmp_path / "a.txt").write_bytes(b"abcd")
+    assert not reloaded.is_unchanged(task)
+
+
+def test_second_pull_only_fetches_changed_entries(tmp_path):
+    app = MagicMock()
+    app.config_data = {'workers': 2}
+    app.is_mobile = False
+    app.workspace_list_cache = []
+    app.main_window.dialog = AsyncMock()
+    manager = WorkspaceDownloadManager(app)
+    manager.lbl_status = MagicMock()
+    manager.sw_pull = MagicMock(value=True)
+    fetched = []
+    def fake_worker(url, path, name, size):
+        fetched.append(name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f: f.write(b"x" * size)
+        return True, "OK", size
+
+    selection = [
+        {"id": "1", "name": "a.txt", "type": "file", "size": 3, "hash": "h1", "updated_at": "t1"},
+        {"id": "2", "name": "b.txt", "type": "file", "size": 4, "hash": "h2", "updated_at": "t1"},
+    ]
+    with patch.object(manager, '_download_file_worker', side_effect=fake_worker), \
+         patch('asyncio.get_running_loop', asyncio.events.get_running_loop):
+        asyncio.run(manager.start_download(str(tmp_path), selection=selection))
+        assert sorted(fetched) == ["a.txt", "b.txt"]
+        fetched.clear()
+        selection[1] = {**selection[1], "hash": "h2bis", "updated_at": "t2"}
+        asyncio.run(manager.start_download(str(tmp_path), selection=selection))
+    assert fetched == ["b.txt"]
+
+    summary = json.loads((tmp_path / "Workspace_0" / PULL_SUMMARY_FILE_NAME).read_text(encoding="utf-8"))
+    assert summary["counts"] == {"fetched": 1, "skipped": 1, "failed": 0}
+    assert summary["skipped"] == ["a.txt"] and summary["fetched"] == ["b.txt"]
@@ -3,6 +3,7 @@ from unittest.mock import MagicMock, patch, ANY, call
 import os
 from drimesyncunofficial.uploads_mirror import MirrorUploadManager
 from drimesyncunofficial.uploads_mirror_e2ee import MirrorUploadE2EEManager
+from drimesyncunofficial.api_client import DrimeAPIClient
 
 @pytest.fixture
 def mock_app():
@@ -67,16 +68,20 @@ class TestReliability:
             assert "file_0.txt" not in uploaded_files
             assert "file_99.txt" in uploaded_files
 
-    @patch('drimesyncunofficial.uploads_mirror.time.sleep')
+    @patch('drimesyncunofficial.api_client.time.sleep')
     @patch('drimesyncunofficial.uploads_mirror.asyncio.run_coroutine_threadsafe')
     def test_multipart_chunk_retry_logic(self, mock_asyncio, mock_sleep, mock_app):
         """
         Reliability Test: Multipart Chunk Retry.
         Simulates a chunk upload failing 2 times then succeeding.
-        Verifies `upload_multipart` retries the chunk.
+        Verifies `upload_multipart` (delegated to the API client) retries the chunk.
         """
+        # Real client logic, network calls mocked below
+        mock_app.api_client = DrimeAPIClient("fake_key", "http://fake.url")
+        for name in ("upload_multipart_init", "upload_multipart_sign_batch", "upload_multipart_put_chunk", "upload_multipart_complete", "create_entry"):
+            setattr(mock_app.api_client, name, MagicMock())
         with patch('drimesyncunofficial.uploads_mirror.toga'), \
-             patch('drimesyncunofficial.uploads_mirror.open', new_callable=MagicMock) as mock_open:
+             patch('drimesyncunofficial.api_client.open', new_callable=MagicMock) as mock_open:
             
             manager = MirrorUploadManager(mock_app)
             manager.log_ui = MagicMock()
@@ -0,0 +1,69 @@
+import sys
+import threading
+from unittest.mock import MagicMock
+if 'toga' not in sys.modules: sys.modules['toga'] = MagicMock()
+
+from drimesyncunofficial.api_client import DrimeClientError
+from drimesyncunofficial.remote_folders import RemoteFolderCreator, implicit_folders
+
+
+class FakeApi:
+    """Serveur de dossiers minimal : create_folder lève un conflit si le nom existe déjà sous le parent."""
+    def __init__(self, existing=None):
+        self.lock = threading.Lock()
+        self.children = {}
+        self.created = []
+        self.listings = 0
+        self.next_id = 100
+        for parent, name, fid in existing or []: self.children.setdefault(parent, {})[name] = {"id": fid, "name": name, "type": "folder"}
+
+    def create_folder(self, name, parent_id, workspace_id):
+        with self.lock:
+            siblings = self.children.setdefault(parent_id, {})
+            if name in siblings: raise DrimeClientError("exists")
+            self.next_id += 1
+            siblings[name] = {"id": str(self.next_id), "name": name, "type": "folder"}
+            self.created.append((parent_id, name))
+            return {"folder": siblings[name]}
+
+    def list_files(self, params):
+        with self.lock:
+            self.listings += 1
+            return {"data": list(self.children.get(params.get("folderId"), {}).values()), "last_page": 1, "current_page": 1}
+
+
+def _creator(api, tree):
+    return RemoteFolderCreator(api, "0", tree, lambda rel: rel.rsplit("/", 1)[-1], workers=4)
+
+
+def test_implicit_folders_are_all_ancestors():
+    assert implicit_folders(["a/b/c.txt", "a/d.txt", "e.txt"]) == {"a", "a/b"}
+
+
+def test_run_creates_levels_and_missing_ancestors():
+    api = FakeApi()
+    tree = {"folders": {}, "files": {}}
+    assert _creator(api, tree).run(["x/y/z", "x/w", "v"]) == 5
+    assert set(tree["folders"]) == {"x", "x/y", "x/y/z", "x/w", "v"}
+    parents = {name: parent for parent, name in api.created}
+    assert parents["y"] == tree["folders"]["x"]["id"] and parents["z"] == tree["folders"]["x/y"]["id"]
+
+
+def test_conflicts_and_resolve_share_one_listing_per_parent():
+    api = FakeApi(existing=[(None, "a", "1")] + [("1", f"s{i}", f"1{i}") for i in range(5)])
+    tree = {"folders": {}, "files": {}}
+    creator = _creator(api, tree)
+    assert creator.run(["a"]) == 1 and tree["folders"]["a"]["id"] == "1"
+    assert creator.run([f"a/s{i}" for i in range(5)], resolve=True) == 5
+    assert api.created == [] and api.listings == 2
+    assert not creator.failed
+
+
+def test_dry_run_simulates_without_requests():
+    api = FakeApi(existing=[(None, "a", "1")])
+    tree = {"folders": {}, "files": {}}
+    logged = []
+    creator = RemoteFolderCreator(api, "0", tree, lambda rel: rel.rsplit("/", 1)[-1], log=logged.append, dry_run=True)
+    assert creator.run(["a/b"], resolve=True) == 2
+    assert tree["folders"]["a/b"] == {"id": "SIMU_ID_a/b", "name": "b"}
+    assert sorted(logged) == ["a", "a/b"] and api.created == [] and api.listings == 0
@@ -0,0 +1,105 @@
+import os
+import sys
+from unittest.mock import MagicMock
+if 'toga' not in sys.modules: sys.modules['toga'] = MagicMock()
+
+from drimesyncunofficial.compact_tree import HashIndex
+from drimesyncunofficial.remote_moves import RemoteMover, pair_moved_files, plan_moves
+from drimesyncunofficial.scan_index import ScanIndex
+
+
+def _trees(cloud_files, local_files, cloud_folders, local_folders):
+    cloud = {"folders": {f: {"id": f"d:{f}", "name": f.rsplit("/", 1)[-1]} for f in cloud_folders},
+             "files": {p: {"id": f"f:{p}", "size": s, "partial_hash": h} for p, (s, h) in cloud_files.items()}}
+    local = {"folders": set(local_folders),
+             "files": {p: {"full_path": p, "size": s, "mtime": 2.0, "partial_hash": h} for p, (s, h) in local_files.items()}}
+    return cloud, local
+
+
+def _plan(cloud, local):
+    adds = set(local["files"]) - set(cloud["files"])
+    dels = set(cloud["files"]) - set(local["files"])
+    pairs = pair_moved_files(adds, dels, local["files"], cloud["files"], HashIndex(cloud["files"]), local.get("moved_from"))
+    return pairs, plan_moves(pairs, cloud, local["folders"])
+
+
+def test_whole_directory_move_collapses_into_one_call():
+    cloud, local = _trees(
+        {"Footage/a.mov": (10, "h1"), "Footage/day2/b.mov": (20, "h2"), "keep.txt": (1, "h3")},
+        {"Archive/Footage/a.mov": (10, "h1"), "Archive/Footage/day2/b.mov": (20, "h2"), "keep.txt": (1, "h3")},
+        ["Footage", "Footage/day2"], ["Archive", "Archive/Footage", "Archive/Footage/day2"])
+    pairs, plan = _plan(cloud, local)
+    assert plan.dir_moves == [("Footage", "Archive/Footage")] and plan.file_moves == []
+    api = MagicMock()
+    api.create_folder.return_value = {"folder": {"id": "arch", "name": "Archive"}}
+    mover = RemoteMover(api, "0", cloud, local["files"], lambda rel, is_folder: rel.rsplit("/", 1)[-1], creator=None)
+    mover._ensure_folders = lambda folders: cloud["folders"].update({f: {"id": "arch"} for f in folders if f})
+    mover.apply(plan)
+    api.move_entries.assert_called_once_with(["d:Footage"], "arch")
+    api.rename_entry.assert_not_called()
+    assert "Archive/Footage/day2" in cloud["folders"] and "Footage" not in cloud["folders"]
+    assert cloud["files"]["Archive/Footage/day2/b.mov"]["id"] == "f:Footage/day2/b.mov"
+    assert not mover.failed
+
+
+def test_partial_directory_move_falls_back_to_file_moves_and_renames():
+    cloud, local = _trees(
+        {"A/x.bin": (5, "h1"), "A/y.bin": (6, "h2"), "A/z.bin": (7, "h3")},
+        {"B/x.bin": (5, "h1"), "B/renamed.bin": (6, "h2")},
+        ["A", "B"], ["B"])
+    pairs, plan = _plan(cloud, local)
+    assert plan.dir_moves == []
+    assert sorted(plan.file_moves) == [("A/x.bin", "B/x.bin"), ("A/y.bin", "B/renamed.bin")]
+    api = MagicMock()
+    mover = RemoteMover(api, "0", cloud, local["files"], lambda rel, is_folder: "enc-" + rel.rsplit("/", 1)[-1])
+    mover.apply(plan)
+    api.rename_entry.assert_called_once_with("f:A/y.bin", "enc-renamed.bin")
+    api.move_entries.assert_called_once()
+    assert sorted(api.move_entries.call_args[0][0]) == ["f:A/x.bin", "f:A/y.bin"]
+    assert set(cloud["files"]) == {"B/x.bin", "B/renamed.bin", "A/z.bin"}
+
+
+def test_failed_folder_move_is_retried_as_file_moves():
+    cloud, local = _trees({"Old/a.jpg": (3, "h1")}, {"New/a.jpg": (3, "h1")}, ["Old"], ["New"])
+    pairs, plan = _plan(cloud, local)
+    assert plan.dir_moves == [("Old", "New")]
+    api = MagicMock()
+    api.rename_entry.side_effect = Exception("conflict")
+    mover = RemoteMover(api, "0", cloud, local["files"], lambda rel, is_folder: rel.rsplit("/", 1)[-1])
+    mover._ensure_folders = lambda folders: cloud["folders"].update({f: {"id": "new"} for f in folders if f and f not in cloud["folders"]})
+    mover.apply(plan)
+    api.move_entries.assert_called_once_with(["f:Old/a.jpg"], "new")
+    assert mover.moved_files == [("Old/a.jpg", "New/a.jpg")] and "Old" in cloud["folders"]
+
+
+def test_failed_folder_move_after_rename_restores_the_old_name():
+    cloud, local = _trees({"Footage/a.mov": (10, "h1")}, {"Archive/Clips/a.mov": (10, "h1")}, ["Footage"], ["Archive", "Archive/Clips"])
+    pairs, plan = _plan(cloud, local)
+    assert plan.dir_moves == [("Footage", "Archive/Clips")]
+    api = MagicMock()
+    api.move_entries.side_effect = [Exception("conflict"), None]
+    mover = RemoteMover(api, "0", cloud, local["files"], lambda rel, is_folder: rel.rsplit("/", 1)[-1])
+    mover._ensure_folders = lambda folders: cloud["folders"].update({f: {"id": f"d:{f}"} for f in folders if f and f not in cloud["folders"]})
+    mover.apply(plan)
+    # Renommé puis déplacement refusé : le nom d'origine est rétabli avant le repli fichier par fichier
+    assert [c.args for c in api.rename_entry.call_args_list] == [("d:Footage", "Clips"), ("d:Footage", "Footage")]
+    assert cloud["folders"]["Footage"]["name"] == "Footage"
+    assert api.move_entries.call_args_list[-1].args == (["f:Footage/a.mov"], "d:Archive/Clips")
+    assert mover.moved_files == [("Footage/a.mov", "Archive/Clips/a.mov")]
+
+
+def test_inode_hint_disambiguates_identical_copies(tmp_path):
+    cloud, local = _trees({"a/copy.txt": (4, "h"), "b/copy.txt": (4, "h")}, {"c/copy.txt": (4, "h")}, ["a", "b"], ["c"])
+    local["moved_from"] = {"c/copy.txt": "b/copy.txt"}
+    pairs, _ = _plan(cloud, local)
+    assert pairs == {"c/copy.txt": "b/copy.txt"}
+
+    root = tmp_path / "root"; (root / "d").mkdir(parents=True)
+    f = root / "d" / "f.txt"; f.write_text("data")
+    index = ScanIndex(str(tmp_path))
+    index.update(str(f), os.stat(f), "h")
+    moved = root / "moved.txt"; os.rename(f, moved)
+    index.update(str(moved), os.stat(moved), "h")
+    index.prune(str(root), [str(moved)])
+    assert index.moved == {str(moved): str(f)}
+    index.close()
@@ -0,0 +1,60 @@
+import os
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+if 'toga' not in sys.modules: sys.modules['toga'] = MagicMock()
+
+from drimesyncunofficial.scan_index import ScanIndex
+from drimesyncunofficial.uploads_mirror import MirrorUploadManager
+
+
+def test_index_lookup_requires_matching_stat(tmp_path):
+    f = tmp_path / "a.txt"
+    f.write_text("hello")
+    index = ScanIndex(str(tmp_path))
+    st = f.stat()
+    assert index.lookup(str(f), st) is None
+    index.update(str(f), st, "ph1")
+    index.close()
+
+    index = ScanIndex(str(tmp_path))
+    assert index.lookup(str(f), f.stat()) == "ph1"
+    f.write_text("hello world")
+    assert index.lookup(str(f), f.stat()) is None
+    index.close()
+
+
+def test_index_unavailable_is_inactive(tmp_path):
+    index = ScanIndex(str(tmp_path / "missing" / "dir"))
+    assert index.conn is None
+    index.update("/x", os.stat(tmp_path), "ph")
+    assert index.lookup("/x", os.stat(tmp_path)) is None
+    assert index.prune(str(tmp_path), []) == 0
+
+
+def test_second_scan_reuses_hashes_and_prunes(tmp_path):
+    root = tmp_path / "data"
+    state = tmp_path / "state"
+    root.mkdir(); state.mkdir()
+    (root / "keep.txt").write_text("keep")
+    (root / "gone.txt").write_text("gone")
+
+    app = MagicMock()
+    manager = MirrorUploadManager(app)
+    manager.log_ui = MagicMock()
+    manager.get_partial_hash = MagicMock(return_value="hash")
+    with patch("drimesyncunofficial.uploads_mirror.load_exclusion_patterns", return_value=[]):
+        manager.get_local_tree(str(root), str(state))
+        assert manager.get_partial_hash.call_count == 2
+
+        (root / "gone.txt").unlink()
+        manager.get_partial_hash.reset_mock()
+        tree = manager.get_local_tree(str(root), str(state))
+
+    assert manager.get_partial_hash.call_count == 0
+    assert list(tree["files"]) == ["keep.txt"]
+    index = ScanIndex(str(state))
+    rows = [r[0] for r in index.conn.execute("SELECT path FROM files")]
+    index.close()
+    assert rows == [str(root / "keep.txt")]
@@ -0,0 +1,45 @@
+import threading
+from queue import Queue
+
+from drimesyncunofficial.upload_feed import MirrorUploadFeed, next_upload_item
+
+
+def _info(size, h):
+    return {"full_path": "/x", "size": size, "mtime": 1.0, "partial_hash": h}
+
+
+def test_feed_streams_only_safe_decisions():
+    cloud = {"folders": {"a": {"id": 1}}, "files": {
+        "same.txt": {"size": 3, "partial_hash": "h1", "id": 10},
+        "changed.txt": {"size": 3, "partial_hash": "h2", "id": 11},
+        "old_name.txt": {"size": 5, "partial_hash": "h3", "id": 12},
+    }}
+    q = Queue()
+    queued = []
+    feed = MirrorUploadFeed(cloud, q, on_queued=queued.append)
+    feed.on_entry("dir", "a")
+    feed.on_entry("dir", "b")
+    feed.on_entry("file", "same.txt", _info(3, "h1"))
+    feed.on_entry("file", "changed.txt", _info(4, "h9"))
+    feed.on_entry("file", "new_name.txt", _info(5, "h3"))
+    feed.on_entry("file", "b/new.txt", _info(7, "h7"))
+    assert feed.streamed == {"changed.txt", "b/new.txt"}
+    assert [q.get_nowait()[0] for _ in range(q.qsize())] == ["changed.txt", "b/new.txt"]
+    assert sum(i["size"] for i in queued) == 11
+
+
+def test_next_upload_item_waits_while_feeding():
+    q = Queue()
+    feeding = threading.Event()
+    feeding.set()
+    got = []
+    t = threading.Thread(target=lambda: got.append(next_upload_item(q, feeding)))
+    t.start()
+    t.join(0.3)
+    assert t.is_alive()
+    q.put(("late.txt", {}))
+    t.join(2)
+    assert got == [("late.txt", {})]
+    feeding.clear()
+    assert next_upload_item(q, feeding) is None
+    assert next_upload_item(Queue(), None) is None
@@ -0,0 +1,111 @@
+import sys
+import threading
+from queue import Empty
+from unittest.mock import MagicMock
+if 'toga' not in sys.modules: sys.modules['toga'] = MagicMock()
+
+import pytest
+
+from drimesyncunofficial.upload_feed import next_upload_item
+from drimesyncunofficial.upload_scheduler import LANE_LARGE, LANE_SMALL, SizeAwareUploadQueue, large_lane_slots
+
+MB = 1024 * 1024
+
+
+def _item(name, size):
+    return (name, {"size": size})
+
+
+def test_large_files_are_served_longest_first_within_their_slots():
+    q = SizeAwareUploadQueue(threshold=10 * MB, large_slots=1)
+    for name, size in [("s1", 1), ("big", 50 * MB), ("s2", 2), ("huge", 900 * MB), ("mid", 20 * MB)]:
+        q.put(_item(name, size))
+    assert q.get_nowait()[0] == "huge"
+    # task_done rend la place de la voie : le gros fichier suivant peut partir
+    q.task_done()
+    assert q.get_nowait()[0] == "big"
+    assert q.active(LANE_LARGE) == 1
+
+    taken = []
+    def other_worker():
+        taken.append(q.get_nowait()[0])
+    t = threading.Thread(target=other_worker); t.start(); t.join()
+    assert taken == ["s1"] and q.active(LANE_SMALL) == 1
+
+
+def test_idle_lane_lends_its_workers_and_empty_queue_raises():
+    q = SizeAwareUploadQueue(threshold=10 * MB, large_slots=1)
+    q.put(_item("a", 30 * MB)); q.put(_item("b", 40 * MB))
+    names = []
+    def worker():
+        names.append(q.get_nowait()[0])
+    threads = [threading.Thread(target=worker) for _ in range(2)]
+    for t in threads: t.start()
+    for t in threads: t.join()
+    assert sorted(names) == ["a", "b"] and q.empty()
+    with pytest.raises(Empty): q.get_nowait()
+    with pytest.raises(Empty): q.get(timeout=0.01)
+
+
+def test_streaming_feed_wakes_waiting_workers():
+    q = SizeAwareUploadQueue(workers=6)
+    assert q.large_slots == large_lane_slots(6) == 2
+    feeding = threading.Event(); feeding.set()
+    got = []
+    t = threading.Thread(target=lambda: got.append(next_upload_item(q, feeding)))
+    t.start()
+    q.put(_item("late.txt", 10))
+    t.join(timeout=2)
+    assert got == [("late.txt", {"size": 10})]
+    feeding.clear()
+    assert next_upload_item(q, feeding) is None
+
+
+
+class _Worker:
+    """Thread de worker persistant (la voie d'un élément est suivie par thread jusqu'à task_done)."""
+    def __init__(self, q):
+        import queue
+        self.q, self.orders, self.results = q, queue.Queue(), queue.Queue()
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def _run(self):
+        while True:
+            order = self.orders.get()
+            if order is None: return
+            try: self.results.put(self.q.get_nowait()[0])
+            except Empty: self.results.put(None)
+
+    def take(self):
+        self.orders.put("take")
+        return self.results.get(timeout=2)
+
+
+def test_large_files_queued_first_do_not_take_small_file_workers_while_feeding():
+    feeding = threading.Event(); feeding.set()
+    q = SizeAwareUploadQueue(workers=3, threshold=10 * MB, large_slots=1, feeding=feeding)
+    for name in ("iso1", "iso2", "iso3"): q.put(_item(name, 4000 * MB))
+    w1, w2, w3 = _Worker(q), _Worker(q), _Worker(q)
+
+    assert w1.take() == "iso1"
+    # Voie des gros fichiers pleine et scan en cours : les autres workers restent aux petits fichiers
+    assert w2.take() is None
+    with pytest.raises(Empty): q.get(timeout=0.05)
+    q.put(_item("late.txt", 10))
+    assert w2.take() == "late.txt"
+    # Scan terminé : plus aucun petit fichier à venir, les gros empruntent les workers libres
+    feeding.clear()
+    assert w3.take() == "iso2"
+    assert q.active(LANE_LARGE) == 2 and q.active(LANE_SMALL) == 1
+    for w in (w1, w2, w3): w.orders.put(None)
+
+def test_blocking_get_waits_for_a_servable_item():
+    feeding = threading.Event(); feeding.set()
+    q = SizeAwareUploadQueue(threshold=10 * MB, large_slots=1, feeding=feeding)
+    q.put(_item("a.iso", 50 * MB)); q.put(_item("b.iso", 60 * MB))
+    assert q.get_nowait()[0] == "b.iso"
+    got = []
+    t = threading.Thread(target=lambda: got.append(q.get(timeout=2)[0])); t.start()
+    q.put(_item("small.txt", 1))
+    t.join(timeout=2)
+    assert got == ["small.txt"]
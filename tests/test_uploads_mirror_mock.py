@@ -116,3 +116,16 @@ class TestMirrorUploadsMock:
             # Check Result Queue
             res_q.put.assert_called_with(("folder/file.txt", {"id": "uploaded"}))
 
+
+    def test_apply_moves_moves_folder_server_side(self, manager):
+        """A locally moved folder is re-parented on the server instead of being re-uploaded."""
+        cloud_tree = {"folders": {"Dest": {"id": "7"}, "Photos": {"id": "5"}},
+                      "files": {"Photos/a.jpg": {"id": "50", "size": 10, "partial_hash": "h1"}}}
+        local_tree = {"folders": {"Dest", "Dest/Photos"},
+                      "files": {"Dest/Photos/a.jpg": {"full_path": "/x", "size": 10, "mtime": 1.0, "partial_hash": "h1"}}}
+        done_new, done_old, renamed, moved = manager._apply_moves(
+            {"Dest/Photos/a.jpg"}, {"Photos/a.jpg"}, local_tree, cloud_tree, "0", False)
+        manager.app.api_client.move_entries.assert_called_once_with(["5"], "7")
+        assert done_new == {"Dest/Photos/a.jpg"} and done_old == {"Photos/a.jpg"}
+        assert (renamed, moved) == (0, 1)
+        assert cloud_tree["files"]["Dest/Photos/a.jpg"]["id"] == "50"